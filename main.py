@@ -14,6 +14,7 @@ from dotenv import load_dotenv
 load_dotenv('config/.env')
 
 from prism import create_app
+from prism.utils.offload import offload
 
 def main():
     """Main application entry point"""
@@ -31,8 +32,17 @@ def main():
         print("Speech-to-text will not work without Google Cloud credentials")
         print("Please set GOOGLE_APPLICATION_CREDENTIALS to your service account key file path")
     
+    # PRISM_WORKERS > 1 serves from forked worker processes (0 = one per core)
+    workers = int(os.getenv('PRISM_WORKERS', '1'))
+    if workers != 1:
+        from prism.core.server import serve
+        serve(host='0.0.0.0', port=int(os.getenv('PORT', '5000')), workers=workers or None,
+              pin_cores=os.getenv('PRISM_PIN_CORES', 'true').lower() in ('1', 'true', 'yes'))
+        return
+    
     # Create and run the application
     app, socketio = create_app()
+    offload.start()
     
     print("🚀 Starting Prism AI Voice Assistant...")
     print("📱 Web interface available at: http://localhost:5000")
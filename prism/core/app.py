@@ -4,9 +4,10 @@ Flask application factory for Prism AI Voice Assistant
 
 import os
 import json
+import threading
 import base64
-import tempfile
-from flask import Flask, request, jsonify, render_template
+import uuid
+from flask import Flask, Response, copy_current_request_context, request, jsonify, render_template, session, stream_with_context
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
 import openai
@@ -18,18 +19,34 @@ import re
 import requests
 
 from .assistant import PrismAssistant
+from .speculation import Speculator
+from .turns import TurnQueue
+from .audio_bundle import AudioBundleSet
+from .audio_formats import AUDIO_FORMATS, DEFAULT_FORMAT, format_from_request
+from .audio_ingest import audio_ingest
+from .stt import GoogleSTTEngine, STTRouter, container_for, load_local_engine as load_local_stt_engine
+from .tts import ElevenLabsEngine, TTSRouter, TTSUnavailableError, load_local_engine, synthesize
+from ..utils.cancellation import Cancelled
+from ..utils.circuit_breaker import breakers
+from ..utils.offload import offload
+from ..utils.state import state_store
+from ..utils.upstream import upstream
 from ..features.weather import weather_service
 from ..features.news import news_service
 from ..features.reminders import reminder_service
-from ..features.calculator import calculator_service
+from ..features.calculator import calculator_service, MAX_BATCH_SIZE
 from ..features.jokes import joke_service
 from ..features.quotes import quote_service
 
 # Load environment variables from config directory
 load_dotenv('config/.env')
 
-def create_app():
-    """Create and configure the Flask application"""
+def create_app(warm_bundles: bool = True):
+    """Create and configure the Flask application
+
+    With ``warm_bundles`` False the default audio bundle isn't built in the
+    background here; a prefork master leaves that to its workers.
+    """
     # Get the directory where this file is located
     current_dir = os.path.dirname(os.path.abspath(__file__))
     prism_dir = os.path.dirname(current_dir)  # Go up to prism directory
@@ -39,7 +56,15 @@ def create_app():
                 static_folder=os.path.join(prism_dir, 'static'))
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'prism-secret-key')
     CORS(app)
-    socketio = SocketIO(app, cors_allowed_origins="*")
+    # With several worker processes, events are relayed through a message
+    # queue (e.g. redis://localhost:6379/0) so any worker can emit to any client
+    # SOCKETIO_TRANSPORTS=websocket keeps each client on the worker that
+    # accepted its connection when workers share one listening socket
+    socket_transports = [t.strip() for t in os.getenv('SOCKETIO_TRANSPORTS', '').split(',') if t.strip()] or None
+    socketio = SocketIO(app, cors_allowed_origins="*",
+                        message_queue=os.getenv('SOCKETIO_MESSAGE_QUEUE') or None,
+                        channel=os.getenv('SOCKETIO_CHANNEL', 'flask-socketio'),
+                        transports=socket_transports)
     
     # Initialize API clients
     openai.api_key = os.getenv('OPENAI_API_KEY')
@@ -47,14 +72,58 @@ def create_app():
     # Initialize Prism assistant
     prism = PrismAssistant()
     
+    # Fixed replies are served from pre-synthesized audio, one bundle per
+    # response format; each is (re)built in the background when the reply
+    # texts or voice change
+    elevenlabs_key = os.getenv('ELEVENLABS_API_KEY')
+    bundle_warmup = elevenlabs_key and os.getenv('TTS_BUNDLE_WARMUP', 'true').lower() in ('1', 'true', 'yes')
+    audio_bundles = AudioBundleSet(
+        os.getenv('TTS_BUNDLE_DIR', os.path.join('cache', 'tts')),
+        prism.fixed_responses,
+        synthesize=(lambda text, fmt: synthesize(text, elevenlabs_key, fmt)) if bundle_warmup else None
+    )
+    if warm_bundles:
+        audio_bundles.warm(DEFAULT_FORMAT)
+    
+    # For prism.core.server, which warms these up before forking workers
+    app.extensions['prism'] = {'assistant': prism, 'audio_bundles': audio_bundles}
+    
+    # Response audio format negotiated by each connected client, by socket id
+    CLIENT_FORMATS_KEY = 'client_audio_formats'
+    
+    def _client_format(sid):
+        return AUDIO_FORMATS.get(state_store.hget(CLIENT_FORMATS_KEY, sid), DEFAULT_FORMAT)
+    
+    # Google Cloud recognizes speech; a local recognizer, if installed, covers outages
+    stt_router = STTRouter(GoogleSTTEngine(), local=load_local_stt_engine())
+    
+    # Short replies and ElevenLabs outages go to the local engine, if installed
+    tts_router = TTSRouter(
+        ElevenLabsEngine(),
+        local=load_local_engine(),
+        bundles=audio_bundles,
+        local_max_chars=int(os.getenv('TTS_LOCAL_MAX_CHARS', '60'))
+    )
+    
+    # Voice replies stream their audio to the socket as it is synthesized
+    tts_streaming = os.getenv('TTS_STREAMING', 'true').lower() in ('1', 'true', 'yes')
+    
+    # Socket turns run on a shared pool, in order within each session
+    turns = TurnQueue(max_workers=int(os.getenv('TURN_WORKERS', '8')))
+    
+    # Speculative replies on stable partial transcripts (voice input only)
+    speculator = None
+    if os.getenv('SPECULATIVE_PREFETCH', 'true').lower() in ('1', 'true', 'yes'):
+        speculator = Speculator(threshold=float(os.getenv('SPECULATION_STABILITY', '0.8')))
+    
     @app.route('/')
     def index():
         """Serve the main application page"""
-        return render_template('index.html')
+        return render_template('index.html', socket_transports=socket_transports or ['polling', 'websocket'])
     
     @app.route('/api/speech-to-text', methods=['POST'])
     def speech_to_text():
-        """Convert speech to text using Google Cloud Speech-to-Text"""
+        """Convert speech to text with the recognizer the STT router picks"""
         try:
             # Get audio data from request
             audio_data = request.files.get('audio')
@@ -62,77 +131,20 @@ def create_app():
                 print("❌ No audio data provided")
                 return jsonify({'error': 'No audio data provided'}), 400
             
-            print(f"📁 Received audio file: {audio_data.filename}, size: {len(audio_data.read())} bytes")
-            audio_data.seek(0)  # Reset file pointer
+            content = audio_data.read()
+            print(f"📁 Received audio file: {audio_data.filename}, size: {len(content)} bytes")
             
-            # Save audio to temporary file
-            temp_file_path = None
             try:
-                # Get the original filename to check format
-                original_filename = audio_data.filename or 'audio'
-                print(f"📁 Original filename: {original_filename}")
-                
-                # Determine the correct file extension
-                if '.' in original_filename:
-                    file_ext = original_filename.split('.')[-1].lower()
-                else:
-                    file_ext = 'wav'  # Default to wav
-                
-                # Use the original extension if it's supported by Google Cloud Speech
-                supported_formats = ['flac', 'm4a', 'mp3', 'mp4', 'mpeg', 'mpga', 'oga', 'ogg', 'wav', 'webm']
-                if file_ext not in supported_formats:
-                    file_ext = 'wav'  # Fallback to wav
+                # Sniff and normalize to 16 kHz mono PCM; the name/MIME type is only a hint
+                ingested = audio_ingest.normalize(content, hint=container_for(audio_data.mimetype, audio_data.filename))
+                print(f"🎤 Transcribing {ingested.source_container} audio as {ingested.container}...")
+                transcript = stt_router.transcribe(ingested.audio, ingested.container, ingested.sample_rate)
+                print(f"✅ {transcript.engine} transcript: '{transcript.text}'")
+                return jsonify({'transcript': transcript.text})
                 
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{file_ext}') as temp_file:
-                    audio_data.save(temp_file.name)
-                    temp_file_path = temp_file.name
-                    print(f"💾 Saved audio to: {temp_file_path} (format: {file_ext})")
-                
-                # Use Google Cloud Speech-to-Text for speech recognition
-                try:
-                    from google.cloud import speech
-                    
-                    # Initialize the client
-                    client = speech.SpeechClient()
-                    
-                    # Read the audio file
-                    with open(temp_file_path, 'rb') as audio_file:
-                        content = audio_file.read()
-                    
-                    # Configure the recognition
-                    audio = speech.RecognitionAudio(content=content)
-                    config = speech.RecognitionConfig(
-                        encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                        language_code="en-US",
-                        enable_automatic_punctuation=True,
-                    )
-                    
-                    print("🎤 Sending to Google Cloud Speech-to-Text API...")
-                    response = client.recognize(config=config, audio=audio)
-                    
-                    # Extract the transcript
-                    transcript = ""
-                    for result in response.results:
-                        transcript += result.alternatives[0].transcript
-                    
-                    print(f"✅ Google Cloud Speech response: '{transcript}'")
-                    return jsonify({'transcript': transcript})
-                    
-                except Exception as e:
-                    print(f"❌ Error in Google Cloud Speech transcription: {e}")
-                    return jsonify({'error': str(e)}), 500
-                finally:
-                    # Clean up temporary file
-                    if temp_file_path and os.path.exists(temp_file_path):
-                        try:
-                            os.unlink(temp_file_path)
-                            print("🗑️  Cleaned up temp file")
-                        except Exception as e:
-                            print(f"⚠️  Warning: Could not delete temp file {temp_file_path}: {e}")
-                            
             except Exception as e:
-                print(f"❌ Error saving audio file: {e}")
-                return jsonify({'error': 'Error processing audio file'}), 500
+                print(f"❌ Error in speech transcription: {e}")
+                return jsonify({'error': str(e)}), 500
                 
         except Exception as e:
             print(f"❌ Error in speech-to-text: {e}")
@@ -140,50 +152,78 @@ def create_app():
     
     @app.route('/api/text-to-speech', methods=['POST'])
     def text_to_speech():
-        """Convert text to speech using ElevenLabs TTS with debug logging"""
+        """Convert text to speech with the engine the TTS router picks"""
         try:
-            import requests
             data = request.get_json()
             text = data.get('text', '')
             if not text:
                 print("No text provided")
                 return jsonify({'error': 'No text provided'}), 400
+            
+            speech = tts_router.synthesize(text, format_from_request(data))
+            return jsonify({
+                'audio': offload.encode_base64(speech.audio),
+                'mimetype': speech.mimetype,
+                'engine': speech.engine
+            })
 
-            api_key = os.getenv('ELEVENLABS_API_KEY')
-            if not api_key:
-                print("No ElevenLabs API key set")
-                return jsonify({'error': 'ElevenLabs API key not set'}), 500
-
-            voice_id = "21m00Tcm4TlvDq8ikWAM"  # Rachel voice ID - more reliable
-            url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-
-            headers = {
-                "xi-api-key": api_key,
-                "Content-Type": "application/json"
-            }
-            payload = {
-                "text": text,
-                "voice_settings": {
-                    "stability": 0.5,
-                    "similarity_boost": 0.75
-                }
-            }
-
-            response = requests.post(url, headers=headers, json=payload)
-            print(f"ElevenLabs API status: {response.status_code}")
-            if response.status_code != 200:
-                print("ElevenLabs API error response:", response.text)
-                return jsonify({'error': 'ElevenLabs TTS failed', 'details': response.text}), 500
-
-            audio_content = response.content
-            audio_base64 = base64.b64encode(audio_content).decode('utf-8')
-            return jsonify({'audio': audio_base64})
-
+        except TTSUnavailableError as e:
+            # Let the browser speak the text itself instead
+            print(f"Text-to-speech unavailable: {e}")
+            return jsonify({'error': 'Text-to-speech unavailable', 'fallback': 'browser'}), 503
         except Exception as e:
             import traceback
-            print("Exception in ElevenLabs TTS:", traceback.format_exc())
+            print("Exception in text-to-speech:", traceback.format_exc())
+            return jsonify({'error': str(e)}), 500
+    
+    @app.route('/api/text-to-speech/stream', methods=['GET', 'POST'])
+    def text_to_speech_stream():
+        """Stream speech audio as it is synthesized (chunked)
+        
+        GET ?text=... lets an <audio> element start playing on the first chunk.
+        """
+        try:
+            values = request.args if request.method == 'GET' else (request.get_json(silent=True) or {})
+            text = values.get('text', '')
+            if not text:
+                return jsonify({'error': 'No text provided'}), 400
+            
+            speech = tts_router.stream(text, format_from_request(values))
+            return Response(
+                stream_with_context(speech.chunks),
+                mimetype=speech.mimetype,
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no', 'X-TTS-Engine': speech.engine}
+            )
+        
+        except TTSUnavailableError as e:
+            print(f"Text-to-speech unavailable: {e}")
+            return jsonify({'error': 'Text-to-speech unavailable', 'fallback': 'browser'}), 503
+        except Exception as e:
+            print(f"Error streaming text-to-speech: {e}")
             return jsonify({'error': str(e)}), 500
     
+    def _emit_audio_stream(text, fmt, cancelled=None):
+        """Send speech as ordered binary audio_chunk events, then audio_end
+        
+        Uncompressed WAV (the local engine without ffmpeg) is sent as a
+        single audio_response instead.
+        """
+        speech = tts_router.stream(text, fmt, cancel=cancelled)
+        if speech.mimetype == 'audio/wav':
+            audio = b''.join(speech.chunks)
+            emit('audio_response', {'audio': offload.encode_base64(audio), 'mimetype': speech.mimetype})
+            return
+        seq = 0
+        for chunk in speech.chunks:
+            if cancelled is not None and cancelled.is_set():
+                close = getattr(speech.chunks, 'close', None)
+                if close is not None:
+                    close()
+                return
+            emit('audio_chunk', {'seq': seq, 'data': chunk, 'mimetype': speech.mimetype})
+            seq += 1
+        emit('audio_end', {'chunks': seq})
+    
     @app.route('/api/chat', methods=['POST'])
     def chat():
         """Process chat messages using GPT-4o"""
@@ -196,8 +236,18 @@ def create_app():
             if not user_message:
                 return jsonify({'error': 'No message provided'}), 400
             
+            session_id = _chat_session_id(data)
+            
+            # Stream tokens as Server-Sent Events when the client asks for it
+            if data.get('stream') or 'text/event-stream' in request.headers.get('Accept', ''):
+                return Response(
+                    stream_with_context(_chat_events(user_message, lat, lon, session_id)),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+                )
+            
             # Process the message through Prism assistant
-            response = prism.process_query(user_message, lat=lat, lon=lon)
+            response = prism.process_query(user_message, lat=lat, lon=lon, session_id=session_id)
             
             return jsonify({'response': response})
             
@@ -205,6 +255,26 @@ def create_app():
             print(f"Error in chat: {e}")
             return jsonify({'error': str(e)}), 500
     
+    def _chat_session_id(data):
+        """Conversation an HTTP chat message belongs to: the client's session_id, or one kept in its cookie"""
+        if data.get('session_id'):
+            return f"http:{data['session_id']}"
+        if 'conversation' not in session:
+            session['conversation'] = uuid.uuid4().hex
+        return f"http:{session['conversation']}"
+    
+    def _chat_events(user_message, lat, lon, session_id):
+        """Server-Sent Events for a streamed chat reply: deltas, then the full text"""
+        parts = []
+        try:
+            for delta in prism.process_query_stream(user_message, lat=lat, lon=lon, session_id=session_id):
+                parts.append(delta)
+                yield f"data: {json.dumps({'delta': delta})}\n\n"
+            yield f"event: done\ndata: {json.dumps({'response': ''.join(parts)})}\n\n"
+        except Exception as e:
+            print(f"Error in chat stream: {e}")
+            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+    
     @app.route('/api/weather', methods=['GET'])
     def get_weather():
         """Get weather information"""
@@ -368,6 +438,37 @@ def create_app():
             print(f"Error calculating: {e}")
             return jsonify({'error': str(e)}), 500
     
+    @app.route('/api/calculate/batch', methods=['POST'])
+    def calculate_batch():
+        """Perform many calculations in one request"""
+        try:
+            data = request.get_json()
+            expressions = data.get('expressions')
+            
+            if not isinstance(expressions, list) or not expressions:
+                return jsonify({'error': 'A non-empty list of expressions is required'}), 400
+            if len(expressions) > MAX_BATCH_SIZE:
+                return jsonify({'error': f'At most {MAX_BATCH_SIZE} expressions per batch'}), 400
+            if not all(isinstance(expression, str) for expression in expressions):
+                return jsonify({'error': 'Expressions must be strings'}), 400
+            
+            results = calculator_service.calculate_batch(expressions)
+            return jsonify({
+                'results': [
+                    {
+                        'expression': item.expression,
+                        'value': item.value,
+                        'result': item.result,
+                        'error': item.error
+                    }
+                    for item in results
+                ]
+            })
+            
+        except Exception as e:
+            print(f"Error calculating batch: {e}")
+            return jsonify({'error': str(e)}), 500
+    
     @app.route('/api/joke', methods=['GET'])
     def get_joke():
         """Get a random joke"""
@@ -390,20 +491,119 @@ def create_app():
             print(f"Error getting quote: {e}")
             return jsonify({'error': str(e)}), 500
     
+    @app.route('/api/metrics', methods=['GET'])
+    def get_metrics():
+        """Report cache and upstream performance counters"""
+        try:
+            return jsonify({
+                'llm_cache': prism.response_cache.stats(),
+                'upstream': upstream.stats(),
+                'circuit_breakers': breakers.stats(),
+                'audio_bundle': audio_bundles.stats(),
+                'audio_ingest': audio_ingest.stats(),
+                'stt': stt_router.stats(),
+                'tts': tts_router.stats(),
+                'turns': turns.stats(),
+                'state': state_store.stats(),
+                'offload': offload.stats(),
+                'speculation': speculator.stats() if speculator is not None else {'enabled': False}
+            })
+        except Exception as e:
+            print(f"Error getting metrics: {e}")
+            return jsonify({'error': str(e)}), 500
+    
+    def _negotiate_audio_format(offer):
+        """Pick and announce the response audio format for this client"""
+        fmt = format_from_request(offer or {})
+        state_store.hset(CLIENT_FORMATS_KEY, request.sid, fmt.name)
+        audio_bundles.warm(fmt)
+        emit('audio_format', fmt.describe())
+        return fmt
+    
     @socketio.on('connect')
-    def handle_connect():
-        """Handle WebSocket connection"""
-        print('Client connected')
+    def handle_connect(auth=None):
+        """Handle WebSocket connection
+        
+        The client may offer response audio in ``auth``:
+        {'audio': {'codecs': ['opus', 'mp3'], 'max_bitrate': 32}}
+        """
+        fmt = _negotiate_audio_format((auth or {}).get('audio'))
+        print(f'Client connected (audio: {fmt.name})')
         emit('status', {'message': 'Connected to Prism'})
     
+    @socketio.on('audio_format')
+    def handle_audio_format(data):
+        """Renegotiate the response audio format, e.g. after a network change"""
+        _negotiate_audio_format(data)
+    
     @socketio.on('disconnect')
     def handle_disconnect():
         """Handle WebSocket disconnection"""
+        state_store.hdel(CLIENT_FORMATS_KEY, request.sid)
+        turns.cancel(request.sid)
+        prism.end_session(request.sid)
         print('Client disconnected')
     
+    @socketio.on('cancel')
+    def handle_cancel():
+        """Abort this session's turn in flight, e.g. when the user starts speaking over it"""
+        cancelled = turns.cancel(request.sid)
+        if cancelled:
+            print(f"⏹️  Cancelled {cancelled} turn(s) for {request.sid}")
+        emit('cancelled', {'turns': cancelled})
+    
+    def _emit_streamed_response(user_message, lat=None, lon=None, cancelled=None):
+        """Emit assistant_delta events while the reply streams, then assistant_response
+        
+        Returns None if the turn was cancelled part way.
+        """
+        parts = []
+        deltas = prism.process_query_stream(user_message, lat=lat, lon=lon, cancel=cancelled,
+                                            session_id=request.sid)
+        try:
+            for delta in deltas:
+                if cancelled is not None and cancelled.is_set():
+                    deltas.close()
+                    return None
+                parts.append(delta)
+                emit('assistant_delta', {'text': delta})
+        except Cancelled:
+            return None
+        assistant_response = ''.join(parts)
+        emit('assistant_response', {'text': assistant_response})
+        return assistant_response
+    
+    def _queue_turn(handler, data, supersede=False):
+        """Run a socket handler as this session's next turn on the shared pool"""
+        turn = copy_current_request_context(handler)
+        turns.submit(request.sid, lambda cancelled: turn(data, cancelled), supersede=supersede)
+    
+    @socketio.on('text_input')
+    def handle_text_input(data):
+        """Queue a typed message behind this session's earlier turns"""
+        _queue_turn(_text_turn, data)
+    
+    def _text_turn(data, cancelled):
+        """Stream the reply to a typed message over the socket"""
+        try:
+            message = (data or {}).get('message', '')
+            if not message:
+                emit('error', {'message': 'No message provided'})
+                return
+            _emit_streamed_response(message, lat=data.get('lat'), lon=data.get('lon'), cancelled=cancelled)
+        except Cancelled:
+            print("⏹️  Text turn cancelled")
+        except Exception as e:
+            print(f"Error processing text input: {e}")
+            emit('error', {'message': str(e)})
+    
     @socketio.on('voice_input')
     def handle_voice_input(data):
-        """Handle real-time voice input"""
+        """Queue voice input; a new utterance supersedes the one in flight (barge-in)"""
+        _queue_turn(_voice_turn, data, supersede=True)
+    
+    def _voice_turn(data, cancelled):
+        """Transcribe an utterance, then stream the reply text and audio"""
         try:
             # Process the voice input
             audio_data = data.get('audio')
@@ -442,105 +642,72 @@ def create_app():
                     emit('error', {'message': 'Error decoding audio data'})
                     return
                 
-                # Save to temporary file as WAV (Google Cloud's most reliable format)
-                temp_file_path = None
+                speculation = None
                 try:
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
-                        temp_file.write(audio_bytes)
-                        temp_file_path = temp_file.name
-                        print(f"💾 Saved audio as WAV: {temp_file_path}")
-                        print(f"💾 File size: {os.path.getsize(temp_file_path)} bytes")
+                    ingested = audio_ingest.normalize(audio_bytes, hint=container_for(mime_type))
+                    on_partial = None
+                    if speculator is not None:
+                        # Stream recognition so a stable partial transcript can
+                        # start the reply before the final one arrives
+                        sid = request.sid
+                        speculation = speculator.begin(
+                            lambda text, speculating: prism.prepare_reply(text, speculating, session_id=sid))
+                        on_partial = speculation.observe
+                    print(f"🎤 Transcribing {ingested.source_container} audio as {ingested.container}...")
+                    result = stt_router.transcribe(ingested.audio, ingested.container, ingested.sample_rate,
+                                                   on_partial=on_partial, cancel=cancelled)
+                    transcript = result.text
+                    
+                    print(f"✅ {result.engine} transcript: '{transcript}'")
+                    if cancelled.is_set():
+                        if speculation is not None:
+                            speculation.resolve('')
+                        return
+                    emit('transcript', {'text': transcript})
+                    
+                    # Use the speculative reply if it was made for this transcript
+                    assistant_response = None
+                    prepared = speculation.resolve(transcript) if speculation is not None else None
+                    if prepared is not None:
+                        assistant_response = prism.use_prepared_reply(prepared, transcript)
+                        if assistant_response is not None:
+                            emit('assistant_response', {'text': assistant_response})
+                    if assistant_response is None:
+                        # Process with GPT-4o, forwarding tokens as they arrive
+                        assistant_response = _emit_streamed_response(transcript, cancelled=cancelled)
+                    if assistant_response is None or cancelled.is_set():
+                        print("⏹️  Turn superseded; skipping speech")
+                        return
                     
-                    # Use Google Cloud Speech-to-Text for speech recognition
+                    # Generate the spoken reply (same engines as the text-to-speech endpoint)
+                    audio_format = _client_format(request.sid)
                     try:
-                        from google.cloud import speech
+                        if tts_streaming:
+                            _emit_audio_stream(assistant_response, audio_format, cancelled)
+                            return
                         
-                        # Initialize the client
-                        client = speech.SpeechClient()
+                        speech = tts_router.synthesize(assistant_response, audio_format, cancel=cancelled)
+                        emit('audio_response', {
+                            'audio': offload.encode_base64(speech.audio),
+                            'mimetype': speech.mimetype
+                        })
                         
-                        # Read the audio file
-                        with open(temp_file_path, 'rb') as audio_file:
-                            content = audio_file.read()
-                        
-                        print(f"📖 Read {len(content)} bytes from temp file")
-                        
-                        # Configure the recognition
-                        audio = speech.RecognitionAudio(content=content)
-                        config = speech.RecognitionConfig(
-                            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                            language_code="en-US",
-                            enable_automatic_punctuation=True,
-                        )
-                        
-                        print("🎤 Sending to Google Cloud Speech-to-Text API...")
-                        response = client.recognize(config=config, audio=audio)
-                        
-                        # Extract the transcript
-                        transcript = ""
-                        for result in response.results:
-                            transcript += result.alternatives[0].transcript
-                        
-                        print(f"✅ Google Cloud Speech response: '{transcript}'")
-                        emit('transcript', {'text': transcript})
-                        
-                        # Process with GPT-4o
-                        assistant_response = prism.process_query(transcript)
-                        emit('assistant_response', {'text': assistant_response})
-                        
-                        # Generate speech response using ElevenLabs TTS (same as text-to-speech endpoint)
-                        try:
-                            import requests
-                            api_key = os.getenv('ELEVENLABS_API_KEY')
-                            if not api_key:
-                                print("No ElevenLabs API key set")
-                                emit('error', {'message': 'ElevenLabs API key not set'})
-                                return
-
-                            voice_id = "21m00Tcm4TlvDq8ikWAM"  # Rachel voice ID - same as text-to-speech endpoint
-                            url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-
-                            headers = {
-                                "xi-api-key": api_key,
-                                "Content-Type": "application/json"
-                            }
-                            payload = {
-                                "text": assistant_response,
-                                "voice_settings": {
-                                    "stability": 0.5,
-                                    "similarity_boost": 0.75
-                                }
-                            }
-
-                            response = requests.post(url, headers=headers, json=payload)
-                            print(f"ElevenLabs API status: {response.status_code}")
-                            if response.status_code != 200:
-                                print("ElevenLabs API error response:", response.text)
-                                emit('error', {'message': 'ElevenLabs TTS failed'})
-                                return
-
-                            audio_content = response.content
-                            audio_base64 = base64.b64encode(audio_content).decode('utf-8')
-                            emit('audio_response', {'audio': audio_base64})
-                            
-                        except Exception as e:
-                            print(f"Error generating speech: {e}")
-                            emit('error', {'message': 'Error generating speech response'})
-                            
+                    except Cancelled:
+                        print("⏹️  Turn cancelled during speech")
+                    except TTSUnavailableError as e:
+                        print(f"Text-to-speech unavailable: {e}")
+                        emit('tts_fallback', {'text': assistant_response})
                     except Exception as e:
-                        print(f"Error in Google Cloud Speech transcription: {e}")
-                        emit('error', {'message': 'Error transcribing audio'})
-                    finally:
-                        # Clean up temporary file
-                        if temp_file_path and os.path.exists(temp_file_path):
-                            try:
-                                os.unlink(temp_file_path)
-                                print("🗑️  Cleaned up temp file")
-                            except Exception as e:
-                                print(f"⚠️  Warning: Could not delete temp file {temp_file_path}: {e}")
-                                
+                        print(f"Error generating speech: {e}")
+                        emit('error', {'message': 'Error generating speech response'})
+                        
+                except Cancelled:
+                    if speculation is not None:
+                        speculation.resolve('')
+                    print("⏹️  Voice turn cancelled")
                 except Exception as e:
-                    print(f"Error saving audio file: {e}")
-                    emit('error', {'message': 'Error processing audio file'})
+                    print(f"Error in speech transcription: {e}")
+                    emit('error', {'message': 'Error transcribing audio'})
             else:
                 print("❌ No audio data received in WebSocket")
                 emit('error', {'message': 'No audio data received'})
@@ -3,8 +3,12 @@ Core Prism Assistant class
 Handles conversation and feature integration
 """
 
+import hashlib
 import re
-from typing import Dict, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from openai import OpenAI
 import os
 
@@ -15,12 +19,62 @@ from ..features.calculator import calculator_service
 from ..features.jokes import joke_service
 from ..features.quotes import quote_service
 from ..features.search import search_service
+from ..utils.cancellation import CancelToken, Cancelled
+from ..utils.state import StateBackend, state_store
+from ..utils.upstream import DEFAULT_SLOS, Deadline, upstream
+from .response_cache import ResponseCache
+from .context import ContextBuilder, TokenCounter
+from .intents import load_classifier
+from .tools import TOOL_DEFINITIONS, ToolRunner, assistant_tool_message
+
+def history_key(session_id: str) -> str:
+    """State backend list holding one session's conversation"""
+    return f"history:{session_id}"
+
+def _history_mark(history: List[Dict[str, str]]) -> Tuple[int, Optional[Dict[str, str]]]:
+    """Length and newest message of a conversation, to tell whether it has moved on
+
+    History is capped, so once it is full its length alone stays the same.
+    """
+    return len(history), history[-1] if history else None
+
+# Where a spoken request may join separate asks: "the weather, and also the news"
+_CLAUSE_SPLIT_RE = re.compile(r"\s*(?:[,;]|\b(?:and also|and then|as well as|and|also|then)\b)\s*", re.IGNORECASE)
+
+@dataclass
+class PreparedReply:
+    """Work done ahead of time for a turn: its routing and, for GPT turns, the reply"""
+    user_input: str
+    intents: List[Tuple[str, str]]
+    text: Optional[str]
+    history_mark: Tuple[int, Optional[Dict[str, str]]]
+    session_id: Optional[str] = None
+
+def _close_stream(stream):
+    """Release a streamed completion that lost a hedge or was cancelled"""
+    close = getattr(stream, 'close', None)
+    if close is not None:
+        close()
 
 class PrismAssistant:
     """Main assistant class for Prism AI Voice Assistant"""
     
-    def __init__(self):
-        self.conversation_history: List[Dict[str, str]] = []
+    # Fixed replies; fixed_responses() lists them for pre-synthesized audio
+    ERROR_RESPONSE = "I'm sorry, I encountered an error processing your request. Please try again."
+    EMPTY_RESPONSE = "I'm sorry, I couldn't generate a response. Please try again."
+    # Used when the model is out of time budget or its circuit breaker is open
+    FALLBACK_RESPONSE = "I'm sorry, I'm having trouble answering right now. Please try again in a moment."
+    NEWS_UNAVAILABLE_RESPONSE = "I'm sorry, I couldn't fetch the latest news at the moment."
+    REMINDER_TIME_PROMPT = "Please specify when you'd like to be reminded. For example: 'remind me to call mom tomorrow at 3pm'"
+    REMINDER_FORMAT_PROMPT = "I didn't understand the reminder format. Please say something like 'remind me to call mom tomorrow at 3pm'"
+    JOKE_PREFIX = "Here's a joke for you: "
+    QUOTE_PREFIX = "Here's an inspirational quote: "
+    
+    def __init__(self, store: Optional[StateBackend] = None):
+        # History lives in the state backend so any worker can continue the
+        # conversation; each session has its own, dropped after it goes idle
+        self.store = store if store is not None else state_store
+        self.history_ttl = float(os.getenv('CONVERSATION_TTL', '86400'))
         self.system_prompt = """You are Prism, an intelligent and helpful AI voice assistant. 
         You should be conversational, friendly, and provide helpful responses. 
         Keep your responses concise but informative. You can help with:
@@ -33,115 +87,533 @@ class PrismAssistant:
         - Answering questions about various topics
         
         Always respond in a natural, conversational tone."""
+        self.model = "gpt-4o-mini"  # Using GPT-4o-mini for best balance of capability and cost
+        self.max_tokens = 500
+        self.short_max_tokens = 150  # Used when the deadline can't fit a full-length reply
+        self.temperature = 0.7
+        # Recent history is packed into a token budget; older turns are summarized
+        self.context_builder = ContextBuilder(
+            budget_tokens=int(os.getenv('CONTEXT_TOKEN_BUDGET', '3000')),
+            summary_tokens=int(os.getenv('CONTEXT_SUMMARY_TOKENS', '200')),
+            counter=TokenCounter(self.model),
+            max_messages=int(os.getenv('CONTEXT_MAX_MESSAGES', '100'))
+        )
+        # Confident local intent predictions go straight to the feature services
+        self.intent_classifier = load_classifier(os.getenv('INTENT_PHRASES_PATH'))
+        self.intent_threshold = float(os.getenv('INTENT_CONFIDENCE', '0.6'))
+        self._feature_handlers = {
+            'weather': self._weather_response,
+            'time': self._time_response,
+            'news': self._news_response,
+            'reminder': lambda user_input, lat=None, lon=None: self._handle_reminder_request(user_input),
+            'calculator': self._calculator_response,
+            'joke': self._joke_response,
+            'quote': self._quote_response,
+            'search': self._search_response,
+        }
+        # Multi-intent queries run their feature lookups side by side
+        self._feature_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('FEATURE_FANOUT_WORKERS', '4')), thread_name_prefix='prism-features'
+        )
+        self.feature_timeout = float(os.getenv('FEATURE_TIMEOUT_MS', '2000')) / 1000
+        # Tool-calling mode: GPT picks the feature services itself, and can
+        # call several at once for compound requests
+        self.tool_calling = os.getenv('LLM_TOOL_CALLING', 'false').lower() in ('1', 'true', 'yes')
+        self.tool_runner = ToolRunner()
+        # Repeated context-free prompts ("who are you") skip the model call
+        self.response_cache = ResponseCache(
+            max_entries=int(os.getenv('LLM_CACHE_SIZE', '1024')),
+            ttl_seconds=float(os.getenv('LLM_CACHE_TTL', '3600')),
+            disabled_intents=[i.strip() for i in os.getenv('LLM_CACHE_DISABLED_INTENTS', '').split(',') if i.strip()],
+            store=self.store if self.store.shared else None,
+            cache_first_turns=os.getenv('LLM_CACHE_FIRST_TURN', 'false').lower() in ('1', 'true', 'yes')
+        )
     
-    def process_query(self, user_input: str, lat=None, lon=None) -> str:
-        """Process user input and generate response using GPT-4o with integrated features"""
+    def process_query(self, user_input: str, lat=None, lon=None, deadline: Optional[Deadline] = None,
+                      cancel: Optional[CancelToken] = None, session_id: Optional[str] = None) -> str:
+        """Process user input and generate response using GPT-4o with integrated features
+        
+        The turn continues ``session_id``'s conversation; without one it
+        has no history and isn't recorded. Raises Cancelled, without
+        recording the turn's reply, if ``cancel`` fires while GPT is answering.
+        """
+        deadline = deadline or upstream.deadline('llm')
         try:
             # Check for specific feature requests first
-            feature_response = self._handle_feature_requests(user_input, lat=lat, lon=lon)
+            feature_response = self._local_feature_response(user_input, lat=lat, lon=lon)
             if feature_response:
                 return feature_response
             
-            # Add user input to conversation history
-            self.conversation_history.append({"role": "user", "content": user_input})
+            # Serve repeated stateless prompts from the response cache
+            history = self._history(session_id)
+            cache_key = self._cache_key(user_input, history)
+            cached = self.response_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                self._record_cached_turn(session_id, user_input, cached)
+                return cached
             
-            # Prepare messages for OpenAI
-            messages = [{"role": "system", "content": self.system_prompt}] + self.conversation_history[-10:]  # Keep last 10 messages
+            # Add user input to conversation history
+            messages = self._start_turn(session_id, user_input, history)
             
             # Get response from GPT-4o
             client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",  # Using GPT-4o-mini for best balance of capability and cost
-                messages=messages,  # type: ignore
-                max_tokens=500,
-                temperature=0.7
-            )
+            response = self._complete(client, messages, deadline, cancel=cancel, **self._tool_options())
+            if response is not None and self._run_tool_calls(response, messages, lat, lon):
+                cache_key = None  # Tool results are live data
+                response = self._complete(client, messages, deadline, cancel=cancel)
+            if response is None:
+                return self.FALLBACK_RESPONSE
             
             assistant_response = response.choices[0].message.content
             if assistant_response is None:
-                assistant_response = "I'm sorry, I couldn't generate a response. Please try again."
+                assistant_response = self.EMPTY_RESPONSE
+            elif cache_key:
+                usage = getattr(response, 'usage', None)
+                self.response_cache.put(cache_key, assistant_response, getattr(usage, 'total_tokens', 0) or 0)
             
             # Add assistant response to conversation history
-            self.conversation_history.append({"role": "assistant", "content": assistant_response})
+            self._record(session_id, {"role": "assistant", "content": assistant_response})
             
             return assistant_response
             
+        except Cancelled:
+            raise
         except Exception as e:
             print(f"Error processing query: {e}")
-            return "I'm sorry, I encountered an error processing your request. Please try again."
+            return self.ERROR_RESPONSE
+    
+    def process_query_stream(self, user_input: str, lat=None, lon=None,
+                             deadline: Optional[Deadline] = None,
+                             cancel: Optional[CancelToken] = None,
+                             session_id: Optional[str] = None) -> Iterator[str]:
+        """Like process_query, but yields the response in pieces as GPT generates them
+        
+        Feature responses are yielded whole. The full GPT response is added to
+        the conversation history once the stream ends (or is closed early).
+        The deadline covers the wait for the stream to start. ``cancel``
+        closes the completion stream mid-flight and raises Cancelled.
+        """
+        deadline = deadline or upstream.deadline('llm')
+        try:
+            feature_response = self._local_feature_response(user_input, lat=lat, lon=lon)
+        except Exception as e:
+            print(f"Error processing query: {e}")
+            yield self.ERROR_RESPONSE
+            return
+        if feature_response:
+            yield feature_response
+            return
+        
+        history = self._history(session_id)
+        cache_key = self._cache_key(user_input, history)
+        cached = self.response_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            self._record_cached_turn(session_id, user_input, cached)
+            yield cached
+            return
+        
+        messages = self._start_turn(session_id, user_input, history)
+        parts: List[str] = []
+        total_tokens = 0
+        unregister = None
+        try:
+            client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+            if self.tool_calling:
+                # Tool calls are decided on a regular completion; only the
+                # answer that follows them is streamed
+                response = self._complete(client, messages, deadline, cancel=cancel, **self._tool_options())
+                if response is None:
+                    yield self.FALLBACK_RESPONSE
+                    return
+                if not self._run_tool_calls(response, messages, lat, lon):
+                    content = response.choices[0].message.content
+                    if content:
+                        parts.append(content)
+                        yield content
+                        if cache_key:
+                            usage = getattr(response, 'usage', None)
+                            self.response_cache.put(cache_key, content, getattr(usage, 'total_tokens', 0) or 0)
+                    else:
+                        yield self.EMPTY_RESPONSE
+                    return
+                cache_key = None  # Tool results are live data
+            stream = self._complete(client, messages, deadline, cancel=cancel, stream=True,
+                                    stream_options={"include_usage": True})
+            if stream is None:
+                yield self.FALLBACK_RESPONSE
+                return
+            if cancel is not None:
+                unregister = cancel.on_cancel(lambda: _close_stream(stream))
+            for chunk in stream:
+                usage = getattr(chunk, 'usage', None)
+                if usage is not None:
+                    total_tokens = getattr(usage, 'total_tokens', 0) or 0
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            if not parts:
+                yield self.EMPTY_RESPONSE
+            elif cache_key:
+                self.response_cache.put(cache_key, "".join(parts), total_tokens)
+        except Exception as e:
+            if cancel is not None and cancel.is_set():
+                raise Cancelled() from e
+            print(f"Error processing query: {e}")
+            if not parts:
+                yield self.ERROR_RESPONSE
+        finally:
+            if unregister is not None:
+                unregister()
+            if parts:
+                self._record(session_id, {"role": "assistant", "content": "".join(parts)})
+    
+    def prepare_reply(self, user_input: str, cancelled: Optional[CancelToken] = None,
+                      session_id: Optional[str] = None) -> Optional[PreparedReply]:
+        """Route a query and, if GPT must answer it, generate the reply without recording the turn
+        
+        Used to get ahead on a partial transcript. Feature queries are only
+        routed, since their handlers can have side effects. Returns None if
+        ``cancelled`` is set or generation fails.
+        """
+        history = self._history(session_id)
+        if self.tool_calling:
+            return PreparedReply(user_input, [], None, _history_mark(history), session_id)
+        intents = self._detect_intents(user_input)
+        if intents or self._cache_key(user_input, history) is not None:
+            # Answered locally or from the response cache; nothing to generate
+            return PreparedReply(user_input, intents, None, _history_mark(history), session_id)
+        
+        messages = self.context_builder.build(
+            self.system_prompt, history + [{"role": "user", "content": user_input}]
+        )
+        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        try:
+            stream = self._complete(client, messages, upstream.deadline('llm'), cancel=cancelled, stream=True)
+        except Cancelled:
+            return None
+        if stream is None:
+            return None
+        unregister = cancelled.on_cancel(lambda: _close_stream(stream)) if cancelled is not None else None
+        parts: List[str] = []
+        try:
+            for chunk in stream:
+                if cancelled is not None and cancelled.is_set():
+                    return None
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+        except Exception:
+            if cancelled is not None and cancelled.is_set():
+                return None
+            raise
+        finally:
+            if unregister is not None:
+                unregister()
+        if not parts:
+            return None
+        return PreparedReply(user_input, [], "".join(parts), _history_mark(history), session_id)
+    
+    def use_prepared_reply(self, reply: PreparedReply, user_input: str, lat=None, lon=None) -> Optional[str]:
+        """Answer the turn from a prepared reply, or None if it has to be answered normally
+        
+        ``user_input`` is the final transcript; the reply may have been
+        prepared from a partial one, so the turn is answered and recorded
+        with the final text.
+        """
+        try:
+            if reply.intents:
+                return self._answer_intents(reply.intents, user_input, lat, lon)
+            if reply.text is None or _history_mark(self._history(reply.session_id)) != reply.history_mark:
+                return None
+            self._record_cached_turn(reply.session_id, user_input, reply.text)
+            return reply.text
+        except Exception as e:
+            print(f"Error using prepared reply: {e}")
+            return None
+    
+    # Routed (never answered) by warm_up, to exercise each intent's patterns
+    WARM_UP_QUERIES = [
+        "what's the weather and any news",
+        "what time is it",
+        "what is 15 plus 27",
+        "remind me to stretch at 3pm",
+        "tell me a joke and an inspirational quote",
+        "search for python",
+        "hello there",
+    ]
+    
+    def warm_up(self) -> None:
+        """Build everything that is otherwise built on first use
+        
+        Loads the tokenizer and compiles the routing patterns, without
+        side effects, so a master process can do it once before forking
+        workers that then share the result.
+        """
+        self.context_builder.counter.count_text(self.system_prompt)
+        for query in self.WARM_UP_QUERIES:
+            self._detect_intents(query)
+            self._cache_key(query, [])
+    
+    def conversation_history(self, session_id: str) -> List[Dict[str, str]]:
+        """A session's conversation so far, oldest message first"""
+        return self._history(session_id)
+    
+    def end_session(self, session_id: str) -> None:
+        """Forget a session's conversation"""
+        self.store.delete(history_key(session_id))
+    
+    def fixed_responses(self) -> List[str]:
+        """Every reply whose exact text is known ahead of time"""
+        return [
+            self.ERROR_RESPONSE,
+            self.EMPTY_RESPONSE,
+            self.FALLBACK_RESPONSE,
+            self.NEWS_UNAVAILABLE_RESPONSE,
+            self.REMINDER_TIME_PROMPT,
+            self.REMINDER_FORMAT_PROMPT,
+        ] + [self.JOKE_PREFIX + joke for joke in joke_service.jokes] \
+          + [self.QUOTE_PREFIX + quote for quote in quote_service.quotes]
+    
+    def _complete(self, client, messages: List[Dict[str, Any]], deadline: Deadline,
+                  cancel: Optional[CancelToken] = None, **options):
+        """One chat completion under the LLM deadline, or None if the budget runs out"""
+        max_tokens = self._max_tokens_for(deadline)
+        return upstream.call('llm', lambda timeout: client.chat.completions.create(
+            model=self.model,
+            messages=messages,  # type: ignore
+            max_tokens=max_tokens,
+            temperature=self.temperature,
+            timeout=timeout,
+            **options
+        ), deadline=deadline, fallback=lambda: None,
+            discard=_close_stream if options.get('stream') else None, cancel=cancel)
+    
+    def _tool_options(self) -> Dict[str, Any]:
+        """Completion options that offer GPT the feature tools, if tool calling is on"""
+        if not self.tool_calling:
+            return {}
+        return {"tools": TOOL_DEFINITIONS, "tool_choice": "auto", "parallel_tool_calls": True}
+    
+    def _run_tool_calls(self, response, messages: List[Dict[str, Any]], lat=None, lon=None) -> bool:
+        """Run any tool calls in a completion concurrently and add them and their
+        results to ``messages``. Returns whether there were any."""
+        message = response.choices[0].message
+        if not getattr(message, 'tool_calls', None):
+            return False
+        messages.append(assistant_tool_message(message))
+        messages.extend(self.tool_runner.run_all(message.tool_calls, lat=lat, lon=lon))
+        return True
+    
+    def _local_feature_response(self, user_input: str, lat=None, lon=None) -> Optional[str]:
+        """Answer from the feature services without GPT, unless GPT is choosing tools"""
+        if self.tool_calling:
+            return None
+        return self._handle_feature_requests(user_input, lat=lat, lon=lon)
+    
+    def _max_tokens_for(self, deadline: Deadline) -> int:
+        """Full-length replies normally, shorter ones when the budget is tight"""
+        expected = upstream.expected_latency('llm')
+        if expected is not None and deadline.remaining() < expected:
+            return self.short_max_tokens
+        return self.max_tokens
+    
+    def _cache_key(self, user_input: str, history: List[Dict[str, str]]) -> Optional[str]:
+        """Response cache key for this turn, or None if it depends on context"""
+        return self.response_cache.key_for(
+            user_input,
+            has_history=bool(history),
+            prompt_version=hashlib.sha256(self.system_prompt.encode('utf-8')).hexdigest(),
+            model=self.model,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature
+        )
+    
+    def _history(self, session_id: Optional[str]) -> List[Dict[str, str]]:
+        """The session's conversation, read once per turn; empty without a session"""
+        return self.store.items(history_key(session_id)) if session_id else []
+    
+    def _record(self, session_id: Optional[str], *messages: Dict[str, str]) -> None:
+        """Append to the session's conversation, restarting its idle timeout
+        
+        Only as many messages as the context builder would look at are kept.
+        """
+        if session_id:
+            self.store.append(history_key(session_id), *messages, ttl=self.history_ttl,
+                              max_length=self.context_builder.max_messages)
+    
+    def _record_cached_turn(self, session_id: Optional[str], user_input: str, response: str):
+        """Keep the conversation history complete when a reply comes from cache"""
+        self._record(session_id, {"role": "user", "content": user_input},
+                     {"role": "assistant", "content": response})
+    
+    def _start_turn(self, session_id: Optional[str], user_input: str,
+                    history: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Record the user's message and build the messages to send to GPT"""
+        message = {"role": "user", "content": user_input}
+        self._record(session_id, message)
+        return self.context_builder.build(self.system_prompt, history + [message])
     
     def _handle_feature_requests(self, user_input: str, lat=None, lon=None) -> Optional[str]:
         """Handle specific feature requests before sending to GPT"""
-        user_input_lower = user_input.lower()
+        intents = self._detect_intents(user_input)
+        if not intents:
+            return None  # Let GPT handle it
+        return self._answer_intents(intents, user_input, lat, lon)
+    
+    def _answer_intents(self, intents: List[Tuple[str, str]], user_input: str, lat=None, lon=None) -> str:
+        if len(intents) == 1:
+            return self._feature_handlers[intents[0][0]](user_input, lat, lon)
+        return self._fan_out(intents, lat, lon)
+    
+    def _detect_intents(self, user_input: str) -> List[Tuple[str, str]]:
+        """Every feature intent in a query, as (intent, clause) in the order asked
+        
+        "What's the weather and any news?" is split into clauses, each routed
+        on its own. Splitting only counts when it finds two or more different
+        intents, so "add 3 and 4" stays a single calculator request.
+        """
+        clauses = [clause for clause in _CLAUSE_SPLIT_RE.split(user_input) if clause and clause.strip()]
+        if len(clauses) > 1:
+            found: List[Tuple[str, str]] = []
+            for clause in clauses:
+                intent = self._detect_intent(clause)
+                if intent is not None and all(intent != seen for seen, _ in found):
+                    found.append((intent, clause.strip()))
+            if len(found) > 1:
+                return found
+        intent = self._detect_intent(user_input)
+        return [(intent, user_input)] if intent is not None else []
+    
+    def _fan_out(self, intents: List[Tuple[str, str]], lat=None, lon=None) -> str:
+        """Run several feature handlers concurrently and join their answers in order
         
+        Each service gets its own timeout (its upstream SLO, or
+        FEATURE_TIMEOUT_MS), so one slow upstream only drops its own part.
+        """
+        start = time.monotonic()
+        futures = [(intent, self._feature_executor.submit(self._feature_handlers[intent], clause, lat, lon))
+                   for intent, clause in intents]
+        parts = []
+        for intent, future in futures:
+            remaining = max(0.0, start + self._feature_timeout(intent) - time.monotonic())
+            try:
+                parts.append(future.result(timeout=remaining))
+            except FutureTimeout:
+                future.cancel()
+                print(f"⏱️  {intent} timed out in multi-intent request")
+                parts.append(f"Sorry, the {intent} is taking too long right now.")
+            except Exception as e:
+                print(f"Error handling {intent} in multi-intent request: {e}")
+                parts.append(f"Sorry, I couldn't get the {intent} right now.")
+        return " ".join(parts)
+    
+    def _feature_timeout(self, intent: str) -> float:
+        """Seconds a feature may take inside a multi-intent request"""
+        if intent in DEFAULT_SLOS:
+            return upstream.slo(intent).deadline_ms / 1000
+        return self.feature_timeout
+    
+    def _detect_intent(self, user_input: str) -> Optional[str]:
+        """Feature intent for a query, or None if GPT should answer it
+        
+        The local classifier decides when it is confident, including
+        deciding a query is general chat; otherwise the keyword rules do.
+        """
+        if self.intent_classifier is not None:
+            prediction = self.intent_classifier.predict(user_input)
+            if prediction.confidence >= self.intent_threshold:
+                # "chat" (or any label without a handler) goes to GPT
+                return prediction.intent if prediction.intent in self._feature_handlers else None
+        return self._keyword_intent(user_input.lower())
+    
+    def _keyword_intent(self, user_input_lower: str) -> Optional[str]:
+        """Intent from the first matching keyword list"""
         # Weather requests
         if any(word in user_input_lower for word in ['weather', 'temperature', 'forecast', 'rain', 'sunny', 'cold', 'hot']):
-            if lat and lon:
-                weather = weather_service.get_weather_by_coords(lat, lon)
-            else:
-                location = self._extract_location(user_input)
-                weather = weather_service.get_weather(location)
-            return f"The weather in {weather.location} is currently {weather.temperature} degrees Fahrenheit with {weather.condition}. Humidity is {weather.humidity} percent with wind speed of {weather.wind_speed} miles per hour."
-        
+            return 'weather'
         # Time requests
         elif any(word in user_input_lower for word in ['time', 'date', 'what time', 'current time']):
-            from datetime import datetime
-            now = datetime.now()
-            # Format time without leading zeros for better TTS pronunciation
-            hour = now.strftime("%I").lstrip("0")  # Remove leading zero from hour
-            minute = now.strftime("%M")
-            ampm = now.strftime("%p")
-            day = now.strftime("%A")
-            month = now.strftime("%B")
-            day_num = now.strftime("%d").lstrip("0")  # Remove leading zero from day
-            year = now.strftime("%Y")
-            
-            current_time = f"{hour}:{minute} {ampm} on {day}, {month} {day_num}, {year}"
-            return f"The current time is {current_time}."
-        
+            return 'time'
         # News requests
         elif any(word in user_input_lower for word in ['news', 'headlines', 'latest news', 'what\'s happening']):
-            news_items = news_service.get_news(limit=3)
-            if not news_items:
-                return "I'm sorry, I couldn't fetch the latest news at the moment."
-            
-            response = "Here are the latest headlines: "
-            for i, item in enumerate(news_items, 1):
-                if i == 1:
-                    response += f"First, {item.title}. "
-                elif i == len(news_items):
-                    response += f"Finally, {item.title}."
-                else:
-                    response += f"Next, {item.title}. "
-            return response
-        
+            return 'news'
         # Reminder requests
         elif any(word in user_input_lower for word in ['remind', 'reminder', 'set reminder', 'remind me']):
-            return self._handle_reminder_request(user_input)
-        
+            return 'reminder'
         # Calculator requests
         elif any(word in user_input_lower for word in ['calculate', 'what is', 'plus', 'minus', 'times', 'divided by']):
-            result = calculator_service.calculate(user_input)
-            # Check if it's a successful calculation (not an error message)
-            if not result.startswith("Error") and not result.startswith("I can only"):
-                return f"The answer is {result}."
-            else:
-                return result
-        
+            return 'calculator'
         # Joke requests
         elif any(word in user_input_lower for word in ['joke', 'funny', 'humor', 'make me laugh']):
-            return f"Here's a joke for you: {joke_service.get_joke()}"
-        
+            return 'joke'
         # Quote requests
         elif any(word in user_input_lower for word in ['quote', 'inspiration', 'motivation', 'inspirational']):
-            return f"Here's an inspirational quote: {quote_service.get_quote()}"
-        
+            return 'quote'
         # Search requests
         elif any(word in user_input_lower for word in ['search', 'find', 'look up', 'what is']):
-            query = self._extract_search_query(user_input)
-            return search_service.search_web(query)
+            return 'search'
+        return None
+    
+    def _weather_response(self, user_input: str, lat=None, lon=None) -> str:
+        if lat and lon:
+            weather = weather_service.get_weather_by_coords(lat, lon)
+        else:
+            location = self._extract_location(user_input)
+            weather = weather_service.get_weather(location)
+        return f"The weather in {weather.location} is currently {weather.temperature} degrees Fahrenheit with {weather.condition}. Humidity is {weather.humidity} percent with wind speed of {weather.wind_speed} miles per hour."
+    
+    def _time_response(self, user_input: str, lat=None, lon=None) -> str:
+        from datetime import datetime
+        now = datetime.now()
+        # Format time without leading zeros for better TTS pronunciation
+        hour = now.strftime("%I").lstrip("0")  # Remove leading zero from hour
+        minute = now.strftime("%M")
+        ampm = now.strftime("%p")
+        day = now.strftime("%A")
+        month = now.strftime("%B")
+        day_num = now.strftime("%d").lstrip("0")  # Remove leading zero from day
+        year = now.strftime("%Y")
         
-        return None  # Let GPT handle it
+        current_time = f"{hour}:{minute} {ampm} on {day}, {month} {day_num}, {year}"
+        return f"The current time is {current_time}."
+    
+    def _news_response(self, user_input: str, lat=None, lon=None) -> str:
+        news_items = news_service.get_news(limit=3)
+        if not news_items:
+            return self.NEWS_UNAVAILABLE_RESPONSE
+        
+        response = "Here are the latest headlines: "
+        for i, item in enumerate(news_items, 1):
+            if i == 1:
+                response += f"First, {item.title}. "
+            elif i == len(news_items):
+                response += f"Finally, {item.title}."
+            else:
+                response += f"Next, {item.title}. "
+        return response
+    
+    def _calculator_response(self, user_input: str, lat=None, lon=None) -> str:
+        result = calculator_service.calculate(user_input)
+        # Check if it's a successful calculation (not an error message)
+        if not result.startswith("Error") and not result.startswith("I can only"):
+            return f"The answer is {result}."
+        else:
+            return result
+    
+    def _joke_response(self, user_input: str, lat=None, lon=None) -> str:
+        return self.JOKE_PREFIX + joke_service.get_joke()
+    
+    def _quote_response(self, user_input: str, lat=None, lon=None) -> str:
+        return self.QUOTE_PREFIX + quote_service.get_quote()
+    
+    def _search_response(self, user_input: str, lat=None, lon=None) -> str:
+        query = self._extract_search_query(user_input)
+        return search_service.search_web(query)
     
     def _extract_location(self, user_input: str) -> str:
         """Extract location from user input"""
@@ -184,8 +656,8 @@ class PrismAssistant:
                     reminder_time = f"{hour}:{minute} {ampm} on {day}, {month} {day_num}"
                     return f"I've set a reminder for '{title}' at {reminder_time}."
                 else:
-                    return "Please specify when you'd like to be reminded. For example: 'remind me to call mom tomorrow at 3pm'"
+                    return self.REMINDER_TIME_PROMPT
             else:
-                return "I didn't understand the reminder format. Please say something like 'remind me to call mom tomorrow at 3pm'"
+                return self.REMINDER_FORMAT_PROMPT
         except Exception as e:
             return f"Sorry, I couldn't set that reminder: {str(e)}" 
\ No newline at end of file
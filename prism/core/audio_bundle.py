@@ -0,0 +1,272 @@
+"""
+Pre-synthesized audio for Prism AI Voice Assistant
+Serves fixed replies (jokes, quotes, error and help prompts) without a TTS call
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no prefork workers, so no other process builds
+    fcntl = None
+
+from .audio_formats import DEFAULT_FORMAT, AudioFormat
+from .tts import VOICE_ID, VOICE_SETTINGS
+
+MAGIC = b'PRSMAUD1'
+_HEADER = struct.Struct('<8sI')  # magic, index length
+
+
+def voice_fingerprint() -> str:
+    """Identifies the voice the audio was made with; a change means a new bundle"""
+    material = json.dumps({'voice_id': VOICE_ID, 'settings': VOICE_SETTINGS}, sort_keys=True)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()[:16]
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+
+
+class AudioBundle:
+    """A single memory-mapped file of MP3 clips keyed by the text they speak
+
+    Layout: magic, index length, a JSON index of {text hash: [offset,
+    length]}, then the clips back to back. The file name carries the voice
+    fingerprint and, for anything but the default, the audio format, so a
+    voice change starts fresh bundles. ``build`` keeps
+    clips whose text is still wanted, synthesizes missing ones and drops
+    the rest, so editing the joke or quote lists invalidates just those
+    entries. Builds hold a lock file next to the bundle, so when several
+    worker processes warm the same bundle one synthesizes and the rest
+    map its result.
+    """
+
+    def __init__(self, directory: str, fmt: AudioFormat = DEFAULT_FORMAT):
+        self.directory = directory
+        self.format = fmt
+        suffix = '' if fmt == DEFAULT_FORMAT else f"-{fmt.name}"
+        self.path = os.path.join(directory, f"tts-{voice_fingerprint()}{suffix}.bundle")
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, text: str) -> bool:
+        return text_key(text) in self._index
+
+    def load(self) -> bool:
+        """Map the bundle for the current voice, if one has been built"""
+        if not os.path.exists(self.path):
+            return False
+        with self._lock:
+            self._close()
+            self._file = open(self.path, 'rb')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, index_length = _HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                self._close()
+                return False
+            data_start = _HEADER.size + index_length
+            index = json.loads(self._map[_HEADER.size:data_start].decode('utf-8'))
+            self._index = {key: (data_start + offset, length) for key, (offset, length) in index.items()}
+        return True
+
+    def get(self, text: str) -> Optional[bytes]:
+        """Audio for exactly this text, or None"""
+        key = text_key(text)
+        with self._lock:
+            location = self._index.get(key)
+            if location is None or self._map is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            offset, length = location
+            return self._map[offset:offset + length]
+
+    def build(self, texts: Iterable[str], synthesize: Callable[[str], bytes]) -> int:
+        """Bring the bundle in line with ``texts``, synthesizing only what's missing
+
+        Returns the number of clips synthesized. Texts that fail to
+        synthesize are left out and retried on the next build.
+        """
+        wanted: Dict[str, str] = {text_key(text): text for text in texts if text.strip()}
+        with self._build_lock():
+            # Another process may have finished a build while we waited
+            self.load()
+            clips: Dict[str, bytes] = {}
+            for key in wanted:
+                existing = self._read(key)
+                if existing is not None:
+                    clips[key] = existing
+            synthesized = 0
+            for key, text in wanted.items():
+                if key in clips:
+                    continue
+                try:
+                    clips[key] = synthesize(text)
+                    synthesized += 1
+                except Exception as e:
+                    print(f"⚠️  Could not pre-synthesize '{text[:40]}': {e}")
+            if synthesized or set(clips) != set(self._index):
+                self._write(clips)
+                self.load()
+            self._remove_stale_bundles()
+        return synthesized
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                'entries': len(self._index),
+                'hits': self.hits,
+                'misses': self.misses,
+                'bytes': len(self._map) if self._map is not None else 0,
+                'voice': voice_fingerprint(),
+                'format': self.format.name,
+            }
+
+    def _read(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            location = self._index.get(key)
+            if location is None or self._map is None:
+                return None
+            offset, length = location
+            return self._map[offset:offset + length]
+
+    def _write(self, clips: Dict[str, bytes]) -> None:
+        """Write a new bundle next to the old one and swap it in atomically"""
+        os.makedirs(self.directory, exist_ok=True)
+        index: Dict[str, List[int]] = {}
+        offset = 0
+        for key, audio in clips.items():
+            index[key] = [offset, len(audio)]
+            offset += len(audio)
+        index_bytes = json.dumps(index, sort_keys=True).encode('utf-8')
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=os.path.basename(self.path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_HEADER.pack(MAGIC, len(index_bytes)))
+                f.write(index_bytes)
+                for audio in clips.values():
+                    f.write(audio)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @contextmanager
+    def _build_lock(self) -> Iterator[None]:
+        """Held while building, so only one process at a time builds this bundle"""
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f"{self.path}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _remove_stale_bundles(self) -> None:
+        """Delete bundles made with other voices"""
+        current = f"tts-{voice_fingerprint()}"
+        for name in os.listdir(self.directory) if os.path.isdir(self.directory) else ():
+            if name.startswith('tts-') and name.endswith('.bundle') and not name.startswith(current):
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except OSError as e:
+                    print(f"⚠️  Could not remove old audio bundle {name}: {e}")
+
+    def _close(self) -> None:
+        """Unmap the current file; the caller holds the lock"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._index = {}
+
+
+class AudioBundleSet:
+    """One audio bundle per response format, mapped on first use
+
+    With ``synthesize``, a format's bundle is built in the background the
+    first time it is warmed, so clients that negotiate Opus get bundled
+    replies in Opus rather than transcoded or resynthesized ones.
+    """
+
+    def __init__(self, directory: str, texts: Callable[[], List[str]],
+                 synthesize: Optional[Callable[[str, AudioFormat], bytes]] = None):
+        self.directory = directory
+        self._texts = texts
+        self._synthesize = synthesize
+        self._bundles: Dict[str, AudioBundle] = {}
+        self._building: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def bundle(self, fmt: AudioFormat = DEFAULT_FORMAT) -> AudioBundle:
+        with self._lock:
+            bundle = self._bundles.get(fmt.name)
+            if bundle is None:
+                bundle = self._bundles[fmt.name] = AudioBundle(self.directory, fmt)
+                bundle.load()
+            return bundle
+
+    def lookup(self, text: str, fmt: AudioFormat = DEFAULT_FORMAT) -> Optional[bytes]:
+        """Bundled audio for exactly this text in ``fmt``, or None"""
+        return self.bundle(fmt).get(text)
+
+    def warm(self, fmt: AudioFormat = DEFAULT_FORMAT) -> None:
+        """Build ``fmt``'s bundle in the background, once per process"""
+        if self._synthesize is None:
+            return
+        bundle = self.bundle(fmt)
+        with self._lock:
+            if fmt.name in self._building:
+                return
+            thread = self._building[fmt.name] = threading.Thread(
+                target=bundle.build,
+                args=(self._texts(), lambda text: self._synthesize(text, fmt)),
+                name=f'prism-tts-warmup-{fmt.name}',
+                daemon=True
+            )
+        thread.start()
+
+    @property
+    def builds(self) -> bool:
+        """Whether ``warm`` builds bundles (a synthesizer was given)"""
+        return self._synthesize is not None
+
+    def missing(self, fmt: AudioFormat = DEFAULT_FORMAT) -> int:
+        """How many wanted texts ``fmt``'s bundle has no audio for yet"""
+        bundle = self.bundle(fmt)
+        return sum(1 for text in self._texts() if text.strip() and text not in bundle)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until background builds finish; returns False if any is still running"""
+        with self._lock:
+            threads = list(self._building.values())
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for thread in threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in threads)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            bundles = list(self._bundles.values())
+        return {bundle.format.name: bundle.stats() for bundle in bundles}
@@ -0,0 +1,97 @@
+"""
+Audio response formats for Prism AI Voice Assistant
+The codecs and bitrates speech can be sent in, and per-client format negotiation
+"""
+
+import subprocess
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+# Most compact codecs first
+CODEC_PREFERENCE = ['opus', 'mp3']
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """One codec at one bitrate, as ElevenLabs and ffmpeg should produce it"""
+    name: str
+    codec: str
+    bitrate_kbps: int
+    mimetype: str
+    elevenlabs_output_format: str
+    ffmpeg_args: tuple
+
+    def describe(self) -> Dict[str, Any]:
+        return {'name': self.name, 'codec': self.codec, 'bitrate_kbps': self.bitrate_kbps,
+                'mimetype': self.mimetype}
+
+
+AUDIO_FORMATS: Dict[str, AudioFormat] = {
+    fmt.name: fmt for fmt in [
+        AudioFormat('opus_32', 'opus', 32, 'audio/ogg', 'opus_48000_32',
+                    ('-c:a', 'libopus', '-b:a', '32k', '-application', 'voip', '-f', 'ogg')),
+        AudioFormat('opus_64', 'opus', 64, 'audio/ogg', 'opus_48000_64',
+                    ('-c:a', 'libopus', '-b:a', '64k', '-f', 'ogg')),
+        AudioFormat('mp3_32', 'mp3', 32, 'audio/mpeg', 'mp3_22050_32',
+                    ('-c:a', 'libmp3lame', '-b:a', '32k', '-ar', '22050', '-f', 'mp3')),
+        AudioFormat('mp3_64', 'mp3', 64, 'audio/mpeg', 'mp3_44100_64',
+                    ('-c:a', 'libmp3lame', '-b:a', '64k', '-ar', '44100', '-f', 'mp3')),
+        AudioFormat('mp3_128', 'mp3', 128, 'audio/mpeg', 'mp3_44100_128',
+                    ('-c:a', 'libmp3lame', '-b:a', '128k', '-ar', '44100', '-f', 'mp3')),
+    ]
+}
+
+# What ElevenLabs returns when no output format is requested
+DEFAULT_FORMAT = AUDIO_FORMATS['mp3_128']
+
+
+def negotiate_format(codecs: Optional[Iterable[str]] = None, max_bitrate_kbps: Optional[int] = None,
+                     name: Optional[str] = None) -> AudioFormat:
+    """The format to send a client
+
+    A known format ``name`` wins. Otherwise the most compact codec the
+    client can play is chosen, at the highest bitrate within its cap (or
+    the lowest bitrate if none fits). Clients that say nothing get
+    DEFAULT_FORMAT.
+    """
+    if name in AUDIO_FORMATS:
+        return AUDIO_FORMATS[name]
+    offered = {codec.lower() for codec in codecs or ()}
+    for codec in CODEC_PREFERENCE:
+        if codec not in offered:
+            continue
+        candidates: List[AudioFormat] = sorted(
+            (fmt for fmt in AUDIO_FORMATS.values() if fmt.codec == codec), key=lambda fmt: fmt.bitrate_kbps)
+        if max_bitrate_kbps:
+            fitting = [fmt for fmt in candidates if fmt.bitrate_kbps <= max_bitrate_kbps]
+            return fitting[-1] if fitting else candidates[0]
+        return candidates[-1]
+    return DEFAULT_FORMAT
+
+
+def format_from_request(values: Dict[str, Any]) -> AudioFormat:
+    """Format asked for by request parameters: format=..., or codecs=opus,mp3 and max_bitrate=..."""
+    codecs = values.get('codecs')
+    if isinstance(codecs, str):
+        codecs = [codec.strip() for codec in codecs.split(',') if codec.strip()]
+    max_bitrate = values.get('max_bitrate')
+    try:
+        max_bitrate = int(max_bitrate) if max_bitrate else None
+    except (TypeError, ValueError):
+        max_bitrate = None
+    return negotiate_format(codecs, max_bitrate, values.get('format'))
+
+
+def transcode(audio: bytes, fmt: AudioFormat, input_format: str = 'wav', timeout: float = 10.0) -> bytes:
+    """Re-encode audio into ``fmt`` with ffmpeg"""
+    from pydub.utils import get_encoder_name, which
+
+    binary = which(get_encoder_name())
+    if binary is None:
+        raise RuntimeError("ffmpeg is not installed")
+    command = [binary, '-hide_banner', '-loglevel', 'error', '-f', input_format, '-i', 'pipe:0',
+               '-ac', '1', *fmt.ffmpeg_args, 'pipe:1']
+    result = subprocess.run(command, input=audio, capture_output=True, timeout=timeout)
+    if result.returncode != 0 or not result.stdout:
+        raise RuntimeError(f"ffmpeg failed: {result.stderr.decode('utf-8', 'replace')[:200]}")
+    return result.stdout
@@ -0,0 +1,247 @@
+"""
+Audio ingest for Prism AI Voice Assistant
+Identifies uploaded audio by its magic bytes and normalizes it to 16 kHz mono PCM for the recognizers
+"""
+
+import io
+import os
+import subprocess
+import threading
+import time
+import wave
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from ..utils.offload import OffloadTask, offload
+
+TARGET_SAMPLE_RATE = 16000
+
+
+def sniff_container(data: bytes) -> Optional[str]:
+    """Audio container from the leading bytes, or None if unrecognized"""
+    if data[:4] == b'RIFF' and data[8:12] == b'WAVE':
+        return 'wav'
+    if data[:4] == b'fLaC':
+        return 'flac'
+    if data[:4] == b'\x1a\x45\xdf\xa3':  # EBML header (WebM / Matroska)
+        return 'webm'
+    if data[:4] == b'OggS':
+        return 'ogg'
+    if data[4:8] == b'ftyp':
+        return 'mp4'
+    if data[:3] == b'ID3':
+        return 'mp3'
+    if len(data) > 1 and data[0] == 0xFF and data[1] & 0xE0 == 0xE0:
+        # Frame sync; layer bits 00 are reserved in MPEG audio but mark an AAC ADTS stream
+        return 'aac' if data[1] & 0xF6 == 0xF0 else 'mp3'
+    return None
+
+
+@dataclass
+class IngestedAudio:
+    """Audio ready for a recognizer
+
+    ``container`` is 'pcm' (raw 16-bit little-endian mono at
+    ``sample_rate``) when decoding succeeded, otherwise the original
+    container with the original bytes.
+    """
+    audio: bytes
+    container: str
+    sample_rate: Optional[int]
+    source_container: str
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.container != 'pcm' or not self.sample_rate:
+            return None
+        return len(self.audio) / (2 * self.sample_rate)
+
+
+def _resample(samples: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
+    """Linear-interpolation resample; plenty for speech recognition"""
+    if from_rate == to_rate or not len(samples):
+        return samples
+    length = int(round(len(samples) * to_rate / from_rate))
+    positions = np.arange(length) * (from_rate / to_rate)
+    return np.interp(positions, np.arange(len(samples)), samples)
+
+
+class WavDecoder:
+    """Decodes PCM WAV in-process, with no ffmpeg subprocess"""
+
+    def __init__(self, sample_rate: int = TARGET_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+
+    def __call__(self, data: bytes) -> bytes:
+        with wave.open(io.BytesIO(data), 'rb') as wav:
+            channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+        if channels == 1 and width == 2 and rate == self.sample_rate:
+            return frames
+        if width == 1:
+            samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) * 256
+        elif width == 2:
+            samples = np.frombuffer(frames, dtype='<i2').astype(np.float32)
+        elif width == 4:
+            samples = np.frombuffer(frames, dtype='<i4').astype(np.float32) / 65536
+        else:
+            raise ValueError(f"Unsupported WAV sample width: {width * 8} bits")
+        if channels > 1:
+            samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1)
+        samples = _resample(samples, rate, self.sample_rate)
+        return np.clip(samples, -32768, 32767).astype('<i2').tobytes()
+
+
+class FfmpegDecoder:
+    """Decodes one container by piping it through ffmpeg to s16le mono PCM"""
+
+    def __init__(self, container: str, binary: str, sample_rate: int = TARGET_SAMPLE_RATE,
+                 timeout: float = 10.0):
+        input_format = {'mp4': 'mov'}.get(container, container)
+        self.command = [binary, '-hide_banner', '-loglevel', 'error', '-f', input_format, '-i', 'pipe:0',
+                        '-ac', '1', '-ar', str(sample_rate), '-f', 's16le', 'pipe:1']
+        self.timeout = timeout
+
+    def __call__(self, data: bytes) -> bytes:
+        result = subprocess.run(self.command, input=data, capture_output=True, timeout=self.timeout)
+        if result.returncode != 0 or not result.stdout:
+            raise RuntimeError(f"ffmpeg failed: {result.stderr.decode('utf-8', 'replace')[:200]}")
+        return result.stdout
+
+
+def speech_bounds(pcm: bytes, sample_rate: int = TARGET_SAMPLE_RATE, frame_ms: int = 30,
+                  padding_ms: int = 500, min_rms: float = 100.0,
+                  noise_ratio: float = 1.5) -> Tuple[int, int]:
+    """Byte range of 16-bit PCM from the first to the last voiced frame, padded
+
+    A frame is voiced when its RMS energy is ``noise_ratio`` times the
+    clip's noise floor (its quietest tenth), so even quiet words over
+    background noise count. Audio with no voiced frame is kept whole
+    rather than risk dropping quiet speech.
+    """
+    samples = np.frombuffer(pcm[:len(pcm) - len(pcm) % 2], dtype='<i2')
+    frame = max(1, sample_rate * frame_ms // 1000)
+    count = len(samples) // frame
+    if count == 0:
+        return 0, len(pcm)
+    frames = samples[:count * frame].astype(np.float32).reshape(count, frame)
+    rms = np.sqrt((frames ** 2).mean(axis=1))
+    voiced = np.nonzero(rms > max(np.percentile(rms, 10) * noise_ratio, min_rms))[0]
+    if not len(voiced):
+        return 0, len(pcm)
+    padding = padding_ms // frame_ms
+    first = max(0, voiced[0] - padding)
+    last = voiced[-1] + 1 + padding
+    return first * frame * 2, len(pcm) if last >= count else last * frame * 2
+
+
+@lru_cache(maxsize=None)
+def build_decoder(container: str, sample_rate: int = TARGET_SAMPLE_RATE,
+                  timeout: float = 10.0) -> Callable[[bytes], bytes]:
+    """The decoder for a container, built once per process"""
+    if container == 'wav':
+        return WavDecoder(sample_rate)
+    from pydub.utils import get_encoder_name, which
+
+    binary = which(get_encoder_name())
+    if binary is None:
+        raise RuntimeError("ffmpeg is not installed")
+    return FfmpegDecoder(container, binary, sample_rate, timeout)
+
+
+@dataclass(frozen=True)
+class DecodeAudio(OffloadTask):
+    """Decode ``container`` audio to 16-bit mono PCM, optionally trimming silence at either end"""
+    container: str
+    sample_rate: int = TARGET_SAMPLE_RATE
+    timeout: float = 10.0
+    trim_silence: bool = False
+
+    kind = 'decode_audio'
+
+    def run(self, data: Optional[bytes]) -> bytes:
+        pcm = build_decoder(self.container, self.sample_rate, self.timeout)(data)
+        if self.trim_silence:
+            start, end = speech_bounds(pcm, self.sample_rate)
+            pcm = pcm[start:end]
+        return pcm
+
+
+class AudioIngest:
+    """Normalizes uploaded audio in the CPU offload pool
+
+    The container is sniffed from the bytes; the MIME type or file name is
+    only a hint for audio that can't be identified. Decoding, and with
+    ``trim_silence`` trimming leading and trailing silence so less audio
+    goes to the recognizer, run as one task in a worker process, where
+    decoders are built once per container. At most ``max_workers + max_queue`` decodes are admitted at
+    once; beyond that, or if decoding fails, the original bytes go through
+    untouched with their sniffed container so the recognizer can still be
+    told the right encoding.
+    """
+
+    def __init__(self, sample_rate: int = TARGET_SAMPLE_RATE, max_workers: int = 2,
+                 max_queue: int = 8, timeout: float = 10.0, trim_silence: bool = False):
+        self.sample_rate = sample_rate
+        self.timeout = timeout
+        self.trim_silence = trim_silence
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, float]] = {}
+        self.passed_through = 0
+        self.rejected = 0
+
+    def normalize(self, data: bytes, hint: Optional[str] = None) -> IngestedAudio:
+        """16 kHz mono PCM for data, or the original bytes if it can't be decoded now"""
+        container = sniff_container(data) or hint or 'wav'
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            print(f"⚠️  Audio decoders busy; passing {container} through undecoded")
+            return IngestedAudio(data, container, None, container)
+        start = time.perf_counter()
+        try:
+            task = DecodeAudio(container, self.sample_rate, self.timeout, self.trim_silence)
+            pcm = offload.run(task, data, timeout=self.timeout)
+        except Exception as e:
+            print(f"⚠️  Could not decode {container} audio: {e}")
+            with self._lock:
+                self.passed_through += 1
+            return IngestedAudio(data, container, None, container)
+        finally:
+            self._slots.release()
+        self._record(container, time.perf_counter() - start, len(pcm) / (2 * self.sample_rate))
+        return IngestedAudio(pcm, 'pcm', self.sample_rate, container)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'sample_rate': self.sample_rate,
+                'passed_through': self.passed_through,
+                'rejected': self.rejected,
+                'containers': {
+                    container: {
+                        'decoded': int(counts['decoded']),
+                        'avg_ms': round(counts['seconds'] * 1000 / counts['decoded'], 1),
+                        'audio_seconds': round(counts['audio_seconds'], 1),
+                    }
+                    for container, counts in self._counts.items()
+                },
+            }
+
+    def _record(self, container: str, seconds: float, audio_seconds: float) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(container, {'decoded': 0, 'seconds': 0.0, 'audio_seconds': 0.0})
+            counts['decoded'] += 1
+            counts['seconds'] += seconds
+            counts['audio_seconds'] += audio_seconds
+
+
+audio_ingest = AudioIngest(
+    max_workers=int(os.getenv('AUDIO_DECODE_WORKERS', '2')),
+    max_queue=int(os.getenv('AUDIO_DECODE_QUEUE', '8')),
+    trim_silence=os.getenv('AUDIO_TRIM_SILENCE', 'false').lower() in ('1', 'true', 'yes'),
+)
@@ -0,0 +1,142 @@
+"""
+Conversation context builder for Prism AI Voice Assistant
+Packs history into a token budget instead of a fixed message count
+"""
+
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+Message = Dict[str, str]
+
+# Chat formatting overhead per message and for priming the reply
+TOKENS_PER_MESSAGE = 4
+TOKENS_FOR_REPLY = 3
+
+_APPROX_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s")
+
+
+def _approximate_tokens(text: str) -> int:
+    """Rough BPE estimate: one token per ~4 characters of each word or symbol"""
+    return sum(math.ceil(len(piece) / 4) for piece in _APPROX_TOKEN_RE.findall(text))
+
+
+def _load_encoder(model: str) -> Optional[Callable[[str], List[int]]]:
+    """The model's tiktoken encoder, or None if tiktoken or its data is unavailable"""
+    try:
+        import tiktoken
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+        return encoding.encode
+    except Exception as e:
+        print(f"⚠️  Using approximate token counts ({e.__class__.__name__})")
+        return None
+
+
+class TokenCounter:
+    """Counts message tokens, remembering counts for messages it has seen
+
+    History messages never change once written, so each one is tokenized
+    once and later turns only count the new messages.
+    """
+
+    def __init__(self, model: str = "gpt-4o-mini", cache_size: int = 4096):
+        self.model = model
+        self.cache_size = cache_size
+        self._encode: Optional[Callable[[str], List[int]]] = None
+        self._loaded = False
+        self._cache: 'OrderedDict[str, int]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def count_text(self, text: str) -> int:
+        if not self._loaded:
+            self._encode = _load_encoder(self.model)
+            self._loaded = True
+        if self._encode is not None:
+            return len(self._encode(text))
+        return _approximate_tokens(text)
+
+    def count_message(self, message: Message) -> int:
+        content = message.get("content") or ""
+        with self._lock:
+            cached = self._cache.get(content)
+            if cached is not None:
+                self._cache.move_to_end(content)
+                return cached
+        tokens = TOKENS_PER_MESSAGE + self.count_text(content)
+        with self._lock:
+            self._cache[content] = tokens
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return tokens
+
+
+class ContextBuilder:
+    """Builds the message list for a completion within a token budget
+
+    The system prompt and the newest message are always included. Older
+    messages are added newest first while they fit. Messages that don't fit
+    are condensed into a short "earlier in the conversation" note of up to
+    ``summary_tokens`` tokens, made from the first sentence of each, so the
+    model keeps the gist without their full length. Only the newest
+    ``max_messages`` messages are considered, so callers can keep no more
+    history than that.
+    """
+
+    def __init__(self, budget_tokens: int = 3000, summary_tokens: int = 200,
+                 counter: Optional[TokenCounter] = None, max_messages: int = 100):
+        self.budget_tokens = budget_tokens
+        self.summary_tokens = summary_tokens
+        self.counter = counter or TokenCounter()
+        self.max_messages = max_messages
+
+    def build(self, system_prompt: str, history: List[Message]) -> List[Message]:
+        history = history[-self.max_messages:]
+        system = {"role": "system", "content": system_prompt}
+        available = self.budget_tokens - TOKENS_FOR_REPLY - self.counter.count_message(system)
+
+        kept = self._pack(history, available)
+        if len(kept) == len(history) or self.summary_tokens <= 0:
+            return [system] + kept
+
+        # Something has to go: make room for the summary, then repack
+        kept = self._pack(history, available - self.summary_tokens)
+        messages = [system]
+        summary = self._summarize(history[:len(history) - len(kept)], self.summary_tokens)
+        if summary:
+            messages.append({"role": "system", "content": summary})
+        return messages + kept
+
+    def _pack(self, history: List[Message], available: int) -> List[Message]:
+        """Newest messages that fit in ``available`` tokens, always at least one"""
+        count = 0
+        for message in reversed(history):
+            cost = self.counter.count_message(message)
+            if count and cost > available:
+                break
+            available -= cost
+            count += 1
+        return history[len(history) - count:]
+
+    def _summarize(self, dropped: List[Message], budget: int) -> Optional[str]:
+        """First sentence of the most recent dropped messages, newest kept first"""
+        header = "Earlier in the conversation:"
+        remaining = budget - TOKENS_PER_MESSAGE - self.counter.count_text(header)
+        lines: List[str] = []
+        for message in reversed(dropped):
+            first_sentence = _SENTENCE_END_RE.split((message.get("content") or "").strip(), 1)[0]
+            line = f"- {'User' if message.get('role') == 'user' else 'Prism'}: {first_sentence}"
+            cost = self.counter.count_text(line) + 1
+            if cost > remaining:
+                break
+            lines.append(line)
+            remaining -= cost
+        if not lines:
+            return None
+        lines.reverse()
+        return "\n".join([header] + lines)
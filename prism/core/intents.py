@@ -0,0 +1,141 @@
+"""
+Local intent classifier for Prism AI Voice Assistant
+Routes queries to feature services without a model call
+"""
+
+import os
+import random
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_PHRASES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'data', 'intent_phrases.tsv')
+
+# Label for queries that should go to the LLM
+CHAT_INTENT = 'chat'
+
+_TOKEN_RE = re.compile(r"[a-z']+|\d+(?:\.\d+)?|[+\-*/^%]")
+
+
+@dataclass
+class IntentPrediction:
+    """Most likely intent for a query and the model's confidence in it"""
+    intent: str
+    confidence: float
+
+
+def load_examples(path: str = DEFAULT_PHRASES_PATH) -> List[Tuple[str, str]]:
+    """(intent, phrase) pairs from a tab-separated phrase file"""
+    examples = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            intent, phrase = line.split('\t', 1)
+            examples.append((intent.strip(), phrase.strip()))
+    return examples
+
+
+def extract_features(text: str) -> List[str]:
+    """Word unigrams and bigrams plus character trigrams
+
+    Numbers collapse to a single token so "add 3 and 4" and "add 12 and 30"
+    look alike, and character trigrams let unseen forms such as "chilly"
+    share evidence with "chill" or "cold" phrases seen in training.
+    """
+    words = ['<num>' if word[0].isdigit() else word for word in _TOKEN_RE.findall(text.lower())]
+    features = [f"w:{word}" for word in words]
+    padded = ['<s>'] + words + ['</s>']
+    features.extend(f"b:{a} {b}" for a, b in zip(padded, padded[1:]))
+    for word in words:
+        if len(word) > 2 and word != '<num>':
+            marked = f"<{word}>"
+            features.extend(f"c:{marked[i:i + 3]}" for i in range(len(marked) - 2))
+    return features
+
+
+class IntentClassifier:
+    """Multinomial logistic regression over hashed n-gram features
+
+    Features are hashed into ``n_features`` buckets with CRC32 (stable
+    across processes, unlike hash()), so the model is a dense weight matrix
+    and a prediction is a handful of row lookups and one softmax.
+    """
+
+    def __init__(self, n_features: int = 2 ** 16, epochs: int = 40,
+                 learning_rate: float = 0.5, l2: float = 1e-4, seed: int = 0):
+        self.n_features = n_features
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.seed = seed
+        self.labels: List[str] = []
+        self.weights = np.zeros((0, 0), dtype=np.float32)
+        self.bias = np.zeros(0, dtype=np.float32)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_PHRASES_PATH, **kwargs) -> 'IntentClassifier':
+        return cls(**kwargs).fit(load_examples(path))
+
+    def fit(self, examples: Sequence[Tuple[str, str]]) -> 'IntentClassifier':
+        """Train with SGD on (intent, phrase) pairs"""
+        self.labels = sorted({intent for intent, _ in examples})
+        label_index = {label: i for i, label in enumerate(self.labels)}
+        self.weights = np.zeros((self.n_features, len(self.labels)), dtype=np.float32)
+        self.bias = np.zeros(len(self.labels), dtype=np.float32)
+
+        samples = [(self._vectorize(phrase), label_index[intent]) for intent, phrase in examples]
+        rng = random.Random(self.seed)
+        for epoch in range(self.epochs):
+            rate = self.learning_rate / (1 + epoch * 0.1)
+            rng.shuffle(samples)
+            for (indices, values), target in samples:
+                probabilities = self._probabilities(indices, values)
+                probabilities[target] -= 1.0
+                rows = self.weights[indices]
+                rows -= rate * (np.outer(values, probabilities) + self.l2 * rows)
+                self.weights[indices] = rows
+                self.bias -= rate * probabilities
+        return self
+
+    def predict(self, text: str) -> IntentPrediction:
+        if not self.labels:
+            return IntentPrediction(CHAT_INTENT, 0.0)
+        indices, values = self._vectorize(text)
+        probabilities = self._probabilities(indices, values)
+        best = int(probabilities.argmax())
+        return IntentPrediction(self.labels[best], float(probabilities[best]))
+
+    def predict_many(self, texts: Iterable[str]) -> List[IntentPrediction]:
+        return [self.predict(text) for text in texts]
+
+    def _vectorize(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Unique hashed feature indices and their L2-normalized counts"""
+        counts: Dict[int, int] = {}
+        for feature in extract_features(text):
+            bucket = zlib.crc32(feature.encode('utf-8')) % self.n_features
+            counts[bucket] = counts.get(bucket, 0) + 1
+        indices = np.fromiter(counts, dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        if len(values):
+            values /= np.sqrt(np.dot(values, values))
+        return indices, values
+
+    def _probabilities(self, indices: np.ndarray, values: np.ndarray) -> np.ndarray:
+        scores = values @ self.weights[indices] + self.bias
+        scores = np.exp(scores - scores.max())
+        return scores / scores.sum()
+
+
+def load_classifier(path: Optional[str] = None) -> Optional[IntentClassifier]:
+    """Train the classifier from the phrase file, or None if it can't be loaded"""
+    try:
+        return IntentClassifier.from_file(path or DEFAULT_PHRASES_PATH)
+    except Exception as e:
+        print(f"⚠️  Intent classifier unavailable, using keyword routing: {e}")
+        return None
@@ -0,0 +1,168 @@
+"""
+LLM response cache for Prism AI Voice Assistant
+Reuses completions for repeated, context-free prompts
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+from ..utils.state import StateBackend
+
+# Queries that read the same no matter what came before them in the
+# conversation. Only these are cached, unless first-turn caching is enabled.
+STATELESS_INTENTS = {
+    'greeting': re.compile(r"^(hi|hello|hey|good (morning|afternoon|evening)|howdy)( there)?( prism)?$"),
+    'identity': re.compile(r"^(who|what) are you$|^what is your name$|^what's your name$|^whats your name$|^are you (a robot|an ai|human)$"),
+    'capabilities': re.compile(r"^what (can|do) you do$|^what are your (features|capabilities)$|^how can you help( me)?$|^help$"),
+    'wellbeing': re.compile(r"^how are you( doing)?( today)?$|^how's it going$"),
+    'thanks': re.compile(r"^(thanks|thank you)( so much| very much)?( prism)?$"),
+    'farewell': re.compile(r"^(bye|goodbye|see you|good night)( prism)?$"),
+}
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s']")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prompt(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    text = _PUNCTUATION_RE.sub(' ', text.lower())
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def stateless_intent(normalized: str) -> Optional[str]:
+    """Name of the context-free intent a normalized prompt matches, if any"""
+    for intent, pattern in STATELESS_INTENTS.items():
+        if pattern.match(normalized):
+            return intent
+    return None
+
+
+@dataclass
+class CachedResponse:
+    """A stored completion"""
+    text: str
+    tokens: int
+    expires_at: float
+
+
+class ResponseCache:
+    """LRU + TTL cache of completions for stateless turns
+
+    Keys combine the normalized prompt with the system prompt version and
+    the model parameters, so changing any of them never serves stale text.
+    Hit rate and the tokens saved by hits are tracked for reporting.
+
+    With a shared ``store`` the local LRU is a first tier in front of it:
+    completions are written through, and a local miss is looked up there,
+    so one worker's answer serves every worker.
+
+    ``cache_first_turns`` also caches any prompt that opens a conversation.
+    It is off by default: such replies are shared by every user and can be
+    personal or time-sensitive ("what should I cook tonight").
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600,
+                 disabled_intents: Optional[Iterable[str]] = None, store: Optional[StateBackend] = None,
+                 cache_first_turns: bool = False):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disabled_intents = set(disabled_intents or ())
+        self.cache_first_turns = cache_first_turns
+        self.store = store
+        self._entries: 'OrderedDict[str, CachedResponse]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+        self.shared_hits = 0
+
+    def key_for(self, user_input: str, has_history: bool, **params: Any) -> Optional[str]:
+        """Cache key for a turn, or None if the turn must not be cached
+
+        A turn is cacheable when it matches an enabled stateless intent, or,
+        with ``cache_first_turns``, when there is no conversation history it
+        could depend on.
+        """
+        normalized = normalize_prompt(user_input)
+        if not normalized:
+            return None
+        intent = stateless_intent(normalized)
+        if intent is None:
+            if has_history or not self.cache_first_turns:
+                return None
+        elif intent in self.disabled_intents:
+            return None
+        material = repr((normalized, sorted(params.items())))
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.saved_tokens += entry.tokens
+                return entry.text
+        shared = self._shared_get(key)
+        with self._lock:
+            if shared is None:
+                self.misses += 1
+                return None
+            self._store_local(key, shared['text'], shared['tokens'])
+            self.hits += 1
+            self.shared_hits += 1
+            self.saved_tokens += shared['tokens']
+            return shared['text']
+
+    def put(self, key: str, text: str, tokens: int = 0) -> None:
+        with self._lock:
+            self._store_local(key, text, tokens)
+        if self.store is not None:
+            try:
+                self.store.set(self._shared_key(key), {'text': text, 'tokens': tokens}, ttl=self.ttl_seconds)
+            except Exception as e:
+                print(f"⚠️  Could not share cached response: {e}")
+
+    def _store_local(self, key: str, text: str, tokens: int) -> None:
+        """Caller holds the lock"""
+        self._entries[key] = CachedResponse(text, tokens, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _shared_get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.store is None:
+            return None
+        try:
+            return self.store.get(self._shared_key(key))
+        except Exception as e:
+            print(f"⚠️  Shared response cache unavailable: {e}")
+            return None
+
+    @staticmethod
+    def _shared_key(key: str) -> str:
+        return f"llm_cache:{key}"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'saved_tokens': self.saved_tokens,
+                'shared_hits': self.shared_hits,
+            }
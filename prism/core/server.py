@@ -0,0 +1,185 @@
+"""
+Multi-process server for Prism AI Voice Assistant
+Loads and warms the app once in a master process, then forks workers that share it copy-on-write
+"""
+
+import gc
+import os
+import random
+import signal
+import socket
+import threading
+import time
+from typing import Dict, List, Optional
+
+from werkzeug.serving import make_server
+
+from ..features.calculator import calculator_service
+from ..features.search import search_service
+from ..utils.number_words import number_to_words
+from ..utils.offload import offload
+from ..utils.state import state_store
+from .app import create_app
+from .audio_formats import DEFAULT_FORMAT
+
+# Workers that die sooner than this after starting are respawned after a pause
+MIN_WORKER_LIFETIME = 1.0
+
+
+def available_cores() -> List[int]:
+    """CPU cores this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def preload(app) -> Dict[str, float]:
+    """Build everything workers would otherwise each build on first use; returns seconds per step"""
+    timings: Dict[str, float] = {}
+
+    def step(name, fn):
+        start = time.perf_counter()
+        fn()
+        timings[name] = time.perf_counter() - start
+
+    components = app.extensions.get('prism', {})
+    assistant = components.get('assistant')
+    bundles = components.get('audio_bundles')
+    if assistant is not None:
+        step('assistant', assistant.warm_up)
+    step('features', lambda: (
+        calculator_service.calculate("what is 15 plus 27"),
+        search_service.search("python"),
+        number_to_words(1234567),
+    ))
+    if bundles is not None:
+        # Only mapped here, so workers share its pages. A build would run on
+        # threads that don't survive the fork, so workers do it (see _run_worker)
+        step('audio_bundles', lambda: bundles.bundle(DEFAULT_FORMAT))
+        missing = bundles.missing(DEFAULT_FORMAT) if bundles.builds else 0
+        if missing:
+            print(f"⏳ Audio bundle build still in progress ({missing} clips to go); workers finish it in the background")
+    return timings
+
+
+class PreforkServer:
+    """A master that forks ``workers`` processes serving one listening socket
+
+    The app is created and warmed in the master, then the garbage
+    collector's view of it is frozen so reference-count updates in the
+    workers don't touch (and copy) the pages holding it. Every worker
+    accepts on the inherited socket and, with ``pin_cores``, runs on a
+    core of its own. Workers that exit are replaced; SIGTERM or SIGINT
+    stops them all.
+    """
+
+    def __init__(self, app, host: str = '0.0.0.0', port: int = 5000, workers: Optional[int] = None,
+                 pin_cores: bool = True, backlog: int = 512):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.cores = available_cores()
+        self.workers = workers or len(self.cores)
+        self.pin_cores = pin_cores
+        self.backlog = backlog
+        self._children: Dict[int, int] = {}  # pid -> worker slot
+        self._started: Dict[int, float] = {}
+        self._stopping = False
+        self._listener: Optional[socket.socket] = None
+
+    def serve(self) -> None:
+        if not hasattr(os, 'fork'):
+            raise RuntimeError("Multi-process serving needs os.fork; run one worker instead")
+        timings = preload(self.app)
+        print("🔥 Preloaded: " + ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items()))
+        extra_threads = [t.name for t in threading.enumerate() if t is not threading.main_thread() and t.is_alive()]
+        if extra_threads:
+            print(f"⚠️  Threads running before fork won't exist in workers: {', '.join(extra_threads)}")
+        if not state_store.shared:
+            print("⚠️  STATE_BACKEND=memory: each worker keeps its own history and reminders")
+
+        self._listener = socket.create_server((self.host, self.port), backlog=self.backlog)
+        self._listener.set_inheritable(True)
+        gc.collect()
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        for slot in range(self.workers):
+            self._spawn(slot)
+        print(f"🚀 Serving on http://{self.host}:{self.port} with {self.workers} workers"
+              + (f" pinned to cores {self.cores}" if self.pin_cores and hasattr(os, 'sched_setaffinity') else ""))
+        self._supervise()
+
+    def _spawn(self, slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker(slot)
+        self._children[pid] = slot
+        self._started[pid] = time.monotonic()
+
+    def _run_worker(self, slot: int) -> None:
+        """Child process: serve until terminated, never returning into the master's code"""
+        status = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            # Ctrl+C reaches the whole process group; the master does the stopping
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            random.seed()
+            # The master never starts the offload pool or bundle builds; each
+            # worker starts its own, and the bundle's file lock lets one build it
+            offload.start()
+            bundles = self.app.extensions.get('prism', {}).get('audio_bundles')
+            if bundles is not None:
+                bundles.warm(DEFAULT_FORMAT)
+            if self.pin_cores and hasattr(os, 'sched_setaffinity'):
+                os.sched_setaffinity(0, {self.cores[slot % len(self.cores)]})
+            server = make_server(self.host, self.port, self.app, threaded=True, fd=self._listener.fileno())
+            server.serve_forever()
+        except Exception as e:
+            print(f"❌ Worker {slot} failed: {e}")
+            status = 1
+        finally:
+            os._exit(status)
+
+    def _supervise(self) -> None:
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            slot = self._children.pop(pid, None)
+            started = self._started.pop(pid, time.monotonic())
+            if slot is None or self._stopping:
+                continue
+            print(f"⚠️  Worker {slot} (pid {pid}) exited with status {os.waitstatus_to_exitcode(status)}; restarting")
+            if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                time.sleep(MIN_WORKER_LIFETIME)
+            if not self._stopping:
+                self._spawn(slot)
+        print("👋 All workers stopped")
+
+    def _stop(self, signum, frame) -> None:
+        if self._stopping:
+            return
+        self._stopping = True
+        print(f"🛑 Stopping {len(self._children)} workers")
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+def serve(host: str = '0.0.0.0', port: int = 5000, workers: Optional[int] = None, pin_cores: bool = True) -> None:
+    """Create the app in this process and serve it from forked workers
+
+    Socket.IO is limited to the WebSocket transport unless configured
+    otherwise, since a polling client's requests could reach different
+    workers.
+    """
+    os.environ.setdefault('SOCKETIO_TRANSPORTS', 'websocket')
+    app, _ = create_app(warm_bundles=False)
+    PreforkServer(app, host, port, workers, pin_cores).serve()
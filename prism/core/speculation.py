@@ -0,0 +1,168 @@
+"""
+Speculative reply prefetch for Prism AI Voice Assistant
+Starts work on a stable partial transcript before speech recognition finishes
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.cancellation import CancelToken
+
+
+def transcript_key(text: str) -> str:
+    """Case- and spacing-insensitive form of a transcript
+
+    Unlike the response cache's prompt normalization this keeps every
+    symbol, so "5 - 3" and "5 + 3" stay different guesses.
+    """
+    return ' '.join(text.casefold().split())
+
+
+class SpeculativeTurn:
+    """Speculation for one utterance
+
+    Each interim transcript at or above the stability threshold that reads
+    differently from the current guess replaces it: the old guess is
+    cancelled and work starts on the new one. ``resolve`` then keeps the
+    guess if it matches the final transcript and cancels it otherwise.
+    """
+
+    def __init__(self, manager: 'Speculator', prepare: Callable[[str, CancelToken], Any]):
+        self._manager = manager
+        self._prepare = prepare
+        self._lock = threading.Lock()
+        self._guess: Optional[str] = None
+        self._stability = 0.0
+        self._cancelled: Optional[CancelToken] = None
+        self._future: Optional[Future] = None
+        self._started_at = 0.0
+        self._done_at: Optional[float] = None
+        self._attempts = 0
+
+    def observe(self, transcript: str, stability: float) -> None:
+        """Feed an interim transcript and its recognizer stability (0-1)"""
+        normalized = transcript_key(transcript)
+        if not normalized or stability < self._manager.threshold:
+            return
+        with self._lock:
+            if normalized == self._guess or self._attempts >= self._manager.max_attempts:
+                return
+            self._cancel()
+            self._attempts += 1
+            self._guess = normalized
+            self._stability = stability
+            self._cancelled = CancelToken()
+            self._started_at = time.monotonic()
+            self._done_at = None
+            self._future = self._manager.submit(self._run, transcript, self._cancelled)
+        self._manager.count('started')
+
+    def resolve(self, final_transcript: str) -> Optional[Any]:
+        """The speculative result if it was made for this final transcript"""
+        final_at = time.monotonic()
+        with self._lock:
+            future, guess = self._future, self._guess
+            if future is None:
+                return None
+            if guess != transcript_key(final_transcript):
+                self._cancel()
+                self._manager.record_miss(self._stability)
+                return None
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Speculative reply failed: {e}")
+            result = None
+        if result is None:
+            self._manager.count('failed')
+            return None
+        saved = min(final_at, self._done_at or final_at) - self._started_at
+        self._manager.record_hit(self._stability, saved)
+        return result
+
+    def _run(self, transcript: str, cancelled: CancelToken) -> Any:
+        result = self._prepare(transcript, cancelled)
+        with self._lock:
+            if cancelled is self._cancelled:
+                self._done_at = time.monotonic()
+        return result
+
+    def _cancel(self) -> None:
+        """Stop the current guess; the caller holds the lock"""
+        if self._future is None:
+            return
+        self._cancelled.set()
+        self._future.cancel()
+        self._future = None
+        self._manager.count('cancelled')
+
+
+class Speculator:
+    """Creates speculative turns and tracks how well speculation pays off
+
+    Hit rate and time saved are bucketed by the stability of the partial
+    that was guessed on, so the threshold can be tuned from /api/metrics.
+    """
+
+    def __init__(self, threshold: float = 0.8, max_attempts: int = 3, max_workers: int = 4):
+        self.threshold = threshold
+        self.max_attempts = max_attempts
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prism-speculate')
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {'started': 0, 'cancelled': 0, 'failed': 0, 'hits': 0, 'misses': 0}
+        self._saved_seconds = 0.0
+        self._buckets: Dict[str, Dict[str, float]] = {}
+
+    def begin(self, prepare: Callable[[str, CancelToken], Any]) -> SpeculativeTurn:
+        """Start speculating for a new utterance"""
+        return SpeculativeTurn(self, prepare)
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        return self._executor.submit(fn, *args)
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def record_hit(self, stability: float, saved_seconds: float) -> None:
+        with self._lock:
+            self._counts['hits'] += 1
+            self._saved_seconds += max(0.0, saved_seconds)
+            bucket = self._bucket(stability)
+            bucket['hits'] += 1
+            bucket['saved_ms'] += max(0.0, saved_seconds) * 1000
+
+    def record_miss(self, stability: float) -> None:
+        with self._lock:
+            self._counts['misses'] += 1
+            self._bucket(stability)['misses'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            resolved = self._counts['hits'] + self._counts['misses']
+            by_stability: List[Dict[str, Any]] = []
+            for label, bucket in sorted(self._buckets.items()):
+                total = bucket['hits'] + bucket['misses']
+                by_stability.append({
+                    'stability': label,
+                    'hits': int(bucket['hits']),
+                    'misses': int(bucket['misses']),
+                    'hit_rate': bucket['hits'] / total if total else 0.0,
+                    'avg_saved_ms': bucket['saved_ms'] / bucket['hits'] if bucket['hits'] else 0.0,
+                })
+            return {
+                'threshold': self.threshold,
+                **self._counts,
+                'hit_rate': self._counts['hits'] / resolved if resolved else 0.0,
+                'saved_ms_total': round(self._saved_seconds * 1000, 1),
+                'avg_saved_ms': round(self._saved_seconds * 1000 / self._counts['hits'], 1) if self._counts['hits'] else 0.0,
+                'by_stability': by_stability,
+            }
+
+    def _bucket(self, stability: float) -> Dict[str, float]:
+        """Stats bucket for a stability value, in steps of 0.1; the caller holds the lock"""
+        low = min(int(stability * 10), 9) / 10
+        label = f"{low:.1f}-{low + 0.1:.1f}"
+        return self._buckets.setdefault(label, {'hits': 0, 'misses': 0, 'saved_ms': 0.0})
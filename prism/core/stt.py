@@ -0,0 +1,368 @@
+"""
+Speech-to-text for Prism AI Voice Assistant
+Speech recognition engines (Google Cloud and a local CPU recognizer) and the policy that picks one
+"""
+
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.cancellation import CancelToken, Cancelled
+from ..utils.upstream import upstream
+from .audio_ingest import TARGET_SAMPLE_RATE, audio_ingest
+
+# Audio bytes per streaming recognition request
+STREAM_CHUNK_BYTES = 32 * 1024
+
+# Container names by MIME type and by file extension
+MIME_CONTAINERS = {
+    'audio/wav': 'wav',
+    'audio/wave': 'wav',
+    'audio/x-wav': 'wav',
+    'audio/flac': 'flac',
+    'audio/x-flac': 'flac',
+    'audio/webm': 'webm',
+    'video/webm': 'webm',
+    'audio/ogg': 'ogg',
+    'audio/mpeg': 'mp3',
+    'audio/mp3': 'mp3',
+    'audio/mp4': 'mp4',
+    'audio/x-m4a': 'mp4',
+    'audio/aac': 'aac',
+}
+EXTENSION_CONTAINERS = {
+    'wav': 'wav', 'flac': 'flac', 'webm': 'webm', 'ogg': 'ogg', 'oga': 'ogg', 'opus': 'ogg',
+    'mp3': 'mp3', 'mpeg': 'mp3', 'mpga': 'mp3', 'mp4': 'mp4', 'm4a': 'mp4', 'aac': 'aac',
+}
+
+
+def container_for(mime_type: Optional[str] = None, filename: Optional[str] = None) -> str:
+    """Audio container named by a MIME type or file extension, defaulting to wav"""
+    if mime_type:
+        container = MIME_CONTAINERS.get(mime_type.split(';')[0].strip().lower())
+        if container:
+            return container
+    if filename and '.' in filename:
+        container = EXTENSION_CONTAINERS.get(filename.rsplit('.', 1)[-1].lower())
+        if container:
+            return container
+    return 'wav'
+
+
+class STTEngine(ABC):
+    """A speech recognizer
+
+    Subclasses implement ``transcribe``; engines with interim results also
+    set ``supports_streaming`` and override ``transcribe_stream``. Audio
+    is either a container's bytes or, for container 'pcm', raw 16-bit
+    mono samples at ``sample_rate`` (see audio_ingest).
+    """
+
+    name = 'engine'
+    supports_streaming = False
+
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def transcribe(self, audio: bytes, container: str, sample_rate: Optional[int] = None,
+                   cancel: Optional[CancelToken] = None) -> str:
+        ...
+
+    def transcribe_stream(self, audio: bytes, container: str, on_partial: Callable[[str, float], None],
+                          sample_rate: Optional[int] = None, cancel: Optional[CancelToken] = None) -> str:
+        """Transcribe, passing interim transcripts and their stability to ``on_partial``"""
+        return self.transcribe(audio, container, sample_rate, cancel)
+
+
+class GoogleSTTEngine(STTEngine):
+    """Google Cloud Speech-to-Text, through the STT SLO and circuit breaker
+
+    The recognition encoding and sample rate follow the audio: LINEAR16 at
+    the ingest rate for normalized PCM, or the container's own encoding
+    (e.g. WEBM_OPUS for browser recordings ingest couldn't decode).
+    Containers Google can't read (mp4/m4a) are normalized first.
+    """
+
+    name = 'google'
+    supports_streaming = True
+
+    # Container -> (encoding name, sample rate or None to read it from the header)
+    ENCODINGS = {
+        'pcm': ('LINEAR16', TARGET_SAMPLE_RATE),
+        'wav': ('LINEAR16', None),
+        'flac': ('FLAC', None),
+        'webm': ('WEBM_OPUS', 48000),
+        'ogg': ('OGG_OPUS', 48000),
+        'mp3': ('MP3', 44100),
+    }
+
+    def __init__(self, language_code: str = 'en-US'):
+        self.language_code = language_code
+        self._client = None
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        try:
+            from google.cloud import speech  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def transcribe(self, audio: bytes, container: str, sample_rate: Optional[int] = None,
+                   cancel: Optional[CancelToken] = None) -> str:
+        speech = self._speech()
+        audio, config = self._prepare(audio, container, sample_rate)
+        recognition_audio = speech.RecognitionAudio(content=audio)
+        client = self._get_client()
+        response = upstream.call('stt', lambda timeout: client.recognize(
+            config=config, audio=recognition_audio, timeout=timeout), cancel=cancel)
+        return "".join(result.alternatives[0].transcript for result in response.results if result.alternatives)
+
+    def transcribe_stream(self, audio: bytes, container: str, on_partial: Callable[[str, float], None],
+                          sample_rate: Optional[int] = None, cancel: Optional[CancelToken] = None) -> str:
+        audio, config = self._prepare(audio, container, sample_rate)
+        client = self._get_client()
+        return upstream.call('stt', lambda timeout: self._streaming_transcript(
+            client, config, audio, on_partial, timeout, cancel), cancel=cancel)
+
+    def recognition_config(self, container: str, sample_rate: Optional[int] = None):
+        """RecognitionConfig for audio in ``container``"""
+        speech = self._speech()
+        encoding, default_rate = self.ENCODINGS.get(container, ('LINEAR16', None))
+        options = {
+            'encoding': getattr(speech.RecognitionConfig.AudioEncoding, encoding),
+            'language_code': self.language_code,
+            'enable_automatic_punctuation': True,
+        }
+        if sample_rate or default_rate:
+            options['sample_rate_hertz'] = sample_rate or default_rate
+        return speech.RecognitionConfig(**options)
+
+    def _prepare(self, audio: bytes, container: str, sample_rate: Optional[int]):
+        if container not in self.ENCODINGS:
+            ingested = audio_ingest.normalize(audio, hint=container)
+            if ingested.container != 'pcm':
+                raise ValueError(f"Google Cloud Speech can't read {container} audio")
+            audio, container, sample_rate = ingested.audio, ingested.container, ingested.sample_rate
+        return audio, self.recognition_config(container, sample_rate)
+
+    def _streaming_transcript(self, client, config, audio, on_partial, timeout, cancel=None) -> str:
+        speech = self._speech()
+        streaming_config = speech.StreamingRecognitionConfig(config=config, interim_results=True)
+        chunks = (speech.StreamingRecognizeRequest(audio_content=audio[i:i + STREAM_CHUNK_BYTES])
+                  for i in range(0, len(audio), STREAM_CHUNK_BYTES))
+        responses = client.streaming_recognize(config=streaming_config, requests=chunks, timeout=timeout)
+        # Cancelling the gRPC call ends the stream on both sides
+        unregister = cancel.on_cancel(responses.cancel) if cancel is not None and hasattr(responses, 'cancel') else None
+        final = ""
+        try:
+            for response in responses:
+                for result in response.results:
+                    if not result.alternatives:
+                        continue
+                    if result.is_final:
+                        final += result.alternatives[0].transcript
+                    else:
+                        on_partial(final + result.alternatives[0].transcript, result.stability)
+        finally:
+            if unregister is not None:
+                unregister()
+        return final
+
+    def _get_client(self):
+        """One SpeechClient per process; it is thread-safe and reuses its channel"""
+        with self._lock:
+            if self._client is None:
+                self._client = self._speech().SpeechClient()
+            return self._client
+
+    @staticmethod
+    def _speech():
+        from google.cloud import speech
+        return speech
+
+
+class VoskSTTEngine(STTEngine):
+    """Offline recognition with Vosk (Kaldi) on the local CPU
+
+    Needs ``pip install vosk`` and a model directory, e.g. the 40 MB
+    vosk-model-small-en-us. Transcripts are lower case without punctuation.
+    """
+
+    name = 'vosk'
+    CHUNK_BYTES = 8000
+
+    def __init__(self, model_path: str):
+        self.model_path = model_path
+        self._model = None
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        try:
+            import vosk  # noqa: F401
+        except ImportError:
+            return False
+        return os.path.isdir(self.model_path)
+
+    def transcribe(self, audio: bytes, container: str, sample_rate: Optional[int] = None,
+                   cancel: Optional[CancelToken] = None) -> str:
+        from vosk import KaldiRecognizer
+
+        if container != 'pcm':
+            ingested = audio_ingest.normalize(audio, hint=container)
+            if ingested.container != 'pcm':
+                raise ValueError(f"Could not decode {container} audio for Vosk")
+            audio, sample_rate = ingested.audio, ingested.sample_rate
+        recognizer = KaldiRecognizer(self._get_model(), sample_rate or TARGET_SAMPLE_RATE)
+        for i in range(0, len(audio), self.CHUNK_BYTES):
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            recognizer.AcceptWaveform(audio[i:i + self.CHUNK_BYTES])
+        return json.loads(recognizer.FinalResult()).get('text', '')
+
+    def _get_model(self):
+        """Load the model once; it is shared by all recognizers"""
+        with self._lock:
+            if self._model is None:
+                from vosk import Model, SetLogLevel
+
+                SetLogLevel(-1)
+                self._model = Model(self.model_path)
+            return self._model
+
+
+LOCAL_ENGINES = {
+    'vosk': lambda: VoskSTTEngine(os.getenv('VOSK_MODEL_PATH', os.path.join('models', 'vosk-model-small-en-us-0.15'))),
+}
+
+
+def load_local_engine() -> Optional[STTEngine]:
+    """The local recognizer named by STT_LOCAL_ENGINE, or None if disabled or not installed"""
+    name = os.getenv('STT_LOCAL_ENGINE', 'vosk').lower()
+    if name in ('', 'none', 'off'):
+        return None
+    factory = LOCAL_ENGINES.get(name)
+    if factory is None:
+        print(f"⚠️  Unknown local STT engine '{name}'")
+        return None
+    engine = factory()
+    if not engine.available():
+        print(f"⚠️  Local STT engine '{name}' is not installed; using Google Cloud only")
+        return None
+    return engine
+
+
+@dataclass
+class Transcript:
+    """Recognized text and the engine that produced it"""
+    text: str
+    engine: str
+
+
+class STTRouter:
+    """Picks the speech recognizer for each utterance
+
+    Google goes first while it is healthy and fast. A failure, a missed
+    deadline or an open circuit breaker (which fails in microseconds) falls
+    through to the local engine. If Google's recent p95 latency exceeds
+    the local engine's average by ``latency_margin``, the local engine
+    goes first instead, with every ``probe_every``-th utterance still sent
+    to Google so its latency stats stay current.
+    """
+
+    def __init__(self, remote: STTEngine, local: Optional[STTEngine] = None,
+                 latency_margin: float = 1.5, probe_every: int = 10):
+        self.remote = remote
+        self.local = local
+        self.latency_margin = latency_margin
+        self.probe_every = probe_every
+        self._lock = threading.Lock()
+        self._engines: Dict[str, Dict[str, float]] = {}
+        self._routed = 0
+        self.local_first = 0
+        self.fallbacks = 0
+
+    def route(self) -> List[STTEngine]:
+        """Engines to try for the next utterance, in order"""
+        with self._lock:
+            self._routed += 1
+            probe = self._routed % self.probe_every == 0
+            order = [self.remote, self.local]
+            if not probe and self._remote_slower():
+                order.reverse()
+                self.local_first += 1
+        return [engine for engine in order if engine is not None and engine.available()]
+
+    def transcribe(self, audio: bytes, container: str, sample_rate: Optional[int] = None,
+                   on_partial: Optional[Callable[[str, float], None]] = None,
+                   cancel: Optional[CancelToken] = None) -> Transcript:
+        """Transcript of the audio, streaming interim results to ``on_partial`` where supported
+
+        Raises Cancelled, without trying further engines, if ``cancel`` fires.
+        """
+        last_error: Optional[Exception] = None
+        for attempt, engine in enumerate(self.route()):
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            start = time.perf_counter()
+            try:
+                if on_partial is not None and engine.supports_streaming:
+                    text = engine.transcribe_stream(audio, container, on_partial, sample_rate, cancel)
+                else:
+                    text = engine.transcribe(audio, container, sample_rate, cancel)
+            except Cancelled:
+                raise
+            except Exception as e:
+                if cancel is not None and cancel.is_set():
+                    raise Cancelled() from e
+                print(f"⚠️  {engine.name} speech recognition failed: {e}")
+                self._record(engine.name, time.perf_counter() - start, error=True)
+                last_error = e
+                continue
+            self._record(engine.name, time.perf_counter() - start, fallback=attempt > 0)
+            return Transcript(text, engine.name)
+        if last_error is not None:
+            raise last_error
+        raise RuntimeError("No speech-to-text engine available")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'local_engine': self.local.name if self.local is not None else None,
+                'local_first': self.local_first,
+                'fallbacks': self.fallbacks,
+                'engines': {
+                    name: {
+                        'calls': int(engine['calls']),
+                        'errors': int(engine['errors']),
+                        'avg_ms': round(engine['seconds'] * 1000 / engine['calls'], 1) if engine['calls'] else 0.0,
+                    }
+                    for name, engine in self._engines.items()
+                },
+            }
+
+    def _remote_slower(self) -> bool:
+        """Whether Google's p95 is well above the local average; the caller holds the lock"""
+        if self.local is None:
+            return False
+        local = self._engines.get(self.local.name)
+        remote_p95 = upstream.expected_latency('stt')
+        if not local or not local['calls'] or remote_p95 is None:
+            return False
+        return remote_p95 > self.latency_margin * local['seconds'] / local['calls']
+
+    def _record(self, name: str, seconds: float, error: bool = False, fallback: bool = False) -> None:
+        with self._lock:
+            engine = self._engines.setdefault(name, {'calls': 0, 'errors': 0, 'seconds': 0.0})
+            if error:
+                engine['errors'] += 1
+                return
+            engine['calls'] += 1
+            engine['seconds'] += seconds
+            if fallback:
+                self.fallbacks += 1
@@ -0,0 +1,136 @@
+"""
+LLM tools for Prism AI Voice Assistant
+Exposes the feature services to GPT function calling and runs calls concurrently
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from ..features.weather import weather_service
+from ..features.news import news_service
+from ..features.reminders import reminder_service
+from ..features.calculator import calculator_service
+from ..features.search import search_service
+
+
+def _function(name: str, description: str, properties: Dict[str, Any],
+              required: Optional[List[str]] = None) -> Dict[str, Any]:
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {"type": "object", "properties": properties, "required": required or []},
+        },
+    }
+
+
+TOOL_DEFINITIONS = [
+    _function("get_weather", "Current weather conditions. Omit location to use the user's current position.",
+              {"location": {"type": "string", "description": "City name, e.g. 'Paris'"}}),
+    _function("get_news", "Latest news headlines.",
+              {"category": {"type": "string", "description": "NewsAPI category such as general, business, "
+                                                             "technology, science, sports or health"},
+               "limit": {"type": "integer", "description": "Number of headlines, 1-5"}}),
+    _function("set_reminder", "Set a reminder for the user.",
+              {"title": {"type": "string", "description": "What to remind the user about"},
+               "time": {"type": "string", "description": "When, e.g. 'tomorrow at 3pm' or 'in 10 minutes'"}},
+              ["title", "time"]),
+    _function("list_reminders", "List the user's upcoming reminders.", {}),
+    _function("calculate", "Evaluate an arithmetic expression exactly.",
+              {"expression": {"type": "string", "description": "e.g. '15% of 80' or '(3 + 4) * 2'"}},
+              ["expression"]),
+    _function("search", "Look up a topic in Prism's knowledge base.",
+              {"query": {"type": "string"}}, ["query"]),
+    _function("get_time", "Current local date and time.", {}),
+]
+
+
+class ToolRunner:
+    """Executes the model's tool calls against the feature services
+
+    All calls from one model turn are submitted together to a shared pool,
+    so a compound request costs the slowest tool rather than the sum.
+    Results come back in call order.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prism-tools')
+        self._tools: Dict[str, Callable[..., Any]] = {
+            'get_weather': self._get_weather,
+            'get_news': self._get_news,
+            'set_reminder': self._set_reminder,
+            'list_reminders': self._list_reminders,
+            'calculate': self._calculate,
+            'search': self._search,
+            'get_time': self._get_time,
+        }
+
+    def run_all(self, tool_calls: List[Any], lat=None, lon=None) -> List[Dict[str, str]]:
+        """Run tool calls concurrently and return their ``tool`` messages"""
+        futures = [self._executor.submit(self.run, call.function.name, call.function.arguments, lat, lon)
+                   for call in tool_calls]
+        return [{"role": "tool", "tool_call_id": call.id, "content": future.result()}
+                for call, future in zip(tool_calls, futures)]
+
+    def run(self, name: str, arguments: Optional[str], lat=None, lon=None) -> str:
+        """Run one tool, returning its result (or error) as JSON"""
+        tool = self._tools.get(name)
+        if tool is None:
+            return json.dumps({"error": f"Unknown tool: {name}"})
+        try:
+            kwargs = json.loads(arguments) if arguments else {}
+            return json.dumps(tool(lat=lat, lon=lon, **kwargs), default=str)
+        except Exception as e:
+            print(f"Tool {name} failed: {e}")
+            return json.dumps({"error": str(e)})
+
+    @staticmethod
+    def _get_weather(location: Optional[str] = None, lat=None, lon=None) -> Dict[str, Any]:
+        if not location and lat and lon:
+            weather = weather_service.get_weather_by_coords(lat, lon)
+        else:
+            weather = weather_service.get_weather(location or "auto")
+        return asdict(weather)
+
+    @staticmethod
+    def _get_news(category: str = "general", limit: int = 3, lat=None, lon=None) -> List[Dict[str, str]]:
+        items = news_service.get_news(category=category, limit=max(1, min(int(limit), 5)))
+        return [{"title": item.title, "source": item.source} for item in items]
+
+    @staticmethod
+    def _set_reminder(title: str, time: str, lat=None, lon=None) -> Dict[str, Any]:
+        reminder = reminder_service.add_reminder(title, time)
+        return {"title": reminder.title, "datetime": reminder.datetime.isoformat()}
+
+    @staticmethod
+    def _list_reminders(lat=None, lon=None) -> List[Dict[str, Any]]:
+        return [{"title": r.title, "datetime": r.datetime.isoformat()} for r in reminder_service.get_reminders()]
+
+    @staticmethod
+    def _calculate(expression: str, lat=None, lon=None) -> Dict[str, str]:
+        return {"result": calculator_service.calculate(expression)}
+
+    @staticmethod
+    def _search(query: str, lat=None, lon=None) -> Dict[str, str]:
+        return {"result": search_service.search_web(query)}
+
+    @staticmethod
+    def _get_time(lat=None, lon=None) -> Dict[str, str]:
+        return {"now": datetime.now().strftime("%A, %B %d, %Y %I:%M %p")}
+
+
+def assistant_tool_message(message: Any) -> Dict[str, Any]:
+    """The assistant message carrying tool calls, as it must be replayed to the API"""
+    return {
+        "role": "assistant",
+        "content": message.content,
+        "tool_calls": [
+            {"id": call.id, "type": "function",
+             "function": {"name": call.function.name, "arguments": call.function.arguments}}
+            for call in message.tool_calls
+        ],
+    }
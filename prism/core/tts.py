@@ -0,0 +1,355 @@
+"""
+Text-to-speech for Prism AI Voice Assistant
+Speech engines (ElevenLabs and a local CPU engine) and the policy that picks one per reply
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import requests
+
+from ..utils.cancellation import CancelToken, Cancelled
+from ..utils.circuit_breaker import server_error
+from ..utils.upstream import upstream
+from .audio_formats import DEFAULT_FORMAT, AudioFormat, transcode
+
+VOICE_ID = "21m00Tcm4TlvDq8ikWAM"  # Rachel voice ID - more reliable
+VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.75
+}
+
+# Bytes per forwarded chunk when streaming; small enough to start playback quickly
+STREAM_CHUNK_BYTES = 4096
+
+
+def elevenlabs_tts(text: str, api_key: str, stream: bool = False, fmt: AudioFormat = DEFAULT_FORMAT,
+                   cancel: Optional[CancelToken] = None) -> requests.Response:
+    """POST text to ElevenLabs, hedged and bounded by the TTS SLO
+
+    With ``stream`` the streaming endpoint is used and the response is
+    returned as soon as its headers arrive; read it with iter_audio. Only
+    streamed requests are hedged: closing a losing stream stops its
+    generation, while a losing plain request would be synthesized and
+    billed in full.
+    """
+    url = f"https://api.elevenlabs.io/v1/text-to-speech/{VOICE_ID}"
+    if stream:
+        url += "/stream"
+    headers = {
+        "xi-api-key": api_key,
+        "Content-Type": "application/json"
+    }
+    payload = {
+        "text": text,
+        "voice_settings": VOICE_SETTINGS
+    }
+    params = {"output_format": fmt.elevenlabs_output_format}
+    return upstream.call('tts', lambda timeout: requests.post(url, headers=headers, json=payload, params=params,
+                                                              timeout=timeout, stream=stream),
+                         is_failure=server_error, discard=_close_response if stream else None, cancel=cancel)
+
+
+def _close_response(response: requests.Response) -> None:
+    response.close()
+
+
+def synthesize(text: str, api_key: str, fmt: AudioFormat = DEFAULT_FORMAT,
+               cancel: Optional[CancelToken] = None) -> bytes:
+    """Audio for text in ``fmt``, raising if ElevenLabs doesn't return any"""
+    response = elevenlabs_tts(text, api_key, fmt=fmt, cancel=cancel)
+    if response.status_code != 200:
+        raise RuntimeError(f"ElevenLabs returned {response.status_code}: {response.text[:200]}")
+    return response.content
+
+
+def iter_audio(response: requests.Response, cancel: Optional[CancelToken] = None) -> Iterator[bytes]:
+    """Audio chunks from a streaming response as they arrive, closing it when done
+
+    ``cancel`` closes the response mid-stream, which ends the iteration.
+    """
+    unregister = cancel.on_cancel(response.close) if cancel is not None else None
+    try:
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_BYTES):
+            if chunk:
+                yield chunk
+    except Exception:
+        if cancel is None or not cancel.is_set():
+            raise
+    finally:
+        if unregister is not None:
+            unregister()
+        response.close()
+
+
+class TTSUnavailableError(RuntimeError):
+    """Raised when no engine could synthesize a reply; clients fall back to browser speech"""
+
+
+class TTSEngine(ABC):
+    """A speech synthesizer
+
+    Subclasses implement ``synthesize``; engines that can deliver audio
+    incrementally also override ``stream``. Engines that can encode any
+    AudioFormat set ``encodes_formats``; the others always return
+    ``mimetype`` audio, which the router transcodes.
+    """
+
+    name = 'engine'
+    mimetype = 'audio/mpeg'
+    encodes_formats = True
+
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def synthesize(self, text: str, fmt: AudioFormat = DEFAULT_FORMAT,
+                   cancel: Optional[CancelToken] = None) -> bytes:
+        ...
+
+    def stream(self, text: str, fmt: AudioFormat = DEFAULT_FORMAT,
+               cancel: Optional[CancelToken] = None) -> Iterator[bytes]:
+        """Audio chunks for text; by default the whole clip as one chunk"""
+        return iter([self.synthesize(text, fmt, cancel)])
+
+
+class ElevenLabsEngine(TTSEngine):
+    """ElevenLabs over the network, through the TTS SLO and circuit breaker"""
+
+    name = 'elevenlabs'
+    mimetype = 'audio/mpeg'
+
+    def __init__(self, api_key: Optional[str] = None):
+        self._api_key = api_key
+
+    @property
+    def api_key(self) -> Optional[str]:
+        # Read lazily so .env files loaded after import still apply
+        return self._api_key or os.getenv('ELEVENLABS_API_KEY')
+
+    def available(self) -> bool:
+        return bool(self.api_key)
+
+    def synthesize(self, text: str, fmt: AudioFormat = DEFAULT_FORMAT,
+                   cancel: Optional[CancelToken] = None) -> bytes:
+        return synthesize(text, self.api_key, fmt, cancel)
+
+    def stream(self, text: str, fmt: AudioFormat = DEFAULT_FORMAT,
+               cancel: Optional[CancelToken] = None) -> Iterator[bytes]:
+        """Open the streaming request now so failures surface before any audio is sent"""
+        response = elevenlabs_tts(text, self.api_key, stream=True, fmt=fmt, cancel=cancel)
+        if response.status_code != 200:
+            details = response.text[:200]
+            response.close()
+            raise RuntimeError(f"ElevenLabs returned {response.status_code}: {details}")
+        return iter_audio(response, cancel)
+
+
+class EspeakEngine(TTSEngine):
+    """Offline synthesis with eSpeak NG on the local CPU
+
+    Much plainer than ElevenLabs, but a short sentence takes tens of
+    milliseconds with no network round trip or per-character cost.
+    """
+
+    name = 'espeak'
+    mimetype = 'audio/wav'
+    encodes_formats = False
+
+    def __init__(self, voice: str = 'en-us', words_per_minute: int = 170, timeout: float = 5.0):
+        self.voice = voice
+        self.words_per_minute = words_per_minute
+        self.timeout = timeout
+        self.binary = shutil.which('espeak-ng') or shutil.which('espeak')
+
+    def available(self) -> bool:
+        return self.binary is not None
+
+    def synthesize(self, text: str, fmt: AudioFormat = DEFAULT_FORMAT,
+                   cancel: Optional[CancelToken] = None) -> bytes:
+        process = subprocess.Popen(
+            [self.binary, '--stdout', '--stdin', '-v', self.voice, '-s', str(self.words_per_minute)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        unregister = cancel.on_cancel(process.kill) if cancel is not None else None
+        try:
+            stdout, stderr = process.communicate(text.encode('utf-8'), timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+        finally:
+            if unregister is not None:
+                unregister()
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+        if process.returncode != 0 or not stdout:
+            raise RuntimeError(f"{self.binary} produced no audio: {stderr.decode('utf-8', 'replace')[:200]}")
+        return stdout
+
+
+LOCAL_ENGINES = {
+    'espeak': EspeakEngine,
+}
+
+
+def load_local_engine() -> Optional[TTSEngine]:
+    """The local engine named by TTS_LOCAL_ENGINE, or None if disabled or not installed"""
+    name = os.getenv('TTS_LOCAL_ENGINE', 'espeak').lower()
+    if name in ('', 'none', 'off'):
+        return None
+    engine_class = LOCAL_ENGINES.get(name)
+    if engine_class is None:
+        print(f"⚠️  Unknown local TTS engine '{name}'")
+        return None
+    engine = engine_class(voice=os.getenv('TTS_LOCAL_VOICE', 'en-us'))
+    if not engine.available():
+        print(f"⚠️  Local TTS engine '{name}' is not installed; using ElevenLabs only")
+        return None
+    return engine
+
+
+@dataclass
+class SpeechAudio:
+    """Synthesized audio and the engine that made it"""
+    audio: bytes
+    mimetype: str
+    engine: str
+
+
+@dataclass
+class SpeechStream:
+    """Audio chunks as they are synthesized, and the engine making them"""
+    chunks: Iterator[bytes]
+    mimetype: str
+    engine: str
+
+
+class TTSRouter:
+    """Picks the speech engine for each reply
+
+    - Text in the audio bundle for the requested format is served from
+      it; no synthesis at all.
+    - Text of at most ``local_max_chars`` goes to the local engine first,
+      so short formulaic replies skip the network.
+    - Everything else goes to the remote engine first. While its circuit
+      breaker is open, or when it misses its deadline or errors, the reply
+      falls through to the next engine.
+    TTSUnavailableError is raised only when every engine fails. Audio from
+    engines that can't encode the requested format is transcoded to it
+    when ffmpeg is available, and sent as-is otherwise.
+    """
+
+    def __init__(self, remote: TTSEngine, local: Optional[TTSEngine] = None,
+                 bundles: Optional[Any] = None, local_max_chars: int = 60):
+        self.remote = remote
+        self.local = local
+        self.bundles = bundles
+        self.local_max_chars = local_max_chars
+        self._lock = threading.Lock()
+        self._engines: Dict[str, Dict[str, float]] = {}
+        self.fallbacks = 0
+        self.failures = 0
+
+    def route(self, text: str) -> List[TTSEngine]:
+        """Engines to try for text, in order"""
+        order = [self.remote, self.local]
+        if len(text.strip()) <= self.local_max_chars:
+            order.reverse()
+        return [engine for engine in order if engine is not None and engine.available()]
+
+    def synthesize(self, text: str, fmt: AudioFormat = DEFAULT_FORMAT,
+                   cancel: Optional[CancelToken] = None) -> SpeechAudio:
+        """The whole clip for text; raises Cancelled if ``cancel`` fires first"""
+        bundled = self.bundles.lookup(text, fmt) if self.bundles is not None else None
+        if bundled is not None:
+            self._record('bundle', 0.0)
+            return SpeechAudio(bundled, fmt.mimetype, 'bundle')
+        return self._first_success(text, lambda engine: self._synthesize_with(engine, text, fmt, cancel), cancel)
+
+    def stream(self, text: str, fmt: AudioFormat = DEFAULT_FORMAT,
+               cancel: Optional[CancelToken] = None) -> SpeechStream:
+        """Audio for text as it is synthesized; only the opening request can fall back"""
+        bundled = self.bundles.lookup(text, fmt) if self.bundles is not None else None
+        if bundled is not None:
+            self._record('bundle', 0.0)
+            return SpeechStream(iter([bundled]), fmt.mimetype, 'bundle')
+
+        def open_stream(engine: TTSEngine) -> SpeechStream:
+            if engine.encodes_formats:
+                return SpeechStream(engine.stream(text, fmt, cancel), fmt.mimetype, engine.name)
+            speech = self._synthesize_with(engine, text, fmt, cancel)
+            return SpeechStream(iter([speech.audio]), speech.mimetype, speech.engine)
+
+        return self._first_success(text, open_stream, cancel)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'local_engine': self.local.name if self.local is not None else None,
+                'local_max_chars': self.local_max_chars,
+                'fallbacks': self.fallbacks,
+                'failures': self.failures,
+                'engines': {
+                    name: {
+                        'calls': int(engine['calls']),
+                        'errors': int(engine['errors']),
+                        'avg_ms': round(engine['seconds'] * 1000 / engine['calls'], 1) if engine['calls'] else 0.0,
+                    }
+                    for name, engine in self._engines.items()
+                },
+            }
+
+    @staticmethod
+    def _synthesize_with(engine: TTSEngine, text: str, fmt: AudioFormat,
+                         cancel: Optional[CancelToken] = None) -> SpeechAudio:
+        audio = engine.synthesize(text, fmt, cancel)
+        if engine.encodes_formats:
+            return SpeechAudio(audio, fmt.mimetype, engine.name)
+        try:
+            return SpeechAudio(transcode(audio, fmt, input_format=engine.mimetype.split('/')[-1]),
+                               fmt.mimetype, engine.name)
+        except Exception:
+            return SpeechAudio(audio, engine.mimetype, engine.name)
+
+    def _first_success(self, text: str, run: Callable[[TTSEngine], Any],
+                       cancel: Optional[CancelToken] = None) -> Any:
+        engines = self.route(text)
+        last_error: Optional[Exception] = None
+        for attempt, engine in enumerate(engines):
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            start = time.perf_counter()
+            try:
+                result = run(engine)
+            except Cancelled:
+                raise
+            except Exception as e:
+                if cancel is not None and cancel.is_set():
+                    raise Cancelled() from e
+                print(f"⚠️  {engine.name} TTS failed: {e}")
+                self._record(engine.name, time.perf_counter() - start, error=True)
+                last_error = e
+                continue
+            self._record(engine.name, time.perf_counter() - start, fallback=attempt > 0)
+            return result
+        with self._lock:
+            self.failures += 1
+        raise TTSUnavailableError(str(last_error) if last_error else "No text-to-speech engine configured")
+
+    def _record(self, name: str, seconds: float, error: bool = False, fallback: bool = False) -> None:
+        with self._lock:
+            engine = self._engines.setdefault(name, {'calls': 0, 'errors': 0, 'seconds': 0.0})
+            if error:
+                engine['errors'] += 1
+                return
+            engine['calls'] += 1
+            engine['seconds'] += seconds
+            if fallback:
+                self.fallbacks += 1
@@ -0,0 +1,123 @@
+"""
+Per-session turn queue for Prism AI Voice Assistant
+Runs each client's turns in order on a shared worker pool, cancelling superseded ones
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
+from ..utils.cancellation import CancelToken
+
+
+@dataclass
+class Turn:
+    """One queued unit of work for a session, e.g. a voice utterance"""
+    session_id: str
+    fn: Callable[[CancelToken], Any]
+    cancelled: CancelToken = field(default_factory=CancelToken)
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class TurnQueue:
+    """Ordered per-session work on a shared pool
+
+    Each session has a FIFO of turns and at most one of them runs at a
+    time, so a client's utterances are answered in the order they were
+    spoken. Different sessions run in parallel on the pool's workers.
+    After each turn the session goes to the back of the pool's queue, so
+    a chatty client can't hold a worker while others wait.
+
+    A turn's function receives its CancelToken and passes it on to the
+    upstream calls it makes, which abort as soon as it fires.
+    ``submit(..., supersede=True)`` cancels the running turn and drops any
+    queued ones (barge-in).
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prism-turn')
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Deque[Turn]] = {}
+        self._running: Dict[str, Turn] = {}
+        self._scheduled: Set[str] = set()
+        self._counts = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0, 'superseded': 0}
+        self._wait_seconds = 0.0
+
+    def submit(self, session_id: str, fn: Callable[[CancelToken], Any], supersede: bool = False) -> Turn:
+        """Queue ``fn`` behind the session's earlier turns (or in place of them with ``supersede``)"""
+        turn = Turn(session_id, fn)
+        superseded: List[Turn] = []
+        with self._lock:
+            self._counts['submitted'] += 1
+            if supersede:
+                superseded = self._take_live(session_id)
+                self._counts['superseded'] += len(superseded)
+            self._pending.setdefault(session_id, deque()).append(turn)
+            if session_id not in self._scheduled:
+                self._scheduled.add(session_id)
+                self._executor.submit(self._run_next, session_id)
+        # Cancel callbacks close sockets and streams; run them outside the lock
+        for old in superseded:
+            old.cancelled.cancel()
+        return turn
+
+    def cancel(self, session_id: str) -> int:
+        """Cancel the session's running turn and drop its queued ones; returns how many"""
+        with self._lock:
+            turns = self._take_live(session_id)
+        for turn in turns:
+            turn.cancelled.cancel()
+        return len(turns)
+
+    def running(self, session_id: str) -> Optional[Turn]:
+        with self._lock:
+            return self._running.get(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self._counts['completed'] + self._counts['failed']
+            return {
+                **self._counts,
+                'running': len(self._running),
+                'queued': sum(len(turns) for turns in self._pending.values()),
+                'sessions': len(self._scheduled),
+                'avg_wait_ms': round(self._wait_seconds * 1000 / started, 1) if started else 0.0,
+            }
+
+    def _take_live(self, session_id: str) -> List[Turn]:
+        """The session's running and queued turns not yet cancelled, with queued
+        ones dropped; the caller holds the lock and cancels them after releasing it"""
+        live = [turn for turn in [self._running.get(session_id), *self._pending.get(session_id, ())]
+                if turn is not None and not turn.cancelled.is_set()]
+        if session_id in self._pending:
+            self._pending[session_id].clear()
+        self._counts['cancelled'] += len(live)
+        return live
+
+    def _run_next(self, session_id: str) -> None:
+        """Run the session's next live turn, then requeue the session if more are waiting"""
+        with self._lock:
+            queue = self._pending.get(session_id)
+            while queue and queue[0].cancelled.is_set():
+                queue.popleft()
+            if not queue:
+                self._pending.pop(session_id, None)
+                self._scheduled.discard(session_id)
+                return
+            turn = queue.popleft()
+            self._running[session_id] = turn
+            self._wait_seconds += time.monotonic() - turn.queued_at
+        outcome = 'completed'
+        try:
+            turn.fn(turn.cancelled)
+        except Exception as e:
+            outcome = 'failed'
+            print(f"Turn for session {session_id} failed: {e}")
+        with self._lock:
+            self._counts[outcome] += 1
+            if self._running.get(session_id) is turn:
+                del self._running[session_id]
+        self._executor.submit(self._run_next, session_id)
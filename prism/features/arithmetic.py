@@ -0,0 +1,517 @@
+"""
+Arithmetic engine for Prism AI Voice Assistant
+Tokenizes, parses and evaluates spoken or typed math without using eval
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from ..utils.number_words import ONES, SCALES, TENS
+
+Number = Union[int, float]
+
+# Largest result (in bits) an integer power may produce before we refuse it
+MAX_POWER_BITS = 4096
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression cannot be parsed or evaluated"""
+
+
+class UnsupportedExpressionError(ExpressionError):
+    """Raised when an expression contains words or symbols we don't handle"""
+
+
+# ---------------------------------------------------------------------------
+# Syntax tree
+# ---------------------------------------------------------------------------
+
+# Nodes are NamedTuples rather than dataclasses: they are built on every
+# cache miss, and tuple construction is several times cheaper.
+
+class Literal(NamedTuple):
+    """A numeric constant
+
+    ``implicit`` marks constants the parser adds itself, such as the 2 in
+    "squared", which don't come from a number token in the input.
+    """
+    value: Number
+    implicit: bool = False
+
+
+class UnaryOp(NamedTuple):
+    """Prefix sign (+/-)"""
+    op: str
+    operand: 'Node'
+
+
+class BinaryOp(NamedTuple):
+    """Binary arithmetic (+, -, *, /, //, ^)"""
+    op: str
+    left: 'Node'
+    right: 'Node'
+
+
+class Percent(NamedTuple):
+    """Postfix percentage, e.g. 15%"""
+    operand: 'Node'
+
+
+Node = Union[Literal, UnaryOp, BinaryOp, Percent]
+
+
+# ---------------------------------------------------------------------------
+# Tokenizer
+# ---------------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(r"""
+    (?P<num>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+\.?\d*|\.\d+)
+  | (?P<op>\*\*|//|[-+*/^%()×÷])
+  | (?P<word>[a-z]+(?:'[a-z]+)?)
+  | [\s?!,.=]+
+  | (?P<bad>.)
+""", re.VERBOSE)
+
+# Spoken operators, longest phrases first so "divided by" wins over "divided"
+_PHRASE_OPERATORS: List[Tuple[Tuple[str, ...], str]] = sorted([
+    (('plus',), '+'),
+    (('add',), '+'),
+    (('added', 'to'), '+'),
+    (('and',), '+'),
+    (('to',), '+'),
+    (('minus',), '-'),
+    (('less',), '-'),
+    (('negative',), '-'),
+    (('times',), '*'),
+    (('multiplied', 'by'), '*'),
+    (('multiply', 'by'), '*'),
+    (('divided', 'by'), '/'),
+    (('divided',), '/'),
+    (('over',), '/'),
+    (('to', 'the', 'power', 'of'), '^'),
+    (('raised', 'to', 'the', 'power', 'of'), '^'),
+    (('raised', 'to'), '^'),
+    (('power', 'of'), '^'),
+    (('squared',), 'squared'),
+    (('cubed',), 'cubed'),
+    (('percent',), '%'),
+    (('per', 'cent'), '%'),
+    (('of',), '*'),
+    (('open', 'parenthesis'), '('),
+    (('close', 'parenthesis'), ')'),
+], key=lambda item: -len(item[0]))
+
+# Index phrases by first word so each word only checks its own candidates
+_PHRASES_BY_WORD: Dict[str, List[Tuple[Tuple[str, ...], str]]] = {}
+for _phrase, _op in _PHRASE_OPERATORS:
+    _PHRASES_BY_WORD.setdefault(_phrase[0], []).append((_phrase, _op))
+
+# Words that carry no arithmetic meaning in a spoken question
+_FILLER_WORDS = frozenset({
+    'what', 'whats', "what's", 'is', 'calculate', 'compute', 'solve',
+    'equals', 'equal', 'the', 'please', 'hey', 'prism', 'tell', 'me',
+    'how', 'much', 'result',
+})
+
+# Spoken number words, built from the same tables used to verbalize answers
+_SMALL_NUMBERS: Dict[str, int] = {word: value for value, word in enumerate(ONES)}
+_SMALL_NUMBERS.update({word: value * 10 for value, word in enumerate(TENS) if word})
+_SMALL_NUMBERS['oh'] = 0
+
+_SCALES: Dict[str, int] = {word: 1000 ** power for power, word in enumerate(SCALES) if word}
+
+Token = Tuple[str, Union[str, Number]]
+
+_SYMBOL_ALIASES = {'×': '*', '÷': '/', '**': '^'}
+
+
+def _is_number_word(word: str) -> bool:
+    return word in _SMALL_NUMBERS or word == 'hundred' or word in _SCALES
+
+
+def _read_number_words(words: List[str], start: int) -> Tuple[Number, int]:
+    """Read a run of number words starting at ``start``.
+
+    Returns the value and the index of the first word after the run. Below
+    each hundred, a units word may only follow a bare tens word ("twenty
+    five"); any other pair ("one two", "five twenty") ends the run so the
+    parser sees two numbers rather than their sum.
+    """
+    total = 0
+    current = 0
+    # What was said since the last "hundred" or scale word, if anything
+    tail: Optional[int] = None
+    i = start
+    while i < len(words):
+        word = words[i]
+        if word in _SMALL_NUMBERS:
+            value = _SMALL_NUMBERS[word]
+            if tail is not None and not (tail >= 20 and tail % 10 == 0 and 0 < value < 10):
+                break
+            current += value
+            tail = value if tail is None else tail + value
+        elif word == 'hundred':
+            current = (current or 1) * 100
+            tail = None
+        elif word in _SCALES:
+            total += (current or 1) * _SCALES[word]
+            current = 0
+            tail = None
+        elif word == 'and' and tail is None and (total or current) and i + 1 < len(words) \
+                and words[i + 1] in _SMALL_NUMBERS:
+            # "one hundred and five"
+            pass
+        elif word == 'a' and i + 1 < len(words) and (words[i + 1] == 'hundred' or words[i + 1] in _SCALES):
+            pass
+        else:
+            break
+        i += 1
+
+    value: Number = total + current
+    if i + 1 < len(words) and words[i] == 'point' and words[i + 1] in _SMALL_NUMBERS:
+        digits = []
+        i += 1
+        while i < len(words) and _SMALL_NUMBERS.get(words[i], 10) < 10:
+            digits.append(str(_SMALL_NUMBERS[words[i]]))
+            i += 1
+        value = float(f"{value}.{''.join(digits)}")
+    return value, i
+
+
+def _flush_words(words: List[str], tokens: List[Token]) -> None:
+    """Translate a run of words into number and operator tokens"""
+    i = 0
+    while i < len(words):
+        word = words[i]
+        if _is_number_word(word) or (word == 'a' and i + 1 < len(words) and _is_number_word(words[i + 1])):
+            value, i = _read_number_words(words, i)
+            tokens.append(('num', value))
+            continue
+
+        for phrase, op in _PHRASES_BY_WORD.get(word, ()):
+            if len(phrase) == 1 or tuple(words[i:i + len(phrase)]) == phrase:
+                tokens.append(('op', op))
+                i += len(phrase)
+                break
+        else:
+            if word in _FILLER_WORDS:
+                i += 1
+                continue
+            if word == 'x':
+                tokens.append(('op', '*'))
+                i += 1
+                continue
+            raise UnsupportedExpressionError(f"unsupported word '{word}'")
+    words.clear()
+
+
+def tokenize(text: str) -> List[Token]:
+    """Split spoken or typed math into ('num', value) and ('op', symbol) tokens"""
+    tokens: List[Token] = []
+    words: List[str] = []
+    for num, op, word, bad in _TOKEN_RE.findall(text.lower()):
+        if word:
+            words.append(word)
+            continue
+        if not (num or op or bad):
+            continue
+        if words:
+            _flush_words(words, tokens)
+        if num:
+            digits = num.replace(',', '')
+            tokens.append(('num', float(digits) if '.' in digits else int(digits)))
+        elif op:
+            tokens.append(('op', _SYMBOL_ALIASES.get(op, op)))
+        else:
+            raise UnsupportedExpressionError(f"unsupported character '{bad}'")
+    if words:
+        _flush_words(words, tokens)
+    return tokens
+
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+
+# Binding power of binary operators; '^' is right-associative like Python's **
+_BINARY_PRECEDENCE: Dict[str, int] = {'+': 1, '-': 1, '*': 2, '/': 2, '//': 2, '^': 4}
+_UNARY_PRECEDENCE = 3
+_POSTFIX_OPS = frozenset({'%', 'squared', 'cubed'})
+
+
+class _Parser:
+    """Precedence-climbing parser following Python's operator precedence
+
+    Signs bind looser than '^' (so -2^2 is -4) and tighter than '*' and '/'.
+    Percent, squared and cubed are postfix and bind tightest.
+    """
+
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def _peek(self) -> Optional[Token]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise ExpressionError("empty expression")
+        node = self._binary(1)
+        if self.pos != len(self.tokens):
+            raise ExpressionError(f"unexpected '{self.tokens[self.pos][1]}'")
+        return node
+
+    def _binary(self, min_precedence: int) -> Node:
+        node = self._prefix()
+        while True:
+            token = self._peek()
+            if token is None or token[0] != 'op':
+                return node
+            op = token[1]
+            precedence = _BINARY_PRECEDENCE.get(op, 0)  # type: ignore[arg-type]
+            if precedence < min_precedence:
+                return node
+            self.pos += 1
+            # Right-associative '^' re-enters at its own level, the rest one above
+            node = BinaryOp(op, node, self._binary(precedence if op == '^' else precedence + 1))  # type: ignore[arg-type]
+
+    def _prefix(self) -> Node:
+        token = self._peek()
+        if token is None:
+            raise ExpressionError("unexpected end of expression")
+        self.pos += 1
+        kind, value = token
+        if kind == 'num':
+            node: Node = Literal(value)  # type: ignore[arg-type]
+        elif value in ('+', '-'):
+            return UnaryOp(value, self._binary(_UNARY_PRECEDENCE + 1))  # type: ignore[arg-type]
+        elif value == '(':
+            node = self._binary(1)
+            token = self._peek()
+            if token is None or token[1] != ')':
+                raise ExpressionError("missing closing parenthesis")
+            self.pos += 1
+        else:
+            raise ExpressionError(f"unexpected '{value}'")
+
+        while True:
+            token = self._peek()
+            if token is None or token[1] not in _POSTFIX_OPS:
+                return node
+            self.pos += 1
+            if token[1] == '%':
+                node = Percent(node)
+            else:
+                node = BinaryOp('^', node, Literal(2 if token[1] == 'squared' else 3, implicit=True))
+
+
+# ---------------------------------------------------------------------------
+# Evaluator
+# ---------------------------------------------------------------------------
+
+def _power(base: Number, exponent: Number) -> Number:
+    """Exponentiation with a guard against results too large to compute"""
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and abs(base) > 1:
+        if exponent * math.log2(abs(base)) > MAX_POWER_BITS:
+            raise ExpressionError("result is too large")
+    result = base ** exponent
+    if isinstance(result, complex):
+        raise ExpressionError("result is not a real number")
+    return result
+
+
+_BINARY_OPS: Dict[str, Callable[[Number, Number], Number]] = {
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+    '/': lambda a, b: a / b,
+    '//': lambda a, b: a // b,
+    '^': _power,
+}
+
+
+def evaluate_node(node: Node) -> Number:
+    """Evaluate a syntax tree built by the parser"""
+    if isinstance(node, Literal):
+        return node.value
+    if isinstance(node, BinaryOp):
+        return _BINARY_OPS[node.op](evaluate_node(node.left), evaluate_node(node.right))
+    if isinstance(node, UnaryOp):
+        value = evaluate_node(node.operand)
+        return -value if node.op == '-' else value
+    if isinstance(node, Percent):
+        return evaluate_node(node.operand) / 100
+    raise ExpressionError(f"unknown node {node!r}")
+
+
+def _structure(node: Node, literals: List[Number]) -> tuple:
+    """Return the tree's shape with literals replaced by '#', collecting them in order
+
+    Literals come out in source order, matching the number tokens of the input.
+    """
+    if isinstance(node, Literal):
+        if node.implicit:
+            return ('=', node.value)
+        literals.append(node.value)
+        return ('#',)
+    if isinstance(node, BinaryOp):
+        return (node.op, _structure(node.left, literals), _structure(node.right, literals))
+    if isinstance(node, UnaryOp):
+        return (node.op, _structure(node.operand, literals))
+    return ('%', _structure(node.operand, literals))
+
+
+@dataclass(frozen=True)
+class Expression:
+    """A parsed expression ready to be evaluated
+
+    ``shape`` is the operator structure with constants blanked out, and
+    ``literals`` holds those constants in order. Expressions with the same
+    shape can be evaluated together as arrays (see ``evaluate_batch``).
+    """
+    source: str
+    root: Node
+    shape: tuple
+    literals: Tuple[Number, ...]
+
+    def evaluate(self) -> Number:
+        return evaluate_node(self.root)
+
+
+@lru_cache(maxsize=2048)
+def parse_expression(text: str) -> Expression:
+    """Parse text into an Expression, caching the result per input string"""
+    root = _Parser(tokenize(text)).parse()
+    literals: List[Number] = []
+    shape = _structure(root, literals)
+    return Expression(text, root, shape, tuple(literals))
+
+
+def evaluate(text: str) -> Number:
+    """Parse (or fetch from cache) and evaluate an expression"""
+    return parse_expression(text).evaluate()
+
+
+# ---------------------------------------------------------------------------
+# Batch evaluation
+# ---------------------------------------------------------------------------
+
+# Groups smaller than this are cheaper to evaluate one by one
+MIN_VECTOR_GROUP = 8
+
+# Above 2**53 float64 stops representing integers exactly
+_EXACT_FLOAT_LIMIT = 2.0 ** 53
+
+
+def _evaluate_vector(shape: tuple, columns: Iterator[Tuple[Any, Any]], peak: Any) -> Tuple[Any, Any]:
+    """Evaluate a shape over NumPy columns, one (values, is_int) column per literal slot
+
+    Returns the values and, per row, whether ``evaluate`` would produce an
+    int, following Python's rules for each operator. ``peak`` is updated
+    in place with the largest magnitude seen at any step, so rows whose
+    intermediate results left float64's exact range can be recomputed; a
+    power other than int ** non-negative int sets it to infinity for the
+    same reason.
+    """
+    op = shape[0]
+    if op == '#':
+        values, integral = next(columns)
+    elif op == '=':
+        values, integral = shape[1], isinstance(shape[1], int)
+    elif len(shape) == 2:
+        operand, integral = _evaluate_vector(shape[1], columns, peak)
+        if op == '%':
+            values, integral = operand / 100, False
+        else:
+            values = np.negative(operand) if op == '-' else operand
+    else:
+        left, left_int = _evaluate_vector(shape[1], columns, peak)
+        right, right_int = _evaluate_vector(shape[2], columns, peak)
+        integral = left_int & right_int
+        if op == '+':
+            values = left + right
+        elif op == '-':
+            values = left - right
+        elif op == '*':
+            values = left * right
+        elif op == '/':
+            values, integral = np.true_divide(left, right), False
+        elif op == '//':
+            values = np.floor_divide(left, right)
+        else:
+            # int ** negative int is a float in Python
+            values, integral = np.power(left, right), integral & (right >= 0)
+            # NumPy's vectorized pow can differ from the scalar one in the
+            # last bit, so only int ** non-negative int stays on this path
+            np.fmax(peak, np.where(integral, 0.0, np.inf), out=peak)
+    np.fmax(peak, np.abs(values), out=peak)
+    return values, integral
+
+
+def _evaluate_one(text: str) -> Union[Number, Exception]:
+    try:
+        return evaluate(text)
+    except Exception as e:
+        return e
+
+
+def evaluate_batch(texts: List[str]) -> List[Union[Number, Exception]]:
+    """Evaluate many expressions, returning a value or the raised error for each
+
+    Inputs are tokenized and grouped by their operator signature; inputs that
+    differ only in their numbers share one parse and, when the group is large
+    enough, one NumPy evaluation over a column per number. Anything the
+    float64 path can't answer exactly (division by zero, overflow, powers
+    other than int ** non-negative int, integers beyond 2**53 at any step)
+    is re-evaluated one at a time, so values, their int/float types and errors all match ``evaluate``.
+    """
+    results: List[Union[Number, Exception, None]] = [None] * len(texts)
+    groups: Dict[tuple, List[Tuple[int, List[Number]]]] = {}
+    for index, text in enumerate(texts):
+        try:
+            tokens = tokenize(text)
+        except Exception as e:
+            results[index] = e
+            continue
+        signature = tuple('#' if kind == 'num' else value for kind, value in tokens)
+        groups.setdefault(signature, []).append((index, [value for kind, value in tokens if kind == 'num']))
+
+    for members in groups.values():
+        if len(members) < MIN_VECTOR_GROUP:
+            for index, _ in members:
+                results[index] = _evaluate_one(texts[index])
+            continue
+
+        # The parser only looks at token kinds and operators, so one parse
+        # gives the shape for every member of the group
+        try:
+            shape = parse_expression(texts[members[0][0]]).shape
+        except Exception:
+            for index, _ in members:
+                results[index] = _evaluate_one(texts[index])
+            continue
+
+        numbers = [row for _, row in members]
+        matrix = np.array(numbers, dtype=np.float64).reshape(len(members), -1)
+        int_matrix = np.array([[isinstance(value, int) for value in row] for row in numbers],
+                              dtype=bool).reshape(len(members), -1)
+        peak = np.zeros(len(members))
+        with np.errstate(all='ignore'):
+            values, integral = _evaluate_vector(shape, zip(matrix.T, int_matrix.T), peak)
+        values = np.broadcast_to(values, (len(members),))
+        integral = np.broadcast_to(integral, (len(members),))
+        # NaN anywhere along the way leaves peak NaN, which fails the comparison too
+        exact = np.isfinite(values) & (peak < _EXACT_FLOAT_LIMIT)
+
+        for (index, _), value, is_int, ok in zip(members, values.tolist(), integral.tolist(), exact.tolist()):
+            if ok:
+                results[index] = int(value) if is_int else value
+            else:
+                results[index] = _evaluate_one(texts[index])
+
+    return results  # type: ignore[return-value]
@@ -0,0 +1,160 @@
+"""
+Approximate term matching for Prism AI Voice Assistant
+Finds index terms within a few edits of a misrecognized word
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+
+def max_edits_for(word: str) -> int:
+    """Default tolerance: exact for short words, two edits only from eight letters"""
+    if len(word) < 4:
+        return 0
+    if len(word) < 8:
+        return 1
+    return 2
+
+
+def similarity(word: str, term: str, distance: int) -> float:
+    """1.0 for identical words, falling with each edit relative to the longer word"""
+    return 1.0 - distance / max(len(word), len(term))
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """Levenshtein distance between a and b, or None if it exceeds ``limit``
+
+    Only a diagonal band of width 2 * limit + 1 is computed, and the scan
+    stops as soon as every cell in the current row is over the limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    if len(a) > len(b):
+        a, b = b, a
+    too_far = limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        low = max(1, i - limit)
+        high = min(len(b), i + limit)
+        current = [too_far] * (len(b) + 1)
+        current[0] = i if i <= limit else too_far
+        row_min = current[0]
+        for j in range(low, high + 1):
+            cost = 0 if char_a == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return None
+        previous = current
+    distance = previous[len(b)]
+    return distance if distance <= limit else None
+
+
+def _bigrams(word: str) -> Set[str]:
+    padded = f"^{word}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class FuzzyMatcher:
+    """Bigram candidate index verified by bounded edit distance
+
+    Terms are bucketed by (bigram, length), so a lookup only touches terms
+    whose length is within the edit budget. Each edit can remove at most
+    two of a word's bigrams, which bounds how many bigrams a match must
+    share and lets the lookup read only the rarest buckets. Recent lookups
+    are kept in a small LRU since spoken queries repeat.
+    """
+
+    def __init__(self, max_edits: Optional[int] = None, cache_size: int = 4096):
+        self.max_edits = max_edits
+        self.cache_size = cache_size
+        self._buckets: Dict[Tuple[str, int], Set[str]] = {}
+        self._terms: Set[str] = set()
+        self._cache: 'OrderedDict[Tuple[str, int], List[Tuple[str, int]]]' = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._terms
+
+    def add(self, term: str) -> None:
+        with self._lock:
+            if term in self._terms:
+                return
+            self._terms.add(term)
+            for gram in _bigrams(term):
+                self._buckets.setdefault((gram, len(term)), set()).add(term)
+            self._cache.clear()
+
+    def remove(self, term: str) -> None:
+        with self._lock:
+            if term not in self._terms:
+                return
+            self._terms.discard(term)
+            for gram in _bigrams(term):
+                bucket = self._buckets.get((gram, len(term)))
+                if bucket is not None:
+                    bucket.discard(term)
+                    if not bucket:
+                        del self._buckets[(gram, len(term))]
+            self._cache.clear()
+
+    def lookup(self, word: str, max_edits: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Return (term, distance) pairs within the edit budget, closest first"""
+        if max_edits is None:
+            max_edits = self.max_edits if self.max_edits is not None else max_edits_for(word)
+        if max_edits <= 0:
+            return [(word, 0)] if word in self._terms else []
+
+        key = (word, max_edits)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+            # A match must share at least ``needed`` of the word's bigrams, so
+            # it must share one of the (len(grams) - needed + 1) rarest ones.
+            # Only those buckets seed candidates, which skips huge ones like
+            # ('^s', 7). The remaining bigrams are then counted rarest first,
+            # dropping candidates that can no longer reach ``needed``.
+            lengths = range(len(word) - max_edits, len(word) + max_edits + 1)
+            groups = sorted(
+                ([self._buckets.get((gram, length), ()) for length in lengths] for gram in _bigrams(word)),
+                key=lambda group: sum(len(bucket) for bucket in group),
+            )
+            needed = len(groups) - 2 * max_edits
+            seed_count = len(groups) - needed + 1 if needed > 0 else len(groups)
+
+            counts: Dict[str, int] = {}
+            for group in groups[:seed_count]:
+                for bucket in group:
+                    for term in bucket:
+                        counts[term] = counts.get(term, 0) + 1
+            for position, group in enumerate(groups[seed_count:], seed_count):
+                remaining = len(groups) - position
+                counts = {term: count for term, count in counts.items() if count + remaining >= needed}
+                if not counts:
+                    break
+                for term in counts:
+                    if term in group[len(term) - lengths.start]:
+                        counts[term] += 1
+
+            matches = []
+            for term, count in counts.items():
+                if count < needed:
+                    continue
+                distance = bounded_edit_distance(word, term, max_edits)
+                if distance is not None:
+                    matches.append((term, distance))
+            matches.sort(key=lambda match: (match[1], match[0]))
+
+            self._cache[key] = matches
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return matches
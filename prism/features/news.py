@@ -7,9 +7,14 @@ import os
 import requests
 import re
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional, Tuple
 from dotenv import load_dotenv
 
+from ..utils.number_words import year_to_words
+from ..utils.circuit_breaker import server_error
+from ..utils.offload import OffloadTask, offload
+from ..utils.upstream import upstream
+
 load_dotenv()
 
 @dataclass
@@ -121,7 +126,7 @@ class NewsService:
         
         # Handle numbers and dates
         # Convert "2024" to "twenty twenty four" for years
-        text = re.sub(r'\b(20\d{2})\b', lambda m: self._year_to_words(m.group(1)), text)
+        text = re.sub(r'\b((?:19|20)\d{2})\b', lambda m: year_to_words(m.group(1)), text)
         
         # Handle common symbols
         text = text.replace('...', ' and so on')
@@ -137,35 +142,6 @@ class NewsService:
         
         return text
     
-    def _year_to_words(self, year: str) -> str:
-        """Convert year to spoken words"""
-        if len(year) == 4:
-            first_two = year[:2]
-            last_two = year[2:]
-            if first_two == '20':
-                return f"twenty {self._number_to_words(int(last_two))}"
-            elif first_two == '19':
-                return f"nineteen {self._number_to_words(int(last_two))}"
-        return year
-    
-    def _number_to_words(self, num: int) -> str:
-        """Convert numbers 0-99 to words"""
-        if num == 0:
-            return "zero"
-        elif num < 20:
-            words = ["", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
-                    "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen"]
-            return words[num]
-        elif num < 100:
-            tens = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
-            words = ["", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
-                    "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen"]
-            if num % 10 == 0:
-                return tens[num // 10]
-            else:
-                return f"{tens[num // 10]} {words[num % 10]}"
-        return str(num)
-    
     def get_news(self, category: str = "general", limit: int = 5) -> List[NewsItem]:
         """Get latest news articles"""
         if not self.api_key:
@@ -196,18 +172,19 @@ class NewsService:
         
         try:
             url = f"https://newsapi.org/v2/top-headlines?category={category}&apiKey={self.api_key}&pageSize={limit}"
-            response = requests.get(url, timeout=10)
+            response = upstream.call('news', lambda timeout: requests.get(url, timeout=timeout), is_failure=server_error)
             data = response.json()
             
             if response.status_code != 200:
                 return self._get_mock_news()
             
+            # Make titles TTS-friendly, off the request thread
+            raw_articles = data.get('articles', [])
+            original_titles = tuple(article.get('title', 'No title') for article in raw_articles)
+            tts_titles = offload.run(NormalizeHeadlines(original_titles), timeout=5.0)
+            
             articles = []
-            for article in data.get('articles', []):
-                # Make title TTS-friendly
-                original_title = article.get('title', 'No title')
-                tts_title = self._make_tts_friendly(original_title)
-                
+            for article, original_title, tts_title in zip(raw_articles, original_titles, tts_titles):
                 # Debug: Print original vs processed title
                 print(f"Original: '{original_title}'")
                 print(f"Processed: '{tts_title}'")
@@ -252,5 +229,15 @@ class NewsService:
             )
         ]
 
+@dataclass(frozen=True)
+class NormalizeHeadlines(OffloadTask):
+    """TTS-friendly versions of a batch of headlines"""
+    titles: Tuple[str, ...]
+    
+    kind = 'normalize_headlines'
+    
+    def run(self, data: Optional[bytes]) -> List[str]:
+        return [news_service._make_tts_friendly(title) for title in self.titles]
+
 # Global instance
 news_service = NewsService() 
\ No newline at end of file
@@ -7,7 +7,11 @@ import re
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+
+from ..utils.state import StateBackend, state_store
+
+REMINDERS_KEY = 'reminders'
 
 @dataclass
 class Reminder:
@@ -16,12 +20,30 @@ class Reminder:
     title: str
     datetime: datetime
     completed: bool = False
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {'id': self.id, 'title': self.title, 'datetime': self.datetime.isoformat(),
+                'completed': self.completed}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Reminder':
+        return cls(data['id'], data['title'], datetime.fromisoformat(data['datetime']), data['completed'])
 
 class ReminderService:
-    """Service for reminder management"""
+    """Service for reminder management
+    
+    Reminders live in the state backend, so every worker process sees the
+    same list.
+    """
+    
+    def __init__(self, store: Optional[StateBackend] = None):
+        self.store = store if store is not None else state_store
     
-    def __init__(self):
-        self.reminders: List[Reminder] = []
+    @property
+    def reminders(self) -> List[Reminder]:
+        """All reminders, soonest first"""
+        reminders = [Reminder.from_dict(data) for data in self.store.hgetall(REMINDERS_KEY).values()]
+        return sorted(reminders, key=lambda reminder: reminder.datetime)
     
     def add_reminder(self, title: str, time_str: str) -> Reminder:
         """Add a new reminder"""
@@ -31,7 +53,7 @@ class ReminderService:
             title=title,
             datetime=reminder_time
         )
-        self.reminders.append(reminder)
+        self.store.hset(REMINDERS_KEY, reminder.id, reminder.to_dict())
         return reminder
     
     def get_reminders(self, include_completed: bool = False) -> List[Reminder]:
@@ -42,19 +64,12 @@ class ReminderService:
     
     def complete_reminder(self, reminder_id: str) -> bool:
         """Mark a reminder as completed"""
-        for reminder in self.reminders:
-            if reminder.id == reminder_id:
-                reminder.completed = True
-                return True
-        return False
+        # One atomic update, so a reminder deleted meanwhile stays deleted
+        return self.store.hupdate(REMINDERS_KEY, reminder_id, lambda data: {**data, 'completed': True}) is not None
     
     def delete_reminder(self, reminder_id: str) -> bool:
         """Delete a reminder"""
-        for i, reminder in enumerate(self.reminders):
-            if reminder.id == reminder_id:
-                del self.reminders[i]
-                return True
-        return False
+        return self.store.hdel(REMINDERS_KEY, reminder_id)
     
     def _parse_time_string(self, time_str: str) -> datetime:
         """Parse natural language time strings into datetime objects"""
@@ -4,11 +4,15 @@ Provides web search simulation
 """
 
 import re
+from typing import List, Optional
+
+from .search_index import SearchHit, SearchIndex
 
 class SearchService:
     """Service for web search simulation"""
     
-    def __init__(self):
+    def __init__(self, fuzzy: bool = True, max_edits: Optional[int] = None):
+        """Create the service; ``fuzzy`` and ``max_edits`` control typo tolerance"""
         self.search_results = {
             "python": "Python is a high-level, interpreted programming language known for its simplicity and readability.",
             "ai": "Artificial Intelligence (AI) is the simulation of human intelligence in machines.",
@@ -20,6 +24,13 @@ class SearchService:
             "calculator": "A calculator is a device used for performing mathematical calculations.",
             "reminder": "A reminder is a note or notification to help you remember something important."
         }
+        self.index = SearchIndex(fuzzy=fuzzy, max_edits=max_edits)
+        for keyword, result in self.search_results.items():
+            self.index.add(keyword, result)
+    
+    def search(self, query: str, top_k: int = 5) -> List[SearchHit]:
+        """Rank knowledge entries against a query"""
+        return self.index.search(query, top_k)
     
     def search_web(self, query: str) -> str:
         """Simulate web search results"""
@@ -29,17 +40,20 @@ class SearchService:
         query = re.sub(r'\b(search|find|look up|what is|tell me about)\b', '', query, flags=re.IGNORECASE)
         query = query.strip()
         
-        # Check if we have a predefined result
-        for key, result in self.search_results.items():
-            if key in query:
-                return f"Here's what I found about '{query}': {result}"
+        # Use the best-ranked predefined result whose topic the query names;
+        # a word that only appears in an entry's text isn't enough
+        for hit in self.index.search(query, top_k=5):
+            if hit.keyword_match:
+                return f"Here's what I found about '{query}': {hit.result}"
         
         # Generic response for unknown queries
         return f"I found several results about '{query}'. Here are some key points: This topic covers various aspects and has been widely discussed in recent years. For more detailed information, you might want to search online or ask me a more specific question."
     
     def add_search_result(self, keyword: str, result: str):
-        """Add a new search result"""
-        self.search_results[keyword.lower()] = result
+        """Add a new search result, indexing it immediately"""
+        keyword = keyword.lower()
+        self.search_results[keyword] = result
+        self.index.add(keyword, result)
 
 # Global instance
 search_service = SearchService() 
\ No newline at end of file
@@ -0,0 +1,242 @@
+"""
+Local search index for Prism AI Voice Assistant
+Inverted index with BM25 ranking over the search knowledge entries
+"""
+
+import bisect
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from .fuzzy import FuzzyMatcher, similarity
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does', 'for',
+    'from', 'how', 'i', 'in', 'is', 'it', 'its', 'me', 'of', 'on', 'or', 's',
+    'that', 'the', 'this', 'to', 'was', 'what', 'whats', 'when', 'where', 'which',
+    'who', 'why', 'with', 'you', 'about', 'tell', 'search', 'find', 'look', 'up',
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase text and split it into index terms, dropping stop words"""
+    return [term for term in _TOKEN_RE.findall(text.lower()) if term not in STOP_WORDS]
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result
+
+    ``terms`` are the index terms from the query that the entry contains.
+    """
+    keyword: str
+    result: str
+    score: float
+    terms: Tuple[str, ...] = ()
+
+    @property
+    def keyword_match(self) -> bool:
+        """Whether any matched term is part of the entry's keyword, not just its text"""
+        return not set(self.terms).isdisjoint(tokenize(self.keyword))
+
+
+class SearchIndex:
+    """Inverted index with BM25 scoring and incremental updates
+
+    Each entry is a keyword plus its answer text. Keyword terms count
+    ``keyword_weight`` times so a query naming the topic outranks entries
+    that only mention it in passing.
+
+    With ``fuzzy`` enabled, query terms that aren't in the index are matched
+    to index terms within ``max_edits`` edits (None picks a budget from the
+    word length), and adjacent fragments such as "flas k" are rejoined.
+    Only the closest candidates are used, and only if their similarity
+    (1 - edits / length) is at least ``min_similarity``. An approximate
+    match weighs its similarity times ``1 - fuzzy_penalty``, so it always
+    counts for less than an exact term.
+
+    Terms found in more than ``max_scan`` entries (None for no limit) are
+    scored only over their ``max_scan`` highest-impact entries, a champion
+    list kept up to date as entries are added, so common words don't make
+    a query scan most of the index.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, keyword_weight: int = 3,
+                 fuzzy: bool = True, max_edits: Optional[int] = None, fuzzy_penalty: float = 0.3,
+                 min_similarity: float = 0.7, max_scan: Optional[int] = 256):
+        self.k1 = k1
+        self.b = b
+        self.keyword_weight = keyword_weight
+        self.fuzzy = fuzzy
+        self.fuzzy_penalty = fuzzy_penalty
+        self.min_similarity = min_similarity
+        self.max_scan = max_scan
+        self._matcher = FuzzyMatcher(max_edits=max_edits)
+        self._postings: Dict[str, Dict[str, int]] = {}
+        # term -> [(-impact, keyword)] sorted, for terms in more than max_scan entries
+        self._champions: Dict[str, List[Tuple[float, str]]] = {}
+        self._stale: Set[str] = set()
+        self._entries: Dict[str, str] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self._entries
+
+    def add(self, keyword: str, result: str) -> None:
+        """Add an entry, replacing any existing entry with the same keyword"""
+        terms = Counter(tokenize(result))
+        for term in tokenize(keyword):
+            terms[term] += self.keyword_weight
+        with self._lock:
+            if keyword in self._entries:
+                self._remove_locked(keyword)
+            self._entries[keyword] = result
+            length = sum(terms.values())
+            self._lengths[keyword] = length
+            self._total_length += length
+            for term, count in terms.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    self._matcher.add(term)
+                postings[keyword] = count
+                self._update_champions(term, keyword, count)
+
+    def remove(self, keyword: str) -> bool:
+        """Remove an entry; returns False if it wasn't indexed"""
+        with self._lock:
+            if keyword not in self._entries:
+                return False
+            self._remove_locked(keyword)
+            return True
+
+    def _remove_locked(self, keyword: str) -> None:
+        terms = set(tokenize(self._entries.pop(keyword))) | set(tokenize(keyword))
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(keyword, None)
+                if not postings:
+                    del self._postings[term]
+                    self._matcher.remove(term)
+                if term in self._champions:
+                    # Refilled from the full postings on the next query for the term
+                    self._stale.add(term)
+        self._total_length -= self._lengths.pop(keyword)
+
+    def _impact(self, keyword: str, frequency: int) -> float:
+        """BM25 term-frequency factor of an entry, the order champion lists keep"""
+        average_length = self._total_length / max(1, len(self._entries))
+        norm = self.k1 * (1 - self.b + self.b * self._lengths[keyword] / average_length)
+        return frequency / (frequency + norm)
+
+    def _update_champions(self, term: str, keyword: str, frequency: int) -> None:
+        if self.max_scan is None or len(self._postings[term]) <= self.max_scan:
+            return
+        if term in self._stale:
+            return
+        champions = self._champions.get(term)
+        if champions is None:
+            # Just crossed the limit: every entry but one is a champion
+            self._rebuild_champions(term)
+            return
+        entry = (-self._impact(keyword, frequency), keyword)
+        if entry < champions[-1]:
+            bisect.insort(champions, entry)
+            champions.pop()
+
+    def _rebuild_champions(self, term: str) -> None:
+        self._champions[term] = heapq.nsmallest(
+            self.max_scan, ((-self._impact(keyword, frequency), keyword)
+                            for keyword, frequency in self._postings[term].items())
+        )
+        self._stale.discard(term)
+
+    def _scan(self, term: str) -> List[Tuple[str, int]]:
+        """(keyword, frequency) pairs to score for a term: all of them, or its champions"""
+        postings = self._postings[term]
+        if self.max_scan is None or len(postings) <= self.max_scan:
+            self._champions.pop(term, None)
+            self._stale.discard(term)
+            return list(postings.items())
+        if term in self._stale or term not in self._champions:
+            self._rebuild_champions(term)
+        return [(keyword, postings[keyword]) for _, keyword in self._champions[term]]
+
+    def _query_terms(self, query: str) -> Dict[str, float]:
+        """Map each usable query term to a weight (1.0 exact, less for fuzzy)"""
+        words = tokenize(query)
+        weights: Dict[str, float] = {}
+        i = 0
+        while i < len(words):
+            word = words[i]
+            i += 1
+            if word in self._postings:
+                weights[word] = 1.0
+                continue
+            if not self.fuzzy:
+                continue
+            # STT sometimes splits a word in two ("flas k"): try rejoining
+            if i < len(words) and words[i] not in self._postings:
+                joined = word + words[i]
+                candidates = self._fuzzy_candidates(joined)
+                if candidates:
+                    term, weight = candidates[0]
+                    weights[term] = max(weights.get(term, 0.0), weight)
+                    i += 1
+                    continue
+            for term, weight in self._fuzzy_candidates(word):
+                weights[term] = max(weights.get(term, 0.0), weight)
+        return weights
+
+    def _fuzzy_candidates(self, word: str) -> List[Tuple[str, float]]:
+        """Up to three of the closest index terms to an unknown word, with their weights"""
+        if word in self._postings:
+            return [(word, 1.0)]
+        matches = self._matcher.lookup(word)
+        if not matches:
+            return []
+        closest = matches[0][1]
+        candidates = []
+        for term, distance in matches[:3]:
+            score = similarity(word, term, distance)
+            if distance == closest and score >= self.min_similarity:
+                candidates.append((term, score * (1.0 - self.fuzzy_penalty)))
+        return candidates
+
+    def search(self, query: str, top_k: int = 5) -> List[SearchHit]:
+        """Return up to ``top_k`` entries ranked by BM25 score"""
+        with self._lock:
+            terms = self._query_terms(query)
+            count = len(self._entries)
+            if not terms or not count:
+                return []
+            average_length = self._total_length / count
+            k1, b = self.k1, self.b
+            scores: Dict[str, float] = {}
+            for term, weight in terms.items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = weight * math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for keyword, frequency in self._scan(term):
+                    norm = k1 * (1 - b + b * self._lengths[keyword] / average_length)
+                    scores[keyword] = scores.get(keyword, 0.0) + idf * frequency * (k1 + 1) / (frequency + norm)
+
+            best: List[Tuple[float, str]] = heapq.nlargest(top_k, ((score, keyword) for keyword, score in scores.items()))
+            return [
+                SearchHit(keyword, self._entries[keyword], score,
+                          tuple(term for term in terms if keyword in self._postings.get(term, ())))
+                for score, keyword in best
+            ]
@@ -9,6 +9,9 @@ from dataclasses import dataclass
 from typing import List, Dict, Any
 from dotenv import load_dotenv
 
+from ..utils.circuit_breaker import server_error
+from ..utils.upstream import upstream
+
 load_dotenv()
 
 @dataclass
@@ -46,7 +49,7 @@ class WeatherService:
         
         try:
             url = f"https://api.openweathermap.org/data/2.5/weather?q={location}&appid={self.api_key}&units=imperial"
-            response = requests.get(url, timeout=10)
+            response = upstream.call('weather', lambda timeout: requests.get(url, timeout=timeout), is_failure=server_error)
             data = response.json()
             
             if response.status_code != 200:
@@ -94,7 +97,7 @@ class WeatherService:
         
         try:
             url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat_float}&lon={lon_float}&appid={self.api_key}&units=imperial"
-            response = requests.get(url, timeout=10)
+            response = upstream.call('weather', lambda timeout: requests.get(url, timeout=timeout), is_failure=server_error)
             data = response.json()
             
             if response.status_code != 200:
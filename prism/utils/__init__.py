@@ -0,0 +1,40 @@
+"""
+Shared utilities for Prism AI Voice Assistant
+"""
+
+from .number_words import (
+    number_to_words,
+    ordinal_to_words,
+    decimal_to_words,
+    digits_to_words,
+    year_to_words,
+)
+from .cancellation import CancelToken, Cancelled
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, breakers
+from .upstream import Deadline, DeadlineExceeded, LatencySLO, upstream
+from .state import StateBackend, MemoryBackend, RedisBackend, state_store
+from .offload import OffloadService, OffloadTask, offload
+
+__all__ = [
+    'number_to_words',
+    'ordinal_to_words',
+    'decimal_to_words',
+    'digits_to_words',
+    'year_to_words',
+    'Deadline',
+    'DeadlineExceeded',
+    'LatencySLO',
+    'upstream',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'breakers',
+    'CancelToken',
+    'Cancelled',
+    'StateBackend',
+    'MemoryBackend',
+    'RedisBackend',
+    'state_store',
+    'OffloadService',
+    'OffloadTask',
+    'offload'
+]
@@ -0,0 +1,73 @@
+"""
+Cancellation tokens for Prism AI Voice Assistant
+Lets a superseded turn abort its in-flight upstream work right away
+"""
+
+import threading
+from typing import Callable, List, Optional
+
+
+class Cancelled(Exception):
+    """Raised when work is abandoned because its token was cancelled"""
+
+
+class CancelToken:
+    """A one-shot cancellation signal shared by everything a turn starts
+
+    Drop-in for threading.Event (``set``/``is_set``/``wait``). Code that
+    holds something abortable, such as an open HTTP or gRPC stream or a
+    subprocess, registers a callback with ``on_cancel``. Callbacks run once,
+    on the cancelling thread, and do so immediately if the token is
+    already cancelled.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._run(callback)
+
+    set = cancel
+
+    def is_set(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise Cancelled()
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run ``callback`` on cancel; returns a function that unregisters it"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        self._run(callback)
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    @staticmethod
+    def _run(callback: Callable[[], None]) -> None:
+        try:
+            callback()
+        except Exception as e:
+            print(f"⚠️  Cancel callback failed: {e}")
@@ -0,0 +1,158 @@
+"""
+Circuit breakers for Prism AI Voice Assistant
+Stop calling an upstream API while it is failing and fall back immediately
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream whose breaker is open"""
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker over a sliding window of recent calls
+
+    Closed: calls go through and their outcomes are recorded. Once at least
+    ``min_calls`` of the last ``window`` calls are in and the failure rate
+    reaches ``failure_rate``, the breaker opens.
+    Open: calls are refused for ``open_seconds``, then the breaker goes
+    half-open.
+    Half-open: up to ``half_open_calls`` trial calls are let through. The
+    breaker closes if they all succeed and reopens on the first failure.
+    """
+
+    def __init__(self, name: str, failure_rate: float = 0.5, window: int = 20,
+                 min_calls: int = 5, open_seconds: float = 30.0, half_open_calls: int = 1):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.state = CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.transitions: Dict[str, int] = {}
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=20)
+
+    def allow(self) -> bool:
+        """Whether a call may go through now (reserving a trial slot if half-open)"""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                self._transition(HALF_OPEN)
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and self._trials < self.half_open_calls:
+                self._trials += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trial_successes += 1
+                if self._trial_successes >= self.half_open_calls:
+                    self._transition(CLOSED)
+                return
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._transition(OPEN)
+                return
+            if self.state == OPEN:
+                return
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+                self._transition(OPEN)
+
+    def record_cancelled(self) -> None:
+        """A call was abandoned before its outcome was known; free its trial slot"""
+        with self._lock:
+            if self.state == HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._transition(CLOSED)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = len(self._outcomes)
+            return {
+                'state': self.state,
+                'failure_rate': self._outcomes.count(False) / calls if calls else 0.0,
+                'window_calls': calls,
+                'rejected': self.rejected,
+                'transitions': dict(self.transitions),
+                'recent_transitions': list(self.history),
+            }
+
+    def _transition(self, state: str) -> None:
+        """Move to ``state``; the caller holds the lock"""
+        if state == self.state:
+            return
+        previous, self.state = self.state, state
+        key = f"{previous}->{state}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        self.history.append({'from': previous, 'to': state, 'at': time.time()})
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        if state in (HALF_OPEN, CLOSED):
+            self._trials = 0
+            self._trial_successes = 0
+        if state == CLOSED:
+            self._outcomes.clear()
+        print(f"🔌 Circuit '{self.name}': {previous} -> {state}")
+
+
+class BreakerRegistry:
+    """One breaker per upstream, configured from CIRCUIT_* environment settings"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(
+                    name,
+                    failure_rate=float(os.getenv('CIRCUIT_FAILURE_RATE', '0.5')),
+                    window=int(os.getenv('CIRCUIT_WINDOW', '20')),
+                    min_calls=int(os.getenv('CIRCUIT_MIN_CALLS', '5')),
+                    open_seconds=float(os.getenv('CIRCUIT_OPEN_SECONDS', '30')),
+                )
+            return breaker
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._breakers)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: self.get(name).stats() for name in self.names()}
+
+
+breakers = BreakerRegistry()
+
+
+def server_error(response: Optional[Any]) -> bool:
+    """Whether an HTTP response means the upstream itself is failing"""
+    status = getattr(response, 'status_code', 200)
+    return status >= 500 or status == 429
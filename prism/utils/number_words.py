@@ -0,0 +1,129 @@
+"""
+Number verbalization for Prism AI Voice Assistant
+Turns integers, ordinals, decimals and years into words for TTS
+"""
+
+from typing import List, Tuple, Union
+
+ONES: Tuple[str, ...] = (
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine",
+    "ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen",
+    "seventeen", "eighteen", "nineteen",
+)
+
+TENS: Tuple[str, ...] = (
+    "", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety",
+)
+
+# Short-scale names for each group of three digits
+SCALES: Tuple[str, ...] = (
+    "", "thousand", "million", "billion", "trillion", "quadrillion", "quintillion",
+    "sextillion", "septillion", "octillion", "nonillion", "decillion",
+)
+
+_IRREGULAR_ORDINALS = {
+    "one": "first", "two": "second", "three": "third", "five": "fifth",
+    "eight": "eighth", "nine": "ninth", "twelve": "twelfth",
+}
+
+
+def _build_below_thousand() -> Tuple[str, ...]:
+    """Spell out 0-999 once so every three-digit group is a table lookup"""
+    table: List[str] = []
+    for num in range(1000):
+        hundreds, rest = divmod(num, 100)
+        parts = []
+        if hundreds:
+            parts.append(f"{ONES[hundreds]} hundred")
+        if rest >= 20:
+            tens, ones = divmod(rest, 10)
+            parts.append(f"{TENS[tens]} {ONES[ones]}" if ones else TENS[tens])
+        elif rest or not hundreds:
+            parts.append(ONES[rest])
+        table.append(" ".join(parts))
+    return tuple(table)
+
+
+_BELOW_THOUSAND = _build_below_thousand()
+
+# Numbers this large have no scale name, so they are read digit by digit
+_LARGEST_NAMED = 1000 ** len(SCALES)
+
+
+def number_to_words(num: int) -> str:
+    """Convert an integer to words, e.g. 1024 -> 'one thousand twenty four'"""
+    if num < 0:
+        return f"negative {number_to_words(-num)}"
+    if num < 1000:
+        return _BELOW_THOUSAND[num]
+    if num >= _LARGEST_NAMED:
+        return digits_to_words(str(num))
+
+    groups: List[str] = []
+    scale = 0
+    while num:
+        num, chunk = divmod(num, 1000)
+        if chunk:
+            groups.append(f"{_BELOW_THOUSAND[chunk]} {SCALES[scale]}" if scale else _BELOW_THOUSAND[chunk])
+        scale += 1
+    return " ".join(reversed(groups))
+
+
+def ordinal_to_words(num: int) -> str:
+    """Convert an integer to its ordinal form, e.g. 21 -> 'twenty first'
+
+    Raises ValueError for negative numbers, which have no spoken ordinal.
+    """
+    if num < 0:
+        raise ValueError(f"No ordinal for negative number {num}")
+    words = number_to_words(num)
+    head, _, last = words.rpartition(" ")
+    if last in _IRREGULAR_ORDINALS:
+        last = _IRREGULAR_ORDINALS[last]
+    elif last.endswith("y"):
+        last = last[:-1] + "ieth"
+    else:
+        last += "th"
+    return f"{head} {last}" if head else last
+
+
+def digits_to_words(digits: str) -> str:
+    """Read a string of digits one by one, e.g. '05' -> 'zero five'"""
+    return " ".join(ONES[ord(d) - 48] for d in digits)
+
+
+def decimal_to_words(num: Union[int, float], places: int = 2) -> str:
+    """Convert a number to words, reading up to ``places`` decimal digits.
+
+    Trailing zeros are dropped, so 2.5 is 'two point five' and 3.0 is 'three'.
+    Negative numbers that round to zero are read as 'zero'.
+    """
+    text = f"{abs(num):.{places}f}" if places > 0 else str(int(round(abs(num))))
+    integer_part, _, decimal_part = text.partition(".")
+    decimal_part = decimal_part.rstrip("0")
+    words = number_to_words(int(integer_part))
+    if decimal_part:
+        words = f"{words} point {digits_to_words(decimal_part)}"
+    if num < 0 and (int(integer_part) or decimal_part):
+        return f"negative {words}"
+    return words
+
+
+def year_to_words(year: Union[int, str]) -> str:
+    """Convert a year the way it is spoken, e.g. 1999 -> 'nineteen ninety nine'"""
+    text = str(year)
+    if not text.isdigit():
+        return text
+    value = int(text)
+    if len(text) != 4 or not 1100 <= value <= 9999:
+        return number_to_words(value)
+
+    century, rest = divmod(value, 100)
+    if value % 1000 < 10:
+        # 2000 -> "two thousand", 2007 -> "two thousand seven"
+        return number_to_words(value)
+    if rest == 0:
+        return f"{_BELOW_THOUSAND[century]} hundred"
+    if rest < 10:
+        return f"{_BELOW_THOUSAND[century]} oh {ONES[rest]}"
+    return f"{_BELOW_THOUSAND[century]} {_BELOW_THOUSAND[rest]}"
@@ -0,0 +1,333 @@
+"""
+Process-pool offload for Prism AI Voice Assistant
+Runs CPU-bound work in worker processes so request threads never wait on the GIL for it
+"""
+
+import atexit
+import base64
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class OffloadTask(ABC):
+    """A typed unit of CPU-bound work
+
+    Subclasses are frozen dataclasses holding the task's parameters, with
+    a ``kind`` for metrics. ``run`` executes in a worker process (or
+    inline if the pool is unavailable); audio and other large payloads go
+    in its ``data`` argument, which travels through shared memory rather
+    than being pickled with the call.
+    """
+
+    kind = 'task'
+
+    @abstractmethod
+    def run(self, data: Optional[bytes]) -> Any:
+        ...
+
+
+@dataclass(frozen=True)
+class EncodeBase64(OffloadTask):
+    """Base64 of ``data``, as ASCII bytes"""
+
+    kind = 'base64'
+
+    def run(self, data: Optional[bytes]) -> bytes:
+        return base64.b64encode(data or b'')
+
+
+# Worker process side: every shared buffer, mapped once when the worker starts
+_worker_buffers: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def _attach_buffers(names: List[str]) -> None:
+    for name in names:
+        _worker_buffers[name] = shared_memory.SharedMemory(name=name)
+
+
+def _execute(task: OffloadTask, buffer: Optional[str], length: int, data: Optional[bytes]) -> Tuple[bool, Any]:
+    """Run a task in a worker; a bytes result that fits goes back through the task's buffer
+
+    Returns (True, length) when the result was written to the buffer,
+    otherwise (False, result).
+    """
+    if buffer is not None:
+        data = bytes(_worker_buffers[buffer].buf[:length])
+    result = task.run(data)
+    if buffer is not None and isinstance(result, (bytes, bytearray)):
+        block = _worker_buffers[buffer]
+        if len(result) <= block.size:
+            block.buf[:len(result)] = result
+            return True, len(result)
+    return False, result
+
+
+class OffloadService:
+    """Shared process pool for CPU-bound tasks
+
+    ``max_workers`` processes are started on first use in each process, so
+    prefork workers get pools of their own. Each pool process maps
+    ``buffers`` shared-memory blocks of ``buffer_bytes`` at startup. A
+    task's data is copied into a free block and a bytes result comes back
+    through the same block, so neither is pickled. Data too large for a
+    block, or arriving while every block is busy for longer than the
+    task's timeout, is pickled instead.
+
+    If the pool can't be started, or breaks, tasks run in the calling
+    thread.
+    """
+
+    def __init__(self, max_workers: int = 2, buffers: Optional[int] = None,
+                 buffer_bytes: int = 4 * 1024 * 1024, base64_min_bytes: int = 256 * 1024):
+        self.max_workers = max_workers
+        self.buffer_count = buffers or 2 * max_workers
+        self.buffer_bytes = buffer_bytes
+        self.base64_min_bytes = base64_min_bytes
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self._free: 'queue.Queue[str]' = queue.Queue()
+        self._unavailable = False
+        self._in_flight = 0
+        self._waiting_for_buffer = 0
+        self._peak_queue_depth = 0
+        self._counts: Dict[str, Dict[str, float]] = {}
+        self._shared_bytes = 0
+        self._pickled_bytes = 0
+        self._inline = 0
+
+    def run(self, task: OffloadTask, data: Optional[bytes] = None, timeout: Optional[float] = None) -> Any:
+        """Run ``task`` on ``data`` in the pool and return its result
+
+        Raises whatever the task raised, or TimeoutError if it takes longer
+        than ``timeout``.
+        """
+        executor = self._ensure_started()
+        if executor is None:
+            return self._run_inline(task, data)
+        buffer = None
+        if data is not None and len(data) <= self.buffer_bytes:
+            buffer = self._acquire_buffer(timeout)
+        start = time.perf_counter()
+        if buffer is not None and not self._copy_in(buffer, data):
+            # The pool was shut down while this task waited for the buffer
+            buffer = None
+        try:
+            future = executor.submit(_execute, task, buffer, len(data) if data is not None else 0,
+                                     None if buffer is not None else data)
+        except (BrokenProcessPool, RuntimeError) as e:
+            self._release(buffer)
+            self._mark_broken(executor, e)
+            return self._run_inline(task, data)
+        self._track_submitted(data, buffer)
+        future.add_done_callback(self._track_done)
+        try:
+            in_buffer, result = future.result(timeout)
+            if in_buffer:
+                result = self._copy_out(buffer, result)
+                if result is None:
+                    buffer = None
+                    return self._run_inline(task, data)
+        except FutureTimeout:
+            # The worker may still write to the buffer; free it when it's done
+            if buffer is not None:
+                future.add_done_callback(lambda _: self._release(buffer))
+                buffer = None
+            self._record(task.kind, time.perf_counter() - start, failed=True)
+            raise TimeoutError(f"{task.kind} task took longer than {timeout}s")
+        except BrokenProcessPool as e:
+            self._mark_broken(executor, e)
+            self._release(buffer)
+            buffer = None
+            return self._run_inline(task, data)
+        except Exception:
+            self._record(task.kind, time.perf_counter() - start, failed=True)
+            raise
+        finally:
+            if buffer is not None:
+                self._release(buffer)
+        self._record(task.kind, time.perf_counter() - start)
+        return result
+
+    def start(self) -> None:
+        """Start this process's pool in the background so the first task doesn't wait for it"""
+        threading.Thread(target=self._warm, name='prism-offload-start', daemon=True).start()
+
+    def encode_base64(self, data: bytes) -> str:
+        """Base64 text for data, encoded in the pool when it's large enough to matter"""
+        if len(data) < self.base64_min_bytes:
+            return base64.b64encode(data).decode('ascii')
+        return self.run(EncodeBase64(), data).decode('ascii')
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'running': self._executor is not None and self._pid == os.getpid(),
+                'in_flight': self._in_flight,
+                'queue_depth': self._queue_depth(),
+                'peak_queue_depth': self._peak_queue_depth,
+                'buffers_free': self._free.qsize(),
+                'buffers': len(self._blocks),
+                'shared_bytes': self._shared_bytes,
+                'pickled_bytes': self._pickled_bytes,
+                'inline': self._inline,
+                'tasks': {
+                    kind: {
+                        'completed': int(counts['completed']),
+                        'failed': int(counts['failed']),
+                        'avg_ms': round(counts['seconds'] * 1000 / max(1, counts['completed'] + counts['failed']), 1),
+                    }
+                    for kind, counts in self._counts.items()
+                },
+            }
+
+    def shutdown(self) -> None:
+        """Stop the pool and free its shared memory (registered to run at exit)"""
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            executor, self._executor = self._executor, None
+            blocks, self._blocks = self._blocks, {}
+            self._free = queue.Queue()
+            # Tasks still arriving at exit run inline rather than start a new pool
+            self._unavailable = True
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+
+    def _warm(self) -> None:
+        executor = self._ensure_started()
+        if executor is not None:
+            # Process workers start on demand; one per worker gets them all going
+            for future in [executor.submit(time.sleep, 0) for _ in range(self.max_workers)]:
+                future.result()
+
+    def _ensure_started(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._pid != os.getpid():
+                # First use, or first use since this process was forked: the
+                # parent's pool and buffers belong to the parent
+                self._pid = os.getpid()
+                self._executor = None
+                self._blocks = {}
+                self._free = queue.Queue()
+                self._unavailable = False
+            if self._executor is not None:
+                return self._executor
+            if self._unavailable:
+                return None
+            try:
+                if not self._blocks:
+                    for _ in range(self.buffer_count):
+                        block = shared_memory.SharedMemory(create=True, size=self.buffer_bytes)
+                        self._blocks[block.name] = block
+                        self._free.put(block.name)
+                    atexit.register(self.shutdown)
+                methods = multiprocessing.get_all_start_methods()
+                # Forking a process that is already running request threads is unsafe
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=context,
+                    initializer=_attach_buffers, initargs=(list(self._blocks),)
+                )
+                return self._executor
+            except Exception as e:
+                print(f"⚠️  CPU offload pool unavailable; running tasks inline: {e}")
+                self._unavailable = True
+                return None
+
+    def _acquire_buffer(self, timeout: Optional[float]) -> Optional[str]:
+        with self._lock:
+            self._waiting_for_buffer += 1
+            self._peak_queue_depth = max(self._peak_queue_depth, self._queue_depth())
+        try:
+            return self._free.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        finally:
+            with self._lock:
+                self._waiting_for_buffer -= 1
+
+    def _copy_in(self, buffer: str, data: bytes) -> bool:
+        """Write data into a buffer; False if shutdown() has already freed it"""
+        with self._lock:
+            block = self._blocks.get(buffer)
+            if block is None:
+                return False
+            block.buf[:len(data)] = data
+            return True
+
+    def _copy_out(self, buffer: str, length: int) -> Optional[bytes]:
+        """A worker's result from a buffer; None if shutdown() freed it before it was read"""
+        with self._lock:
+            block = self._blocks.get(buffer)
+            return None if block is None else bytes(block.buf[:length])
+
+    def _release(self, buffer: Optional[str]) -> None:
+        if buffer is not None and buffer in self._blocks:
+            self._free.put(buffer)
+
+    def _mark_broken(self, executor: ProcessPoolExecutor, error: Exception) -> None:
+        """Drop a broken pool, keeping its buffers; the next task starts a new one"""
+        print(f"⚠️  CPU offload pool broke ({error}); restarting it")
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run_inline(self, task: OffloadTask, data: Optional[bytes]) -> Any:
+        with self._lock:
+            self._inline += 1
+        start = time.perf_counter()
+        try:
+            result = task.run(data)
+        except Exception:
+            self._record(task.kind, time.perf_counter() - start, failed=True)
+            raise
+        self._record(task.kind, time.perf_counter() - start)
+        return result
+
+    def _queue_depth(self) -> int:
+        """Tasks waiting for a buffer or a free worker; caller holds the lock"""
+        return self._waiting_for_buffer + max(0, self._in_flight - self.max_workers)
+
+    def _track_submitted(self, data: Optional[bytes], buffer: Optional[str]) -> None:
+        with self._lock:
+            self._in_flight += 1
+            self._peak_queue_depth = max(self._peak_queue_depth, self._queue_depth())
+            if data is not None:
+                if buffer is not None:
+                    self._shared_bytes += len(data)
+                else:
+                    self._pickled_bytes += len(data)
+
+    def _track_done(self, future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def _record(self, kind: str, seconds: float, failed: bool = False) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(kind, {'completed': 0, 'failed': 0, 'seconds': 0.0})
+            counts['failed' if failed else 'completed'] += 1
+            counts['seconds'] += seconds
+
+
+offload = OffloadService(
+    max_workers=int(os.getenv('OFFLOAD_WORKERS', '2')),
+    buffer_bytes=int(os.getenv('OFFLOAD_BUFFER_KB', '4096')) * 1024,
+    base64_min_bytes=int(os.getenv('OFFLOAD_BASE64_MIN_KB', '256')) * 1024,
+)
@@ -0,0 +1,319 @@
+"""
+Shared state backends for Prism AI Voice Assistant
+Keeps conversation history, reminders, session settings and caches where every worker process can reach them
+"""
+
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class StateBackend(ABC):
+    """Key-value store for state that must outlive one worker process
+
+    Values are anything JSON can encode. Besides plain keys (optionally
+    with a time-to-live) there are append-only lists and hashes of fields,
+    which is all the assistant needs: conversation history, reminders and
+    per-session settings. ``shared`` is True when other processes see the
+    same data.
+    """
+
+    name = 'base'
+    shared = False
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def append(self, key: str, *values: Any, ttl: Optional[float] = None,
+               max_length: Optional[int] = None) -> int:
+        """Add values to the end of a list; returns its new length
+
+        With ``ttl``, the whole list expires that many seconds after this
+        append. With ``max_length``, only that many of the newest items are
+        kept.
+        """
+
+    @abstractmethod
+    def items(self, key: str) -> List[Any]:
+        ...
+
+    @abstractmethod
+    def length(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    def hset(self, key: str, field: str, value: Any) -> None:
+        ...
+
+    @abstractmethod
+    def hget(self, key: str, field: str) -> Any:
+        ...
+
+    @abstractmethod
+    def hdel(self, key: str, field: str) -> bool:
+        """Remove a field; returns whether it existed"""
+
+    @abstractmethod
+    def hupdate(self, key: str, field: str, update: Callable[[Any], Any]) -> Any:
+        """Atomically replace a field's value with ``update(value)``
+
+        Returns the new value, or None (writing nothing) if the field
+        doesn't exist, so an update racing a delete can't bring it back.
+        ``update`` may be called more than once.
+        """
+
+    @abstractmethod
+    def hgetall(self, key: str) -> Dict[str, Any]:
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        return {'backend': self.name, 'shared': self.shared}
+
+
+class MemoryBackend(StateBackend):
+    """State in this process only; the default for a single worker
+
+    Values are stored JSON-encoded, like the networked backend, so callers
+    never share mutable objects and anything that works here also
+    round-trips through Redis.
+    """
+
+    name = 'memory'
+
+    # Expired lists nobody reads again are swept this often
+    SWEEP_INTERVAL = 60.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, Tuple[str, Optional[float]]] = {}
+        self._lists: Dict[str, List[str]] = {}
+        self._list_expiry: Dict[str, float] = {}
+        self._hashes: Dict[str, Dict[str, str]] = {}
+        self._next_sweep = time.monotonic() + self.SWEEP_INTERVAL
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            encoded, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._values[key]
+                return None
+            return json.loads(encoded)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        encoded = json.dumps(value)
+        with self._lock:
+            self._values[key] = (encoded, expires_at)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+            self._lists.pop(key, None)
+            self._list_expiry.pop(key, None)
+            self._hashes.pop(key, None)
+
+    def append(self, key: str, *values: Any, ttl: Optional[float] = None,
+               max_length: Optional[int] = None) -> int:
+        encoded = [json.dumps(value) for value in values]
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep_locked(now)
+            items = self._live_list_locked(key, now)
+            if items is None:
+                items = self._lists[key] = []
+            items.extend(encoded)
+            if max_length is not None and len(items) > max_length:
+                del items[:len(items) - max_length]
+            if ttl:
+                self._list_expiry[key] = now + ttl
+            return len(items)
+
+    def items(self, key: str) -> List[Any]:
+        with self._lock:
+            encoded = list(self._live_list_locked(key, time.monotonic()) or ())
+        return [json.loads(item) for item in encoded]
+
+    def length(self, key: str) -> int:
+        with self._lock:
+            return len(self._live_list_locked(key, time.monotonic()) or ())
+
+    def _live_list_locked(self, key: str, now: float) -> Optional[List[str]]:
+        """The list at key unless it has expired (then it is dropped); the caller holds the lock"""
+        expires_at = self._list_expiry.get(key)
+        if expires_at is not None and expires_at <= now:
+            del self._list_expiry[key]
+            self._lists.pop(key, None)
+            return None
+        return self._lists.get(key)
+
+    def _sweep_locked(self, now: float) -> None:
+        for key in [key for key, expires_at in self._list_expiry.items() if expires_at <= now]:
+            self._live_list_locked(key, now)
+        self._next_sweep = now + self.SWEEP_INTERVAL
+
+    def hset(self, key: str, field: str, value: Any) -> None:
+        encoded = json.dumps(value)
+        with self._lock:
+            self._hashes.setdefault(key, {})[field] = encoded
+
+    def hget(self, key: str, field: str) -> Any:
+        with self._lock:
+            encoded = self._hashes.get(key, {}).get(field)
+        return json.loads(encoded) if encoded is not None else None
+
+    def hdel(self, key: str, field: str) -> bool:
+        with self._lock:
+            return self._hashes.get(key, {}).pop(field, None) is not None
+
+    def hupdate(self, key: str, field: str, update: Callable[[Any], Any]) -> Any:
+        with self._lock:
+            fields = self._hashes.get(key, {})
+            encoded = fields.get(field)
+            if encoded is None:
+                return None
+            value = update(json.loads(encoded))
+            fields[field] = json.dumps(value)
+            return value
+
+    def hgetall(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            encoded = dict(self._hashes.get(key, {}))
+        return {field: json.loads(value) for field, value in encoded.items()}
+
+
+class RedisBackend(StateBackend):
+    """State in Redis (or anything speaking its protocol), shared by every worker
+
+    Keys are prefixed with ``namespace`` so several deployments can share
+    one server. Pass ``client`` to use an existing connection or a
+    stand-in such as fakeredis; otherwise one is opened from ``url``
+    (pip install redis).
+    """
+
+    name = 'redis'
+    shared = True
+
+    def __init__(self, url: str = 'redis://localhost:6379/0', namespace: str = 'prism:', client: Any = None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url, socket_timeout=2.0, socket_connect_timeout=2.0)
+        self.client = client
+        self.url = url
+        self.namespace = namespace
+
+    def get(self, key: str) -> Any:
+        return self._decode(self.client.get(self._key(key)))
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        px = max(1, int(ttl * 1000)) if ttl else None
+        self.client.set(self._key(key), json.dumps(value), px=px)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self._key(key))
+
+    def append(self, key: str, *values: Any, ttl: Optional[float] = None,
+               max_length: Optional[int] = None) -> int:
+        if not values:
+            return self.length(key)
+        if not ttl and max_length is None:
+            return self.client.rpush(self._key(key), *(json.dumps(value) for value in values))
+        with self.client.pipeline() as pipe:
+            pipe.rpush(self._key(key), *(json.dumps(value) for value in values))
+            if max_length is not None:
+                pipe.ltrim(self._key(key), -max_length, -1)
+            if ttl:
+                pipe.pexpire(self._key(key), max(1, int(ttl * 1000)))
+            length = pipe.execute()[0]
+        return length if max_length is None else min(length, max_length)
+
+    def items(self, key: str) -> List[Any]:
+        return [self._decode(item) for item in self.client.lrange(self._key(key), 0, -1)]
+
+    def length(self, key: str) -> int:
+        return self.client.llen(self._key(key))
+
+    def hset(self, key: str, field: str, value: Any) -> None:
+        self.client.hset(self._key(key), field, json.dumps(value))
+
+    def hget(self, key: str, field: str) -> Any:
+        return self._decode(self.client.hget(self._key(key), field))
+
+    def hdel(self, key: str, field: str) -> bool:
+        return bool(self.client.hdel(self._key(key), field))
+
+    def hupdate(self, key: str, field: str, update: Callable[[Any], Any]) -> Any:
+        from redis.exceptions import WatchError
+
+        name = self._key(key)
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    # Optimistic transaction: retried if the hash changes before EXEC
+                    pipe.watch(name)
+                    current = self._decode(pipe.hget(name, field))
+                    if current is None:
+                        pipe.unwatch()
+                        return None
+                    value = update(current)
+                    pipe.multi()
+                    pipe.hset(name, field, json.dumps(value))
+                    pipe.execute()
+                    return value
+                except WatchError:
+                    continue
+
+    def hgetall(self, key: str) -> Dict[str, Any]:
+        return {
+            field.decode('utf-8') if isinstance(field, bytes) else field: self._decode(value)
+            for field, value in self.client.hgetall(self._key(key)).items()
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), 'namespace': self.namespace}
+
+    def _key(self, key: str) -> str:
+        return self.namespace + key
+
+    @staticmethod
+    def _decode(value: Any) -> Any:
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            value = value.decode('utf-8')
+        return json.loads(value)
+
+
+def load_state_backend() -> StateBackend:
+    """The backend named by STATE_BACKEND ('memory' or 'redis')"""
+    backend = os.getenv('STATE_BACKEND', 'memory').lower()
+    if backend == 'redis':
+        url = os.getenv('STATE_REDIS_URL', 'redis://localhost:6379/0')
+        try:
+            return RedisBackend(url, namespace=os.getenv('STATE_NAMESPACE', 'prism:'))
+        except ImportError:
+            print("⚠️  STATE_BACKEND=redis but the redis package is not installed; "
+                  "state stays in this process (pip install redis)")
+    elif backend != 'memory':
+        print(f"⚠️  Unknown STATE_BACKEND '{backend}'; state stays in this process")
+    return MemoryBackend()
+
+
+state_store = load_state_backend()
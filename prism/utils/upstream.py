@@ -0,0 +1,291 @@
+"""
+Upstream call helpers for Prism AI Voice Assistant
+Per-feature latency SLOs, request deadlines and hedged calls to external APIs
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, TypeVar
+
+from .cancellation import CancelToken, Cancelled
+from .circuit_breaker import BreakerRegistry, CircuitOpenError, breakers as default_breakers
+
+T = TypeVar('T')
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when an upstream call runs out of time budget"""
+
+
+class Deadline:
+    """A point in time a request must finish by"""
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+@dataclass
+class LatencySLO:
+    """Latency target for one upstream feature
+
+    ``billed`` marks APIs charged per request. Their calls are only hedged
+    when the caller can release the losing attempt (``discard``), since an
+    attempt that can't be stopped runs to completion and is paid for.
+    """
+    deadline_ms: float
+    hedge: bool = True
+    hedge_percentile: float = 0.95
+    min_hedge_delay_ms: float = 100
+    billed: bool = False
+
+
+# Defaults, overridable with SLO_<FEATURE>_MS and SLO_<FEATURE>_HEDGE.
+# A hedge on a billed feature is a second paid request: streamed LLM replies
+# and streamed speech are closed when they lose (billed up to that point), and
+# non-streamed LLM and TTS calls are never hedged.
+DEFAULT_SLOS = {
+    'llm': LatencySLO(deadline_ms=8000, billed=True),
+    'tts': LatencySLO(deadline_ms=6000, billed=True),
+    'stt': LatencySLO(deadline_ms=8000, hedge=False),
+    'weather': LatencySLO(deadline_ms=3000),
+    'news': LatencySLO(deadline_ms=3000),
+}
+
+# Latency samples needed before the hedge delay follows the observed p95
+MIN_SAMPLES = 20
+
+
+def load_slos() -> Dict[str, LatencySLO]:
+    """Default SLOs with any overrides from the environment applied"""
+    slos = {}
+    for feature, default in DEFAULT_SLOS.items():
+        prefix = f"SLO_{feature.upper()}"
+        slos[feature] = LatencySLO(
+            deadline_ms=float(os.getenv(f"{prefix}_MS", default.deadline_ms)),
+            hedge=os.getenv(f"{prefix}_HEDGE", str(default.hedge)).lower() in ('1', 'true', 'yes'),
+            hedge_percentile=default.hedge_percentile,
+            min_hedge_delay_ms=default.min_hedge_delay_ms,
+            billed=default.billed,
+        )
+    return slos
+
+
+class _FeatureStats:
+    """Recent latencies and call outcomes for one feature"""
+
+    def __init__(self, window: int):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.deadline_misses = 0
+        self.errors = 0
+        self.cancelled = 0
+
+    def percentile(self, q: float) -> Optional[float]:
+        if len(self.latencies) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class UpstreamCaller:
+    """Runs upstream calls under a deadline, hedging slow ones
+
+    ``fn`` receives the seconds left in the budget and should pass them on
+    as its own network timeout. If it hasn't answered after the feature's
+    recent p95 latency, an identical hedge request is sent and whichever
+    finishes first wins. The loser is cancelled if it hasn't started, and
+    otherwise handed to ``discard`` (e.g. to close a stream) when it ends.
+    Without ``discard`` a started loser runs to completion and holds a pool
+    thread meanwhile, so calls to billed features are hedged only when
+    ``discard`` is given; each hedge of those doubles the spend of the call.
+
+    Every call also goes through the feature's circuit breaker. Errors,
+    deadline misses and results ``is_failure`` rejects count as failures,
+    but a call whose deadline passed before it could start doesn't count
+    against the upstream. While the breaker is open, calls use ``fallback`` (or raise
+    CircuitOpenError) without touching the network.
+    """
+
+    def __init__(self, slos: Optional[Dict[str, LatencySLO]] = None,
+                 max_workers: int = 32, window: int = 200,
+                 breakers: Optional[BreakerRegistry] = None):
+        self._slos = slos
+        self.breakers = breakers or default_breakers
+        self._window = window
+        self._stats: Dict[str, _FeatureStats] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prism-upstream')
+
+    def slo(self, feature: str) -> LatencySLO:
+        if self._slos is None:
+            # Read lazily so .env files loaded after import still apply
+            self._slos = load_slos()
+        return self._slos.get(feature) or LatencySLO(deadline_ms=10000, hedge=False)
+
+    def deadline(self, feature: str) -> Deadline:
+        """A fresh deadline from the feature's SLO"""
+        return Deadline(self.slo(feature).deadline_ms / 1000)
+
+    def expected_latency(self, feature: str) -> Optional[float]:
+        """Recent p95 latency in seconds, or None until enough calls are seen"""
+        return self._feature_stats(feature).percentile(self.slo(feature).hedge_percentile)
+
+    def call(self, feature: str, fn: Callable[[float], T], deadline: Optional[Deadline] = None,
+             fallback: Optional[Callable[[], T]] = None,
+             discard: Optional[Callable[[T], Any]] = None,
+             is_failure: Optional[Callable[[T], bool]] = None,
+             cancel: Optional[CancelToken] = None) -> T:
+        """Call ``fn`` within the deadline, using ``fallback`` if the budget runs out or the breaker is open
+
+        If ``cancel`` fires first, Cancelled is raised at once. Attempts still
+        in flight are released through ``discard`` when they finish, and the
+        outcome doesn't count for or against the breaker.
+        """
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+        slo = self.slo(feature)
+        stats = self._feature_stats(feature)
+        breaker = self.breakers.get(feature)
+        if not breaker.allow():
+            if fallback is not None:
+                return fallback()
+            raise CircuitOpenError(f"{feature} circuit is open")
+        deadline = deadline or self.deadline(feature)
+        with self._lock:
+            stats.calls += 1
+
+        hedge_delay = None
+        # A billed attempt that can't be released would be paid for twice
+        if slo.hedge and (discard is not None or not slo.billed):
+            expected = stats.percentile(slo.hedge_percentile)
+            if expected is not None:
+                hedge_delay = max(expected, slo.min_hedge_delay_ms / 1000)
+
+        # Completed by the cancel token so the wait below wakes immediately
+        cancel_signal: Future = Future()
+        unregister = cancel.on_cancel(lambda: cancel_signal.set_result(None)) if cancel is not None else None
+
+        start = time.monotonic()
+        futures: List[Future] = []
+        if not deadline.expired:
+            futures.append(self._executor.submit(self._timed, stats, fn, deadline.remaining()))
+        pending = set(futures)
+        winner: Optional[Future] = None
+        error: Optional[BaseException] = None
+
+        while pending and winner is None and not deadline.expired and not cancel_signal.done():
+            timeout = deadline.remaining()
+            can_hedge = hedge_delay is not None and len(futures) == 1
+            if can_hedge:
+                timeout = min(timeout, max(0.0, start + hedge_delay - time.monotonic()))
+            done, _ = wait(pending | {cancel_signal}, timeout=timeout, return_when=FIRST_COMPLETED)
+            done.discard(cancel_signal)
+            pending -= done
+            for future in done:
+                if future.exception() is None:
+                    winner = future
+                    break
+                error = future.exception()
+            if winner is None and can_hedge and pending and not deadline.expired \
+                    and time.monotonic() - start >= hedge_delay:
+                futures.append(self._executor.submit(self._timed, stats, fn, deadline.remaining()))
+                pending.add(futures[-1])
+                with self._lock:
+                    stats.hedged += 1
+
+        if unregister is not None:
+            unregister()
+        if cancel_signal.done():
+            winner = None
+        for future in futures:
+            if future is not winner and not future.cancel() and discard is not None:
+                future.add_done_callback(lambda f: self._discard(f, discard))
+
+        if cancel_signal.done():
+            breaker.record_cancelled()
+            with self._lock:
+                stats.cancelled += 1
+            raise Cancelled(f"{feature} call cancelled")
+        if winner is not None:
+            result = winner.result()
+            if is_failure is not None and is_failure(result):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if winner is not futures[0]:
+                with self._lock:
+                    stats.hedge_wins += 1
+            return result
+        if futures:
+            breaker.record_failure()
+        else:
+            # The budget was spent before any attempt; that says nothing about the upstream
+            breaker.record_cancelled()
+        if error is not None and not pending:
+            with self._lock:
+                stats.errors += 1
+            raise error
+        with self._lock:
+            stats.deadline_misses += 1
+        if fallback is not None:
+            return fallback()
+        raise DeadlineExceeded(f"{feature} call exceeded its {slo.deadline_ms:.0f} ms budget")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        report = {}
+        with self._lock:
+            features = dict(self._stats)
+        for feature, stats in features.items():
+            p50, p95 = stats.percentile(0.5), stats.percentile(0.95)
+            report[feature] = {
+                'calls': stats.calls,
+                'hedged': stats.hedged,
+                'hedge_wins': stats.hedge_wins,
+                'deadline_misses': stats.deadline_misses,
+                'errors': stats.errors,
+                'cancelled': stats.cancelled,
+                'deadline_ms': self.slo(feature).deadline_ms,
+                'p50_ms': round(p50 * 1000, 1) if p50 is not None else None,
+                'p95_ms': round(p95 * 1000, 1) if p95 is not None else None,
+            }
+        return report
+
+    def _feature_stats(self, feature: str) -> _FeatureStats:
+        with self._lock:
+            stats = self._stats.get(feature)
+            if stats is None:
+                stats = self._stats[feature] = _FeatureStats(self._window)
+            return stats
+
+    def _timed(self, stats: _FeatureStats, fn: Callable[[float], T], timeout: float) -> T:
+        """Run one attempt, recording its latency if it succeeds"""
+        start = time.monotonic()
+        result = fn(timeout)
+        with self._lock:
+            stats.latencies.append(time.monotonic() - start)
+        return result
+
+    @staticmethod
+    def _discard(future: Future, discard: Callable[[Any], Any]) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        try:
+            discard(future.result())
+        except Exception as e:
+            print(f"⚠️  Could not release hedged upstream call: {e}")
+
+
+upstream = UpstreamCaller()
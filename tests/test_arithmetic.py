@@ -0,0 +1,65 @@
+"""
+Unit tests for spoken numbers and batch evaluation in the arithmetic engine
+"""
+
+import pytest
+
+from prism.features.arithmetic import MIN_VECTOR_GROUP, ExpressionError, evaluate, evaluate_batch
+
+# Each template is filled with several numbers so its group takes the vectorized path
+TEMPLATES = [
+    "{a} plus {b}",
+    "{a} times {b}",
+    "{a} divided by {b}",
+    "{a} // {b}",
+    "{a} ^ {b}",
+    "{a} ^ -{b}",
+    "1{a}.14 ^ {b}.85",
+    "{a}.5 times {b}",
+    "{a} percent of {b}",
+    "{a} squared minus {b}",
+    "-{a} times {b}000000000",
+    "3^35 + {a} - 3^35",
+    "({a} + {b}) * 2.0",
+]
+
+
+def _scalar(text):
+    try:
+        return evaluate(text)
+    except Exception as e:
+        return type(e)
+
+
+@pytest.mark.parametrize("template", TEMPLATES)
+def test_batch_matches_scalar(template):
+    texts = [template.format(a=a, b=b) for a in range(0, 4) for b in range(0, 4)]
+    assert len(texts) >= MIN_VECTOR_GROUP
+    for text, result in zip(texts, evaluate_batch(texts)):
+        expected = _scalar(text)
+        if isinstance(result, Exception):
+            assert type(result) is expected, text
+        else:
+            assert result == expected and type(result) is type(expected), text
+
+
+def test_large_intermediate_stays_exact():
+    results = evaluate_batch(["3^35 + 1 - 3^35"] * MIN_VECTOR_GROUP)
+    assert results == [1] * MIN_VECTOR_GROUP
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("twenty five", 25),
+    ("one hundred five", 105),
+    ("one hundred and five", 105),
+    ("two thousand and twelve", 2012),
+    ("five and three", 8),
+])
+def test_number_words(text, expected):
+    assert evaluate(text) == expected
+
+
+@pytest.mark.parametrize("text", ["one two", "five twenty", "twenty twenty", "twenty twelve"])
+def test_adjacent_numbers_are_not_summed(text):
+    with pytest.raises(ExpressionError):
+        evaluate(text)
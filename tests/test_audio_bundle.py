@@ -0,0 +1,33 @@
+"""
+Unit tests for pre-synthesized audio bundles
+"""
+
+import threading
+
+from prism.core.audio_bundle import AudioBundleSet
+from prism.core.audio_formats import DEFAULT_FORMAT
+
+
+def test_warm_builds_bundle_without_deadlock(tmp_path):
+    texts = ['Why did the chicken cross the road?', 'To get to the other side.']
+    calls = []
+
+    def synthesize(text, fmt):
+        calls.append(text)
+        return f"audio:{text}".encode('utf-8')
+
+    bundles = AudioBundleSet(str(tmp_path), lambda: texts, synthesize)
+    # warm() used to hang taking a lock it already held; run it where a hang can be detected
+    warmer = threading.Thread(target=bundles.warm, daemon=True)
+    warmer.start()
+    warmer.join(10)
+    assert not warmer.is_alive()
+    assert bundles.wait(10)
+
+    assert sorted(calls) == sorted(texts)
+    assert bundles.lookup(texts[0], DEFAULT_FORMAT) == f"audio:{texts[0]}".encode('utf-8')
+
+    # A second warm in the same process doesn't rebuild
+    bundles.warm()
+    assert bundles.wait(10)
+    assert len(calls) == len(texts)
@@ -0,0 +1,41 @@
+"""
+Unit tests for audio sniffing and silence trimming
+"""
+
+import numpy as np
+
+from prism.core.audio_ingest import TARGET_SAMPLE_RATE, sniff_container, speech_bounds
+
+
+def _tone(seconds, amplitude, rng):
+    t = np.arange(int(seconds * TARGET_SAMPLE_RATE)) / TARGET_SAMPLE_RATE
+    return amplitude * np.sin(2 * np.pi * 220 * t) + rng.normal(0, 300, len(t))
+
+
+def test_sniff_mp3_and_adts():
+    assert sniff_container(b'ID3\x04\x00') == 'mp3'
+    assert sniff_container(b'\xff\xfb\x90\x00') == 'mp3'  # MPEG-1 layer III
+    assert sniff_container(b'\xff\xf1\x50\x80') == 'aac'  # ADTS, MPEG-4
+    assert sniff_container(b'\xff\xf9\x50\x80') == 'aac'  # ADTS, MPEG-2
+    assert sniff_container(b'\x00\x00\x00\x00') is None
+
+
+def test_quiet_leading_speech_is_kept():
+    rng = np.random.default_rng(0)
+    # Noisy room, a quiet word from 0.6 s, then loud speech from 1.5 s
+    samples = np.concatenate([
+        _tone(0.6, 0, rng),
+        _tone(0.3, 700, rng),
+        _tone(0.6, 0, rng),
+        _tone(1.0, 8000, rng),
+        _tone(1.5, 0, rng),
+    ])
+    pcm = np.clip(samples, -32768, 32767).astype('<i2').tobytes()
+    start, end = speech_bounds(pcm)
+    assert start <= int(0.6 * TARGET_SAMPLE_RATE) * 2
+    assert end < len(pcm)
+
+
+def test_silence_only_is_kept_whole():
+    pcm = np.zeros(TARGET_SAMPLE_RATE, dtype='<i2').tobytes()
+    assert speech_bounds(pcm) == (0, len(pcm))
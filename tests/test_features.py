@@ -64,6 +64,28 @@ def test_chat_functionality():
         else:
             print("   ❌ Chat failed")
 
+def test_streaming_chat():
+    """Test the Server-Sent Events chat stream"""
+    print("\n📡 Testing Streaming Chat")
+    print("=" * 50)
+    
+    try:
+        response = requests.post(f"{BASE_URL}/api/chat",
+                                 json={"message": "Who are you?", "stream": True},
+                                 headers={'Accept': 'text/event-stream'},
+                                 stream=True)
+        print(f"✅ POST /api/chat (stream) - Status: {response.status_code}")
+        deltas = 0
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith('data: '):
+                deltas += 1
+            if line.startswith('event: done'):
+                print(f"   ✅ Stream completed after {deltas} events")
+                return
+        print("   ❌ Stream ended without a done event")
+    except Exception as e:
+        print(f"❌ POST /api/chat (stream) - Error: {e}")
+
 def test_weather_api():
     """Test weather API endpoints"""
     print("\n🌤️ Testing Weather API")
@@ -109,6 +131,14 @@ def test_calculator_api():
         print(f"\n📝 Testing: '{expr}'")
         test_api_endpoint("/api/calculate", method="POST", data={"expression": expr})
 
+def test_batch_calculator_api():
+    """Test batch calculator API endpoint"""
+    print("\n🧮 Testing Batch Calculator API")
+    print("=" * 50)
+    
+    expressions = [f"{i} times 12" for i in range(1, 51)] + ["10 / 0", "twenty five plus 5"]
+    test_api_endpoint("/api/calculate/batch", method="POST", data={"expressions": expressions})
+
 def test_entertainment_apis():
     """Test entertainment API endpoints"""
     print("\n😄 Testing Entertainment APIs")
@@ -149,6 +179,24 @@ def test_text_to_speech():
     test_text = "Hello! This is a test of the text-to-speech functionality."
     test_api_endpoint("/api/text-to-speech", method="POST", data={"text": test_text})
 
+def test_streaming_text_to_speech():
+    """Test the chunked audio/mpeg text-to-speech stream"""
+    print("\n🎧 Testing Streaming Text-to-Speech")
+    print("=" * 50)
+    
+    try:
+        response = requests.get(f"{BASE_URL}/api/text-to-speech/stream",
+                                params={"text": "Hello! This is a streaming speech test."},
+                                stream=True)
+        print(f"✅ GET /api/text-to-speech/stream - Status: {response.status_code}")
+        if response.headers.get('Content-Type', '').startswith('audio/mpeg'):
+            chunks = sum(1 for chunk in response.iter_content(chunk_size=4096) if chunk)
+            print(f"   ✅ Received {chunks} audio chunks")
+        else:
+            print(f"   ⚠️  No audio: {response.text[:200]}")
+    except Exception as e:
+        print(f"❌ GET /api/text-to-speech/stream - Error: {e}")
+
 def main():
     """Run all feature tests"""
     print("🚀 Prism AI Voice Assistant - Feature Tests")
@@ -158,13 +206,16 @@ def main():
     
     # Test all features
     test_chat_functionality()
+    test_streaming_chat()
     test_weather_api()
     test_news_api()
     test_time_api()
     test_calculator_api()
+    test_batch_calculator_api()
     test_entertainment_apis()
     test_reminder_apis()
     test_text_to_speech()
+    test_streaming_text_to_speech()
     
     print("\n" + "=" * 60)
     print("🎉 Feature testing completed!")
@@ -0,0 +1,38 @@
+"""
+Unit tests for the shared number verbalizer
+"""
+
+import pytest
+
+from prism.utils.number_words import decimal_to_words, number_to_words, ordinal_to_words
+
+
+def test_number_to_words():
+    assert number_to_words(0) == "zero"
+    assert number_to_words(1024) == "one thousand twenty four"
+    assert number_to_words(-15) == "negative fifteen"
+
+
+def test_decimal_to_words():
+    assert decimal_to_words(2.5) == "two point five"
+    assert decimal_to_words(3.0) == "three"
+    assert decimal_to_words(-2.25) == "negative two point two five"
+
+
+def test_negative_rounding_to_zero_has_no_sign():
+    assert decimal_to_words(-0.001) == "zero"
+    assert decimal_to_words(-0.0) == "zero"
+    assert decimal_to_words(-0.4, places=0) == "zero"
+    assert decimal_to_words(-0.005, places=3) == "negative zero point zero zero five"
+
+
+def test_ordinal_to_words():
+    assert ordinal_to_words(1) == "first"
+    assert ordinal_to_words(21) == "twenty first"
+    assert ordinal_to_words(40) == "fortieth"
+    assert ordinal_to_words(0) == "zeroth"
+
+
+def test_ordinal_rejects_negatives():
+    with pytest.raises(ValueError):
+        ordinal_to_words(-3)
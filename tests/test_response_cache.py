@@ -0,0 +1,26 @@
+"""
+Unit tests for which turns the LLM response cache may serve
+"""
+
+from prism.core.response_cache import ResponseCache
+
+
+def test_only_stateless_intents_are_cached_by_default():
+    cache = ResponseCache()
+    assert cache.key_for("Who are you?", has_history=False) is not None
+    assert cache.key_for("Hello there", has_history=True) is not None
+    # Open-ended first turns would be shared by every user
+    assert cache.key_for("what should I cook tonight", has_history=False) is None
+    assert cache.key_for("what should I cook tonight", has_history=True) is None
+
+
+def test_first_turn_caching_is_opt_in():
+    cache = ResponseCache(cache_first_turns=True)
+    assert cache.key_for("what should I cook tonight", has_history=False) is not None
+    assert cache.key_for("what should I cook tonight", has_history=True) is None
+
+
+def test_disabled_intents_are_not_cached():
+    cache = ResponseCache(disabled_intents=['identity'])
+    assert cache.key_for("who are you", has_history=False) is None
+    assert cache.key_for("hello", has_history=False) is not None
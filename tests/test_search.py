@@ -0,0 +1,54 @@
+"""
+Unit tests for the search service and its index
+"""
+
+import random
+
+from prism.features.search import SearchService
+from prism.features.search_index import SearchIndex
+
+
+def test_known_topics_are_found():
+    service = SearchService()
+    assert service.search_web("search python").startswith("Here's what I found about 'python'")
+    assert "Machine Learning is" in service.search_web("tell me about machine learning")
+
+
+def test_words_only_in_answer_text_fall_back():
+    service = SearchService()
+    # "used" and "time" appear in the calculator and weather answers, not their topics
+    for query in ("search used cars", "search time travel"):
+        assert service.search_web(query).startswith("I found several results about")
+
+
+def test_common_terms_scan_only_champions():
+    rng = random.Random(3)
+    capped = SearchIndex(max_scan=50)
+    full = SearchIndex(max_scan=None)
+    for i in range(2000):
+        text = " ".join(["common"] * rng.randint(1, 4) + ["filler"] * rng.randint(0, 20))
+        capped.add(f"topic{i}", text)
+        full.add(f"topic{i}", text)
+    capped.remove("topic0")
+    full.remove("topic0")
+    assert [hit.keyword for hit in capped.search("common", 5)] == [hit.keyword for hit in full.search("common", 5)]
+
+
+def test_typos_are_tolerated():
+    service = SearchService()
+    assert "Python is" in service.search_web("search pyton")
+    assert "Flask is" in service.search_web("what is flas k")
+
+
+def test_near_miss_words_do_not_match():
+    service = SearchService()
+    # "meaning" is two edits from "learning" and "life" one from "like"
+    assert service.search("meaning") == []
+    assert service.search_web("what is the meaning of life").startswith("I found several results about")
+
+
+def test_fuzzy_match_scores_below_exact():
+    index = SearchIndex()
+    index.add("flask", "Flask is a web framework")
+    exact = index.search("flask")[0].score
+    assert 0 < index.search("flsk")[0].score < exact
@@ -0,0 +1,37 @@
+"""
+Unit tests for speculative replies made from partial transcripts
+"""
+
+from prism.core.assistant import PreparedReply, PrismAssistant
+from prism.core.speculation import Speculator
+from prism.utils.state import MemoryBackend
+
+
+def _turn():
+    """A speculative turn whose prepared result is the partial it was made from"""
+    speculator = Speculator(threshold=0.8)
+    return speculator, speculator.begin(lambda transcript, cancelled: transcript)
+
+
+def test_partial_differing_only_in_an_operator_is_a_miss():
+    speculator, turn = _turn()
+    turn.observe("what is 5 - 3", 0.9)
+    assert turn.resolve("what is 5 + 3") is None
+    assert speculator.stats()['misses'] == 1
+
+
+def test_partial_differing_in_case_and_spacing_is_a_hit():
+    speculator, turn = _turn()
+    turn.observe("what  is 5 - 3", 0.9)
+    assert turn.resolve("What is 5 - 3") == "what  is 5 - 3"
+    assert speculator.stats()['hits'] == 1
+
+
+def test_prepared_reply_answers_and_records_the_final_transcript():
+    assistant = PrismAssistant(store=MemoryBackend())
+    reply = PreparedReply("what is 5 - 3", [('calculator', "what is 5 - 3")], None, (0, None), 'session')
+    assert assistant.use_prepared_reply(reply, "what is 5 + 3") == "The answer is eight."
+
+    reply = PreparedReply("hi there", [], "Hello!", (0, None), 'session')
+    assert assistant.use_prepared_reply(reply, "Hi there.") == "Hello!"
+    assert assistant.conversation_history('session')[0] == {'role': 'user', 'content': "Hi there."}
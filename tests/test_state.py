@@ -0,0 +1,98 @@
+"""
+Unit tests for the state backends, in-process and Redis (through fakeredis)
+
+Each test writes through one backend and reads through another; for Redis
+they are two clients of one server, standing in for two worker processes.
+"""
+
+import time
+import uuid
+
+import pytest
+
+from prism.core.assistant import PrismAssistant
+from prism.features.reminders import ReminderService
+from prism.utils.state import MemoryBackend, RedisBackend
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def backends(request):
+    """A (writer, reader) pair of backends sharing one store"""
+    if request.param == 'memory':
+        memory = MemoryBackend()
+        return memory, memory
+    fakeredis = pytest.importorskip('fakeredis')
+    server = fakeredis.FakeServer()
+    namespace = f"prism-test-{uuid.uuid4().hex[:8]}:"
+    return tuple(RedisBackend(namespace=namespace, client=fakeredis.FakeRedis(server=server)) for _ in range(2))
+
+
+def test_keys(backends):
+    writer, reader = backends
+    writer.set('greeting', {'text': 'hello', 'tokens': 3})
+    assert reader.get('greeting') == {'text': 'hello', 'tokens': 3}
+    assert reader.get('absent') is None
+    writer.set('short-lived', 'soon gone', ttl=0.05)
+    time.sleep(0.1)
+    assert reader.get('short-lived') is None
+    writer.delete('greeting')
+    assert reader.get('greeting') is None
+
+
+def test_lists(backends):
+    writer, reader = backends
+    assert writer.append('history', {'role': 'user', 'content': 'hi'}) == 1
+    writer.append('history', {'role': 'assistant', 'content': 'hello'}, {'role': 'user', 'content': 'bye'})
+    assert reader.length('history') == 3
+    assert [m['content'] for m in reader.items('history')] == ['hi', 'hello', 'bye']
+
+    assert writer.append('capped', 1, 2, 3, max_length=2) == 2
+    writer.append('capped', 4, max_length=2, ttl=60)
+    assert reader.items('capped') == [3, 4]
+
+    writer.append('short-history', 'hi', ttl=0.05)
+    time.sleep(0.1)
+    assert (reader.items('short-history'), reader.length('short-history')) == ([], 0)
+
+
+def test_hashes(backends):
+    writer, reader = backends
+    writer.hset('settings', 'sid-1', 'opus_32')
+    writer.hset('settings', 'sid-2', 'mp3_64')
+    assert reader.hget('settings', 'sid-1') == 'opus_32'
+    assert reader.hgetall('settings') == {'sid-1': 'opus_32', 'sid-2': 'mp3_64'}
+    assert reader.hdel('settings', 'sid-1') is True
+    assert reader.hdel('settings', 'sid-1') is False
+    assert writer.hupdate('settings', 'sid-2', lambda value: value.upper()) == 'MP3_64'
+    assert reader.hget('settings', 'sid-2') == 'MP3_64'
+    # An update racing a delete must not bring the field back
+    assert writer.hupdate('settings', 'sid-1', lambda value: 'back') is None
+    assert reader.hget('settings', 'sid-1') is None
+
+
+def test_reminders_are_shared(backends):
+    writer, reader = backends
+    added = ReminderService(writer).add_reminder('Call mom', 'tomorrow at 3pm')
+    other = ReminderService(reader)
+    assert [r.title for r in other.get_reminders()] == ['Call mom']
+    assert other.complete_reminder(added.id) is True
+    assert ReminderService(writer).get_reminders() == []
+    other.delete_reminder(added.id)
+    assert ReminderService(writer).complete_reminder(added.id) is False
+    assert ReminderService(reader).get_reminders(include_completed=True) == []
+
+
+def test_sessions_keep_their_own_capped_history(backends):
+    writer, reader = backends
+    first, second = PrismAssistant(writer), PrismAssistant(reader)
+    first._record('alice', {'role': 'user', 'content': 'hi from alice'})
+    assert second.conversation_history('alice') == [{'role': 'user', 'content': 'hi from alice'}]
+    assert second.conversation_history('bob') == []
+    second.end_session('alice')
+    assert first.conversation_history('alice') == []
+
+    first.context_builder.max_messages = 4
+    for turn in range(3):
+        first._record_cached_turn('carol', f"question {turn}", f"answer {turn}")
+    assert [m['content'] for m in second.conversation_history('carol')] == \
+        ['question 1', 'answer 1', 'question 2', 'answer 2']
@@ -0,0 +1,72 @@
+"""
+Unit tests for upstream calls: hedging of billed requests and deadline accounting
+"""
+
+import threading
+import time
+
+import pytest
+
+from prism.core import tts
+from prism.utils.circuit_breaker import BreakerRegistry
+from prism.utils.upstream import MIN_SAMPLES, Deadline, DeadlineExceeded, LatencySLO, UpstreamCaller
+
+
+class _Response:
+    status_code = 200
+    content = b'audio'
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _primed_caller():
+    """A caller whose TTS p95 is known, so a slow attempt would be hedged after 10 ms"""
+    caller = UpstreamCaller(slos={'tts': LatencySLO(deadline_ms=2000, min_hedge_delay_ms=10, billed=True)},
+                            breakers=BreakerRegistry())
+    for _ in range(MIN_SAMPLES):
+        caller.call('tts', lambda timeout: None)
+    return caller
+
+
+def _slow_post(posts):
+    lock = threading.Lock()
+
+    def post(url, **kwargs):
+        with lock:
+            posts.append(url)
+        time.sleep(0.2)
+        return _Response()
+    return post
+
+
+def test_non_streamed_tts_is_sent_once(monkeypatch):
+    posts = []
+    monkeypatch.setattr(tts, 'upstream', _primed_caller())
+    monkeypatch.setattr(tts.requests, 'post', _slow_post(posts))
+    assert tts.synthesize("hello", "key") == b'audio'
+    assert len(posts) == 1
+
+
+def test_streamed_tts_is_hedged(monkeypatch):
+    posts = []
+    monkeypatch.setattr(tts, 'upstream', _primed_caller())
+    monkeypatch.setattr(tts.requests, 'post', _slow_post(posts))
+    tts.elevenlabs_tts("hello", "key", stream=True)
+    assert len(posts) == 2
+
+
+def test_spent_deadline_is_not_an_upstream_failure():
+    breakers = BreakerRegistry()
+    caller = UpstreamCaller(slos={'news': LatencySLO(deadline_ms=1000)}, breakers=breakers)
+    calls = []
+    for _ in range(10):
+        with pytest.raises(DeadlineExceeded):
+            caller.call('news', calls.append, deadline=Deadline(0))
+    assert calls == []
+    stats = breakers.get('news').stats()
+    assert stats['state'] == 'closed'
+    assert stats['window_calls'] == 0
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark the arithmetic engine against the old regex + eval calculator path
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prism.features.arithmetic import evaluate, parse_expression
+
+EXPRESSIONS = [
+    "What is 15 plus 27?",
+    "100 divided by 4",
+    "7 times 8",
+    "50 minus 12",
+    "(3 + 4) * 2",
+    "12 * 4 - 3",
+    "what's 1024 divided by 16",
+    "calculate 99 plus 1",
+]
+
+
+def legacy_calculate(expression: str):
+    """The calculator path before the arithmetic engine (normalize + eval)"""
+    expression = re.sub(r'\b(what is|calculate|compute|solve|what\'s)\b', '', expression, flags=re.IGNORECASE)
+    expression = expression.strip()
+    expression = re.sub(r'[?.,!]', '', expression)
+    expression = expression.replace('plus', '+')
+    expression = expression.replace('minus', '-')
+    expression = expression.replace('times', '*')
+    expression = expression.replace('multiplied by', '*')
+    expression = expression.replace('divided by', '/')
+    expression = expression.replace('divided', '/')
+    expression = re.sub(r'\s+', '', expression)
+    if not re.match(r'^[\d\+\-\*\/\(\)\.\s]+$', expression):
+        return None
+    return eval(expression)
+
+
+def run_benchmark(repeat: int = 5, number: int = 2000):
+    """Time both paths over the same expressions and print per-call costs"""
+    # Both paths must agree before their speed is worth comparing
+    for expression in EXPRESSIONS:
+        legacy = legacy_calculate(expression)
+        if legacy is not None and abs(legacy - evaluate(expression)) > 1e-9:
+            print(f"❌ Mismatch for '{expression}': {legacy} != {evaluate(expression)}")
+            return False
+
+    def legacy_run():
+        for expression in EXPRESSIONS:
+            legacy_calculate(expression)
+
+    def engine_run():
+        for expression in EXPRESSIONS:
+            evaluate(expression)
+
+    def engine_cold_run():
+        parse_expression.cache_clear()
+        for expression in EXPRESSIONS:
+            evaluate(expression)
+
+    calls = number * len(EXPRESSIONS)
+    results = {}
+    for name, func in [("regex + eval", legacy_run),
+                       ("engine (cold cache)", engine_cold_run),
+                       ("engine (warm cache)", engine_run)]:
+        best = min(timeit.repeat(func, repeat=repeat, number=number))
+        results[name] = best / calls * 1e6
+        print(f"⏱️  {name:<22} {results[name]:8.2f} µs per expression")
+
+    speedup = results["regex + eval"] / results["engine (warm cache)"]
+    print(f"🚀 Warm-cache speedup over eval: {speedup:.1f}x")
+    print(f"📊 Parse cache: {parse_expression.cache_info()}")
+    return speedup > 1
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark() else 1)
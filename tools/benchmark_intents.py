@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark local intent routing against the keyword rules on held-out queries:
+routing accuracy, LLM calls avoided and per-query routing cost
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prism.core.assistant import PrismAssistant
+
+# Phrasings not in the training file; None means the LLM should answer
+HELD_OUT = [
+    ("is it going to be chilly tonight", 'weather'),
+    ("will i need a coat", 'weather'),
+    ("how warm is it in london", 'weather'),
+    ("is it raining in seattle", 'weather'),
+    ("what's the weather going to be like tomorrow", 'weather'),
+    ("should i take an umbrella to work", 'weather'),
+    ("is it snowing outside", 'weather'),
+    ("how's it looking outside today", 'weather'),
+    ("what time is it right now", 'time'),
+    ("what's the date", 'time'),
+    ("which day of the week is today", 'time'),
+    ("tell me today's date", 'time'),
+    ("do you know the time", 'time'),
+    ("any updates in the world today", 'news'),
+    ("what's new in the world", 'news'),
+    ("give me today's headlines", 'news'),
+    ("what are the top stories", 'news'),
+    ("catch me up on what's going on", 'news'),
+    ("anything happening in the news", 'news'),
+    ("remind me to call the plumber at 4 pm", 'reminder'),
+    ("set a reminder to stretch in an hour", 'reminder'),
+    ("don't let me forget the meeting tomorrow", 'reminder'),
+    ("remind me to send the report on friday", 'reminder'),
+    ("can you set a reminder for my appointment", 'reminder'),
+    ("add 3 and 4", 'calculator'),
+    ("what's 45 times 3", 'calculator'),
+    ("calculate 18 divided by 3", 'calculator'),
+    ("how much is 7 plus 8", 'calculator'),
+    ("what is 2 to the power of 8", 'calculator'),
+    ("what's 30 percent of 90", 'calculator'),
+    ("subtract 9 from 40", 'calculator'),
+    ("tell me a funny joke", 'joke'),
+    ("i could use a laugh", 'joke'),
+    ("do you have a joke for me", 'joke'),
+    ("say a joke", 'joke'),
+    ("give me an inspiring quote", 'quote'),
+    ("i need some motivation today", 'quote'),
+    ("share a quote with me", 'quote'),
+    ("any words of wisdom", 'quote'),
+    ("search for italian restaurants", 'search'),
+    ("look up the history of jazz", 'search'),
+    ("find information on volcanoes", 'search'),
+    ("search the web for python news sites", 'search'),
+    ("what is love", None),
+    ("why is the ocean salty", None),
+    ("how do magnets work", None),
+    ("who is the president of france", None),
+    ("what's the best way to learn guitar", None),
+    ("hello there", None),
+    ("thanks so much", None),
+    ("write a haiku about autumn", None),
+    ("what is a black hole", None),
+    ("can you explain recursion", None),
+    ("i'm bored", None),
+    ("what is your name", None),
+    ("how are you today", None),
+    ("what is the speed of light", None),
+    ("tell me about the roman empire", None),
+]
+
+
+def route_accuracy(route, queries):
+    """Fraction of queries routed to the expected intent"""
+    return sum(route(query) == expected for query, expected in queries) / len(queries)
+
+
+def time_per_query(route, queries, repeat: int = 200) -> float:
+    """Mean routing time in microseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query, _ in queries:
+            route(query)
+    return (time.perf_counter() - start) / (repeat * len(queries)) * 1e6
+
+
+def run_benchmark():
+    """Compare classifier routing with the keyword-only rules"""
+    start = time.perf_counter()
+    assistant = PrismAssistant()
+    print(f"🧠 Trained intent classifier in {time.perf_counter() - start:.2f}s")
+
+    def keyword_route(query):
+        return assistant._keyword_intent(query.lower())
+
+    routers = (("Keyword rules", keyword_route), ("Classifier + keyword fallback", assistant._detect_intent))
+    llm_expected = sum(expected is None for _, expected in HELD_OUT)
+    results = {}
+    for name, route in routers:
+        accuracy = route_accuracy(route, HELD_OUT)
+        llm_calls = sum(route(query) is None for query, _ in HELD_OUT)
+        misrouted_features = sum(route(query) not in (expected, None)
+                                 for query, expected in HELD_OUT if expected is not None)
+        results[name] = accuracy
+        print(f"🎯 {name}: accuracy {accuracy:.0%}, LLM calls {llm_calls}/{len(HELD_OUT)} "
+              f"(needed {llm_expected}), feature queries misrouted {misrouted_features}, "
+              f"{time_per_query(route, HELD_OUT):.1f} µs per query")
+
+    for query, expected in HELD_OUT:
+        predicted = assistant._detect_intent(query)
+        if predicted != expected:
+            print(f"   ✗ '{query}': expected {expected}, routed to {predicted}")
+    return results["Classifier + keyword fallback"] > results["Keyword rules"]
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark() else 1)
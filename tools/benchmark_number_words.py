@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared number verbalizer against the two copies it replaced
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prism.utils.number_words import number_to_words
+
+
+class LegacyCalculatorWords:
+    """CalculatorService._number_to_words before the shared module"""
+
+    def number_to_words(self, num: int) -> str:
+        if num == 0:
+            return "zero"
+        if num < 0:
+            return f"negative {self.number_to_words(abs(num))}"
+        for size, name in ((1000000, "million"), (1000, "thousand"), (100, "hundred")):
+            if num >= size:
+                head, remainder = divmod(num, size)
+                if remainder == 0:
+                    return f"{self.number_to_words(head)} {name}"
+                return f"{self.number_to_words(head)} {name} {self.number_to_words(remainder)}"
+        if num <= 20:
+            return self._ones_and_teens(num)
+        tens, ones = (num // 10) * 10, num % 10
+        if ones == 0:
+            return self._tens(tens)
+        return f"{self._tens(tens)} {self._ones_and_teens(ones)}"
+
+    def _ones_and_teens(self, num: int) -> str:
+        words = {
+            0: "zero", 1: "one", 2: "two", 3: "three", 4: "four", 5: "five",
+            6: "six", 7: "seven", 8: "eight", 9: "nine", 10: "ten",
+            11: "eleven", 12: "twelve", 13: "thirteen", 14: "fourteen", 15: "fifteen",
+            16: "sixteen", 17: "seventeen", 18: "eighteen", 19: "nineteen", 20: "twenty"
+        }
+        return words.get(num, str(num))
+
+    def _tens(self, num: int) -> str:
+        words = {
+            20: "twenty", 30: "thirty", 40: "forty", 50: "fifty",
+            60: "sixty", 70: "seventy", 80: "eighty", 90: "ninety"
+        }
+        return words.get(num, str(num))
+
+
+def legacy_news_words(num: int) -> str:
+    """NewsService._number_to_words before the shared module (0-99 only)"""
+    if num == 0:
+        return "zero"
+    words = ["", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+             "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen"]
+    if num < 20:
+        return words[num]
+    tens = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+    if num % 10 == 0:
+        return tens[num // 10]
+    return f"{tens[num // 10]} {words[num % 10]}"
+
+
+def run_benchmark(repeat: int = 5, number: int = 20):
+    """Check the shared verbalizer matches the old output, then time both"""
+    legacy = LegacyCalculatorWords()
+    for num in range(-1000, 1000000, 7):
+        if legacy.number_to_words(num) != number_to_words(num):
+            print(f"❌ Mismatch for {num}: '{legacy.number_to_words(num)}' != '{number_to_words(num)}'")
+            return False
+
+    rng = random.Random(42)
+    small = [rng.randrange(100) for _ in range(1000)]
+    large = [rng.randrange(10 ** 9) for _ in range(1000)]
+
+    cases = [
+        ("0-99, calculator copy", lambda: [legacy.number_to_words(n) for n in small]),
+        ("0-99, news copy", lambda: [legacy_news_words(n) for n in small]),
+        ("0-99, shared", lambda: [number_to_words(n) for n in small]),
+        ("< 1e9, calculator copy", lambda: [legacy.number_to_words(n) for n in large]),
+        ("< 1e9, shared", lambda: [number_to_words(n) for n in large]),
+    ]
+    for name, func in cases:
+        best = min(timeit.repeat(func, repeat=repeat, number=number))
+        print(f"⏱️  {name:<24} {best / (number * 1000) * 1e6:8.3f} µs per number")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark() else 1)
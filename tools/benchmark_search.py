@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark the BM25 search index against the old linear keyword scan,
+plus typo-tolerant lookups over the same vocabulary
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prism.features.search_index import SearchIndex
+
+VOCABULARY_SIZE = 50000
+WORDS_PER_ENTRY = 12
+
+
+def make_entries(count: int, rng: random.Random):
+    """Synthetic knowledge entries with a Zipf-like word distribution"""
+    vocabulary = [f"term{i}" for i in range(VOCABULARY_SIZE)]
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY_SIZE)]
+    entries = {}
+    for i in range(count):
+        keyword = f"topic{i} {rng.choice(vocabulary)}"
+        words = rng.choices(vocabulary, weights=weights, k=WORDS_PER_ENTRY)
+        entries[keyword] = " ".join(words)
+    return entries, vocabulary
+
+
+def legacy_search(entries, query: str):
+    """The old SearchService.search_web lookup: first key found in the query"""
+    for key, result in entries.items():
+        if key in query:
+            return result
+    return None
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    """Apply one random substitution, deletion or transposition"""
+    i = rng.randrange(len(word) - 1)
+    edit = rng.choice(("substitute", "delete", "transpose"))
+    if edit == "substitute":
+        return word[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + word[i + 1:]
+    if edit == "delete":
+        return word[:i] + word[i + 1:]
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def run_fuzzy_benchmark(index: SearchIndex, rng: random.Random, queries: int = 500):
+    """Time queries whose only content word is misspelled"""
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(5, 10)))
+             for _ in range(30000)]
+    for i, word in enumerate(words):
+        index.add(f"fuzzy{i} {word}", f"Entry about {word}")
+
+    latencies = []
+    found = 0
+    for _ in range(queries):
+        word = rng.choice(words)
+        start = time.perf_counter()
+        hits = index.search(f"what is {misspell(word, rng)}", top_k=1)
+        latencies.append(time.perf_counter() - start)
+        found += bool(hits) and word in hits[0].keyword
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1e3
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3
+    print(f"🔤 Misspelled query ({len(words)} extra keywords): p50 {p50:.3f} ms, p99 {p99:.3f} ms, "
+          f"recovered {found / queries:.0%}")
+    return p50
+
+
+def time_queries(index: SearchIndex, query_texts) -> list:
+    """Sorted per-query latencies in seconds"""
+    latencies = []
+    for query in query_texts:
+        start = time.perf_counter()
+        index.search(query, top_k=5)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return latencies
+
+
+def run_benchmark(count: int = 100000, queries: int = 2000):
+    """Build an index of ``count`` entries and time queries against it"""
+    rng = random.Random(7)
+    entries, vocabulary = make_entries(count, rng)
+
+    index = SearchIndex()
+    start = time.perf_counter()
+    for keyword, result in entries.items():
+        index.add(keyword, result)
+    build = time.perf_counter() - start
+    print(f"📚 Indexed {len(index)} entries in {build:.2f}s ({build / count * 1e6:.1f} µs per add)")
+
+    # Query words follow the same Zipf distribution as the text, so the
+    # common head terms found in most entries come up as often as they would
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY_SIZE)]
+    query_texts = [f"tell me about {first} and {second}"
+                   for first, second in zip(rng.choices(vocabulary, weights=weights, k=queries),
+                                            rng.choices(vocabulary, weights=weights, k=queries))]
+
+    latencies = time_queries(index, query_texts)
+    p50 = latencies[len(latencies) // 2] * 1e3
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3
+    print(f"⏱️  BM25 query: p50 {p50:.3f} ms, p99 {p99:.3f} ms")
+
+    # Worst case: only the most common terms
+    head = time_queries(index, ["tell me about term0", "term5 and term17", "term0 term1 term2"] * 20)
+    worst = head[-1] * 1e3
+    print(f"⏱️  Head-term queries: p50 {head[len(head) // 2] * 1e3:.3f} ms, max {worst:.3f} ms")
+
+    start = time.perf_counter()
+    for query in query_texts[:20]:
+        legacy_search(entries, query)
+    legacy = (time.perf_counter() - start) / 20 * 1e3
+    print(f"⏱️  Linear scan: {legacy:.3f} ms per query")
+
+    start = time.perf_counter()
+    index.add("topic0 term1", "updated entry text")
+    print(f"✏️  Incremental update: {(time.perf_counter() - start) * 1e6:.1f} µs")
+
+    run_fuzzy_benchmark(index, rng)
+    return p50 < 1.0 and worst < 5.0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark() else 1)
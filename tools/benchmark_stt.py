@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark the speech-to-text engines offline on recorded utterances:
+word error rate and real-time factor (processing time / audio duration)
+
+Usage: benchmark_stt.py [SAMPLE_DIR]
+Each audio file in SAMPLE_DIR (wav, flac, webm, ogg, mp3, m4a) needs a
+reference transcript next to it with the same name and a .txt extension.
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv('config/.env')
+
+from prism.core.audio_ingest import audio_ingest
+from prism.core.stt import EXTENSION_CONTAINERS, GoogleSTTEngine, load_local_engine
+
+
+def normalize_words(text: str) -> list:
+    """Lower-case words without punctuation, so punctuating engines aren't penalized"""
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_error_rate(reference: str, hypothesis: str) -> tuple:
+    """(word edits, reference words) from a Levenshtein alignment"""
+    ref, hyp = normalize_words(reference), normalize_words(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1], len(ref)
+
+
+def load_samples(directory: str) -> list:
+    samples = []
+    for name in sorted(os.listdir(directory)):
+        stem, ext = os.path.splitext(name)
+        container = EXTENSION_CONTAINERS.get(ext.lstrip('.').lower())
+        reference_path = os.path.join(directory, stem + '.txt')
+        if container is None or not os.path.exists(reference_path):
+            continue
+        with open(os.path.join(directory, name), 'rb') as f:
+            audio = f.read()
+        with open(reference_path, encoding='utf-8') as f:
+            reference = f.read().strip()
+        # Engines get what the server gives them: audio normalized by the ingest stage
+        ingested = audio_ingest.normalize(audio, hint=container)
+        if ingested.duration is None:
+            print(f"⚠️  Skipping {name}: could not decode {ingested.source_container} audio")
+            continue
+        samples.append((name, ingested, reference))
+    return samples
+
+
+def run_benchmark(directory: str) -> bool:
+    if not os.path.isdir(directory):
+        print(f"❌ Sample directory not found: {directory}")
+        return False
+    samples = load_samples(directory)
+    if not samples:
+        print(f"❌ No audio files with .txt references in {directory}")
+        return False
+    engines = [engine for engine in (GoogleSTTEngine(), load_local_engine())
+               if engine is not None and engine.available()]
+    if not engines:
+        print("❌ No speech-to-text engine available")
+        return False
+
+    audio_seconds = sum(ingested.duration for _, ingested, _ in samples)
+    print(f"🎤 {len(samples)} utterances, {audio_seconds:.1f}s of audio")
+    for engine in engines:
+        edits = words = 0
+        elapsed = 0.0
+        try:
+            for name, ingested, reference in samples:
+                start = time.perf_counter()
+                hypothesis = engine.transcribe(ingested.audio, ingested.container, ingested.sample_rate)
+                elapsed += time.perf_counter() - start
+                sample_edits, sample_words = word_error_rate(reference, hypothesis)
+                edits += sample_edits
+                words += sample_words
+        except Exception as e:
+            print(f"❌ {engine.name}: {e}")
+            return False
+        print(f"   {engine.name:<7} WER {edits / max(words, 1):6.1%}   "
+              f"RTF {elapsed / audio_seconds:5.2f}   ({elapsed:.1f}s total)")
+    return True
+
+
+if __name__ == "__main__":
+    sample_dir = sys.argv[1] if len(sys.argv) > 1 else os.getenv('STT_BENCHMARK_DIR', os.path.join('data', 'stt_samples'))
+    sys.exit(0 if run_benchmark(sample_dir) else 1)
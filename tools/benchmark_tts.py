@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark the text-to-speech engines on short formulaic replies:
+per-reply synthesis latency for the local engine and ElevenLabs
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv('config/.env')
+
+from prism.core.tts import ElevenLabsEngine, load_local_engine
+
+SHORT_REPLIES = [
+    "The answer is four.",
+    "It's 3:15 PM.",
+    "Today is Monday, October 19.",
+    "Reminder set.",
+    "It's 18 degrees and cloudy.",
+    "Twelve times twelve is one hundred forty four.",
+    "You have no upcoming reminders.",
+    "Sorry, I didn't catch that.",
+]
+
+
+def time_engine(engine) -> list:
+    latencies = []
+    for text in SHORT_REPLIES:
+        start = time.perf_counter()
+        audio = engine.synthesize(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if not audio:
+            raise RuntimeError(f"{engine.name} returned no audio for '{text}'")
+    return latencies
+
+
+def run_benchmark() -> bool:
+    engines = [engine for engine in (load_local_engine(), ElevenLabsEngine())
+               if engine is not None and engine.available()]
+    if not engines:
+        print("❌ No text-to-speech engine available (install espeak-ng or set ELEVENLABS_API_KEY)")
+        return False
+
+    print(f"🔊 Synthesizing {len(SHORT_REPLIES)} short replies per engine")
+    for engine in engines:
+        try:
+            latencies = time_engine(engine)
+        except Exception as e:
+            print(f"❌ {engine.name}: {e}")
+            return False
+        print(f"   {engine.name:<11} median {statistics.median(latencies):7.1f} ms   "
+              f"max {max(latencies):7.1f} ms")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark() else 1)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark request throughput as the number of worker processes grows
+
+Starts the prefork server with N workers (one worker included, so every
+count runs the same server code) and drives it from several client
+processes with CPU-bound batch calculations, each batch unique so the
+parse cache can't answer it.
+"""
+
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+from multiprocessing import Pool
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from prism.core.server import available_cores
+
+BATCH_SIZE = 200
+DURATION = 5.0
+OPERATORS = ['plus', 'minus', 'times', 'divided by']
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _batch(rng: random.Random) -> list:
+    return [f"what is {rng.randint(1, 10 ** 6)} {rng.choice(OPERATORS)} {rng.randint(1, 999)}"
+            for _ in range(BATCH_SIZE)]
+
+
+def _client(args) -> int:
+    """One load-generating process: POST batches until the deadline; returns requests completed"""
+    url, seed, duration = args
+    rng = random.Random(seed)
+    session = requests.Session()
+    done = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        response = session.post(url, json={'expressions': _batch(rng)}, timeout=30)
+        if response.status_code == 200:
+            done += 1
+    return done
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = dict(os.environ, TTS_BUNDLE_WARMUP='false')
+    command = f"from prism.core.server import serve; serve('127.0.0.1', {port}, workers={workers})"
+    process = subprocess.Popen([sys.executable, '-c', command], cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/api/time", timeout=1)
+            return process
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"Server with {workers} workers did not start")
+
+
+def measure(workers: int, clients: int, duration: float) -> float:
+    """Requests per second served by ``workers`` processes"""
+    port = _free_port()
+    server = start_server(workers, port)
+    try:
+        url = f"http://127.0.0.1:{port}/api/calculate/batch"
+        with Pool(clients) as pool:
+            pool.map(_client, [(url, seed, 0.5) for seed in range(clients)])  # warm up every worker
+            completed = sum(pool.map(_client, [(url, 1000 + seed, duration) for seed in range(clients)]))
+        return completed / duration
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=10)
+
+
+def run_benchmark(duration: float = DURATION):
+    """Throughput at 1, 2, 4, ... workers up to the core count"""
+    cores = len(available_cores())
+    counts = sorted({1, *(2 ** i for i in range(1, cores.bit_length()) if 2 ** i <= cores), cores})
+    if cores == 1:
+        counts = [1, 2]
+    clients = max(4, 2 * max(counts))
+    print(f"🖥️  {cores} core(s), {clients} client processes, {BATCH_SIZE} expressions per request")
+
+    results = {}
+    for workers in counts:
+        results[workers] = measure(workers, clients, duration)
+        speedup = results[workers] / results[1]
+        print(f"⏱️  {workers:>2} worker(s): {results[workers]:8.1f} req/s  "
+              f"{speedup:4.2f}x  ({speedup / workers:.0%} per worker)")
+
+    best = max(counts)
+    speedup = results[best] / results[1]
+    if cores == 1:
+        print("⚠️  One core available: scaling can't show here")
+        return True
+    print(f"🚀 {best} workers serve {speedup:.1f}x the requests of one")
+    return speedup > 1.3
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark() else 1)
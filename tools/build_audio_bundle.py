@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Build the pre-synthesized audio bundle for Prism's fixed replies offline,
+so a fresh server starts with zero TTS calls for them
+
+Usage: build_audio_bundle.py [FORMAT ...]   (default: mp3_128; e.g. opus_32)
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv('config/.env')
+
+from prism.core.assistant import PrismAssistant
+from prism.core.audio_bundle import AudioBundle
+from prism.core.audio_formats import AUDIO_FORMATS, DEFAULT_FORMAT
+from prism.core.tts import synthesize
+
+
+def build_bundle(format_names) -> bool:
+    api_key = os.getenv('ELEVENLABS_API_KEY')
+    if not api_key:
+        print("❌ ELEVENLABS_API_KEY is not set")
+        return False
+    unknown = [name for name in format_names if name not in AUDIO_FORMATS]
+    if unknown:
+        print(f"❌ Unknown format(s): {', '.join(unknown)} (choose from {', '.join(AUDIO_FORMATS)})")
+        return False
+
+    texts = PrismAssistant().fixed_responses()
+    complete = True
+    for name in format_names:
+        fmt = AUDIO_FORMATS[name]
+        bundle = AudioBundle(os.getenv('TTS_BUNDLE_DIR', os.path.join('cache', 'tts')), fmt)
+        bundle.load()
+        start = time.perf_counter()
+        synthesized = bundle.build(texts, lambda text: synthesize(text, api_key, fmt))
+        print(f"🔊 {bundle.path}: {len(bundle)}/{len(texts)} replies, "
+              f"{synthesized} synthesized in {time.perf_counter() - start:.1f}s")
+        complete = complete and len(bundle) == len(texts)
+    return complete
+
+
+if __name__ == "__main__":
+    sys.exit(0 if build_bundle(sys.argv[1:] or [DEFAULT_FORMAT.name]) else 1)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Check the state backends behave the same
+
+Runs one set of checks against the in-process backend and against Redis.
+For Redis it uses, in order: the URL given on the command line or in
+STATE_REDIS_URL, a throwaway redis-server started on a free port, or an
+in-process fakeredis. Two backend instances share one server to stand in
+for two worker processes.
+
+Usage: python tools/test_state_backend.py [redis://host:port/db]
+"""
+
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prism.utils.state import MemoryBackend, RedisBackend, StateBackend
+from prism.features.reminders import ReminderService
+from prism.core.assistant import PrismAssistant
+
+
+def check_backend(writer: StateBackend, reader: StateBackend) -> list:
+    """Write through one backend and read through the other; returns failures"""
+    failures = []
+
+    def expect(label, actual, expected):
+        if actual != expected:
+            failures.append(f"{label}: expected {expected!r}, got {actual!r}")
+
+    writer.set('greeting', {'text': 'hello', 'tokens': 3})
+    expect('get', reader.get('greeting'), {'text': 'hello', 'tokens': 3})
+    expect('missing key', reader.get('absent'), None)
+    writer.set('short-lived', 'soon gone', ttl=0.05)
+    time.sleep(0.1)
+    expect('ttl expiry', reader.get('short-lived'), None)
+    writer.delete('greeting')
+    expect('delete', reader.get('greeting'), None)
+
+    expect('append length', writer.append('history', {'role': 'user', 'content': 'hi'}), 1)
+    writer.append('history', {'role': 'assistant', 'content': 'hello'}, {'role': 'user', 'content': 'bye'})
+    expect('list length', reader.length('history'), 3)
+    expect('list order', [m['content'] for m in reader.items('history')], ['hi', 'hello', 'bye'])
+    expect('capped append length', writer.append('capped', 1, 2, 3, max_length=2), 2)
+    writer.append('capped', 4, max_length=2, ttl=60)
+    expect('capped list keeps newest', reader.items('capped'), [3, 4])
+    writer.append('short-history', 'hi', ttl=0.05)
+    time.sleep(0.1)
+    expect('list ttl expiry', (reader.items('short-history'), reader.length('short-history')), ([], 0))
+
+    writer.hset('settings', 'sid-1', 'opus_32')
+    writer.hset('settings', 'sid-2', 'mp3_64')
+    expect('hget', reader.hget('settings', 'sid-1'), 'opus_32')
+    expect('hgetall', reader.hgetall('settings'), {'sid-1': 'opus_32', 'sid-2': 'mp3_64'})
+    expect('hdel', reader.hdel('settings', 'sid-1'), True)
+    expect('hdel missing', reader.hdel('settings', 'sid-1'), False)
+    expect('hupdate', writer.hupdate('settings', 'sid-2', lambda value: value.upper()), 'MP3_64')
+    expect('hupdate visible', reader.hget('settings', 'sid-2'), 'MP3_64')
+    expect('hupdate missing', writer.hupdate('settings', 'sid-1', lambda value: 'back'), None)
+    expect('hupdate missing not written', reader.hget('settings', 'sid-1'), None)
+
+    # Reminders added by one worker are seen, and completed, by another
+    added = ReminderService(writer).add_reminder('Call mom', 'tomorrow at 3pm')
+    other = ReminderService(reader)
+    expect('reminder visible', [r.title for r in other.get_reminders()], ['Call mom'])
+    expect('reminder complete', other.complete_reminder(added.id), True)
+    expect('reminder completed', ReminderService(writer).get_reminders(), [])
+    other.delete_reminder(added.id)
+    expect('deleted reminder stays deleted', ReminderService(writer).complete_reminder(added.id), False)
+    expect('deleted reminder not restored', ReminderService(reader).get_reminders(include_completed=True), [])
+
+    # Each session keeps its own conversation
+    first, second = PrismAssistant(writer), PrismAssistant(reader)
+    first._record('alice', {'role': 'user', 'content': 'hi from alice'})
+    expect('session history', second.conversation_history('alice'), [{'role': 'user', 'content': 'hi from alice'}])
+    expect('other session empty', second.conversation_history('bob'), [])
+    second.end_session('alice')
+    expect('session ended', first.conversation_history('alice'), [])
+    first.context_builder.max_messages = 4
+    for turn in range(3):
+        first._record_cached_turn('carol', f"question {turn}", f"answer {turn}")
+    expect('session history capped', [m['content'] for m in second.conversation_history('carol')],
+           ['question 1', 'answer 1', 'question 2', 'answer 2'])
+    second.end_session('carol')
+
+    for key in ('history', 'capped', 'settings', 'reminders'):
+        writer.delete(key)
+    return failures
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def redis_stand_in(url=None):
+    """Yields a factory for RedisBackend instances sharing one server, and its description"""
+    namespace = f"prism-check-{uuid.uuid4().hex[:8]}:"
+    if url:
+        yield (lambda: RedisBackend(url, namespace=namespace)), url
+        return
+    binary = shutil.which('redis-server')
+    if binary:
+        port = _free_port()
+        process = subprocess.Popen([binary, '--port', str(port), '--save', '', '--appendonly', 'no'],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            time.sleep(0.3)
+            url = f"redis://127.0.0.1:{port}/0"
+            yield (lambda: RedisBackend(url, namespace=namespace)), f"local redis-server on port {port}"
+        finally:
+            process.terminate()
+            process.wait()
+        return
+    import fakeredis
+
+    server = fakeredis.FakeServer()
+    yield (lambda: RedisBackend(namespace=namespace, client=fakeredis.FakeRedis(server=server))), 'fakeredis'
+
+
+def run_checks(url=None) -> bool:
+    print("🗄️  State Backend Checks")
+    print("=" * 50)
+    ok = True
+
+    memory = MemoryBackend()
+    failures = check_backend(memory, memory)
+    print(f"{'✅' if not failures else '❌'} memory: {len(failures)} failure(s)")
+    for failure in failures:
+        print(f"   {failure}")
+    ok = ok and not failures
+
+    try:
+        with redis_stand_in(url) as (make_backend, description):
+            failures = check_backend(make_backend(), make_backend())
+            print(f"{'✅' if not failures else '❌'} redis ({description}): {len(failures)} failure(s)")
+            for failure in failures:
+                print(f"   {failure}")
+            ok = ok and not failures
+    except ImportError as e:
+        print(f"❌ redis not checked: {e} (pip install -r requirements-dev.txt)")
+        ok = False
+    return ok
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else os.getenv('STATE_REDIS_URL')
+    sys.exit(0 if run_checks(target) else 1)